@@ -1,25 +1,39 @@
 import logging
+import time
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
 
 from flask import Flask, jsonify
-from sqlalchemy.exc import OperationalError
+from sqlalchemy.exc import OperationalError, SQLAlchemyError
 
 from app.config import get_config
 from app.extensions import bcrypt, cors, db, jwt, ma, migrate
-from app.services.bootstrap_service import bootstrap_demo_data
 
 
-def create_app(config_name: str | None = None) -> Flask:
-    app = Flask(__name__)
-    app.config.from_object(get_config(config_name))
+def create_app(config_name: str | None = None, config_overrides: dict | None = None) -> Flask:
+    started = time.perf_counter()
+    timings = {}
 
-    _configure_logging(app)
-    _register_extensions(app)
-    _register_blueprints(app)
-    _register_error_handlers(app)
-    _run_startup_bootstrap(app)
+    def phase(name: str, step) -> None:
+        phase_started = time.perf_counter()
+        step(app)
+        timings[name] = (time.perf_counter() - phase_started) * 1000
 
+    app = Flask(__name__)
+    app.config.from_object(get_config(config_name))
+    app.config.update(config_overrides or {})
+
+    phase("logging", _configure_logging)
+    phase("extensions", _register_extensions)
+    phase("metrics", _register_metrics)
+    phase("blueprints", _register_blueprints)
+    phase("error_handlers", _register_error_handlers)
+    phase("commands", _register_commands)
+    phase("bootstrap", _run_startup_bootstrap)
+    phase("import_jobs", _recover_import_jobs)
+
+    timings["total"] = (time.perf_counter() - started) * 1000
+    app.logger.info("Startup timings (ms): %s", " ".join(f"{name}={ms:.1f}" for name, ms in timings.items()))
     return app
 
 
@@ -47,6 +61,12 @@ def _register_extensions(app: Flask) -> None:
     ma.init_app(app)
 
 
+def _register_metrics(app: Flask) -> None:
+    from app.services.metrics_service import init_metrics
+
+    init_metrics(app)
+
+
 def _register_blueprints(app: Flask) -> None:
     from app.routes.admin_routes import admin_bp
     from app.routes.advisor_routes import advisor_bp
@@ -65,6 +85,12 @@ def _register_blueprints(app: Flask) -> None:
     app.register_blueprint(student_bp, url_prefix="/api/student")
 
 
+def _register_commands(app: Flask) -> None:
+    from app.cli import register_commands
+
+    register_commands(app)
+
+
 def _register_error_handlers(app: Flask) -> None:
     @app.errorhandler(OperationalError)
     def handle_db_error(err):
@@ -94,12 +120,45 @@ def _register_error_handlers(app: Flask) -> None:
 
 
 def _run_startup_bootstrap(app: Flask) -> None:
-    if not app.config.get("AUTO_BOOTSTRAP", True):
+    """Bootstrap according to STARTUP_BOOTSTRAP.
+
+    ``sentinel`` (default) costs serving workers one query when the database
+    is already bootstrapped for this schema, and otherwise lets a single
+    leader process do the work. ``always`` restores the unconditional run and
+    ``off`` leaves it to ``flask bootstrap``.
+    """
+    mode = app.config.get("STARTUP_BOOTSTRAP", "sentinel")
+    if not app.config.get("AUTO_BOOTSTRAP", True) or mode == "off":
         return
+    from app.services.bootstrap_service import ensure_bootstrapped, run_bootstrap
+
     try:
         with app.app_context():
-            db.create_all()
-            result = bootstrap_demo_data()
-            app.logger.info("Startup bootstrap result: %s", result.get("message"))
+            if mode == "always":
+                result = run_bootstrap()
+                app.logger.info("Startup bootstrap result: %s", result.get("message"))
+                return
+            outcome = ensure_bootstrapped(app)
+            app.logger.info("Startup bootstrap: %s", outcome)
     except Exception as exc:
         app.logger.exception("Startup bootstrap skipped due to error: %s", exc)
+
+
+def _recover_import_jobs(app: Flask) -> None:
+    """Fail import jobs stranded by a dead worker and sweep their spool files."""
+    if not app.config.get("IMPORT_JOB_RECOVERY", True):
+        return
+    from app.services.job_service import recover_interrupted_jobs
+
+    try:
+        with app.app_context():
+            result = recover_interrupted_jobs(app)
+        if result["interrupted"] or result["swept_files"]:
+            app.logger.warning(
+                "Recovered import jobs: %d interrupted, %d spool files removed",
+                len(result["interrupted"]),
+                result["swept_files"],
+            )
+    except (SQLAlchemyError, OSError) as exc:
+        # Typically the schema is not there yet because another process is still bootstrapping it.
+        app.logger.warning("Import job recovery skipped: %s", str(exc).splitlines()[0])
@@ -0,0 +1,208 @@
+import click
+from flask import Flask
+
+
+def register_commands(app: Flask) -> None:
+    @app.cli.command("recompute-analytics")
+    @click.option("--course-id", type=int, default=None, help="Only recompute this course.")
+    @click.option("--department-id", type=int, default=None, help="Only recompute courses of this department.")
+    @click.option("--session", default=None, help="Only recompute enrollments of this session, e.g. 2025/2026.")
+    @click.option("--chunk-size", type=int, default=None, help="Rows rewritten per committed chunk.")
+    @click.option("--workers", type=int, default=0, help="Fan departments out across this many processes.")
+    def recompute_analytics_command(course_id, department_id, session, chunk_size, workers):
+        """Rebuild grades, risk levels and recommendations from stored scores."""
+        from app.services.recompute_service import DEFAULT_RECOMPUTE_CHUNK_SIZE, recompute_analytics
+
+        result = recompute_analytics(
+            course_id=course_id,
+            department_id=department_id,
+            session=session,
+            chunk_size=chunk_size or DEFAULT_RECOMPUTE_CHUNK_SIZE,
+            workers=workers,
+        )
+        click.echo(
+            f"Recomputed {result['rows']} rows in {result['chunks']} chunks "
+            f"({result['seconds']}s, {result['rows_per_second']} rows/sec)"
+        )
+
+    @app.cli.command("rebuild-rollups")
+    def rebuild_rollups_command():
+        """Regenerate the performance rollup tables from the raw assessments."""
+        from app.services.rollup_service import rebuild_rollups
+
+        groups = rebuild_rollups()
+        click.echo(f"Rebuilt {groups} performance rollup groups")
+
+    @app.cli.command("rebuild-gpa")
+    def rebuild_gpa_command():
+        """Regenerate the term and cumulative student GPA tables."""
+        from app.services.gpa_service import rebuild_student_gpa
+
+        students = rebuild_student_gpa()
+        click.echo(f"Rebuilt GPA for {students} students")
+
+    @app.cli.command("export-department-reports")
+    @click.option("--department-id", type=int, required=True, help="Department whose students are exported.")
+    @click.option("--output", type=click.Path(dir_okay=False, writable=True), required=True, help="ZIP file to write.")
+    @click.option("--format", "export_format", type=click.Choice(["pdf", "csv"]), default="pdf", show_default=True)
+    @click.option("--workers", type=int, default=None, help="PDF rendering processes (default: one per CPU).")
+    @click.option("--batch-size", type=int, default=None, help="Students loaded and rendered per batch.")
+    def export_department_reports_command(department_id, output, export_format, workers, batch_size):
+        """Write every student's personalized learning report in a department to a ZIP."""
+        from app.services.batch_report_service import DEFAULT_REPORT_BATCH_SIZE, iter_department_report_zip
+
+        stats = {}
+        with open(output, "wb") as handle:
+            for chunk in iter_department_report_zip(
+                department_id,
+                export_format=export_format,
+                workers=workers,
+                batch_size=batch_size or DEFAULT_REPORT_BATCH_SIZE,
+                stats=stats,
+            ):
+                handle.write(chunk)
+        click.echo(
+            f"Exported {stats['reports']} reports to {output} "
+            f"({stats['seconds']}s, {stats['reports_per_second']} reports/sec)"
+        )
+
+    @app.cli.command("benchmark-login")
+    @click.option("--identifier", required=True, help="Staff email or student matric number.")
+    @click.option("--password", required=True)
+    @click.option("--university-id", type=int, required=True)
+    @click.option("--requests", "request_count", type=int, default=200, show_default=True)
+    def benchmark_login_command(identifier, password, university_id, request_count):
+        """Time repeated logins and count the SQL statements each one issues."""
+        import statistics
+        import time
+
+        from sqlalchemy import event
+
+        from app.extensions import db
+
+        statements = 0
+
+        def count_statement(*_):
+            nonlocal statements
+            statements += 1
+
+        client = app.test_client()
+        body = {"identifier": identifier, "password": password, "university_id": university_id}
+        # Warm caches so the figures reflect steady state.
+        response = client.post("/api/auth/login", json=body)
+        if response.status_code != 200:
+            raise click.ClickException(f"Login failed: {response.get_json()}")
+
+        event.listen(db.engine, "before_cursor_execute", count_statement)
+        durations = []
+        try:
+            for _ in range(request_count):
+                started = time.perf_counter()
+                client.post("/api/auth/login", json=body)
+                durations.append((time.perf_counter() - started) * 1000)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", count_statement)
+
+        total_seconds = sum(durations) / 1000
+        click.echo(
+            f"{request_count} logins: {request_count / total_seconds:.1f} logins/sec, "
+            f"median {statistics.median(durations):.1f}ms, "
+            f"{statements / request_count:.2f} queries/login"
+        )
+
+    @app.cli.command("audit-query-plans")
+    @click.option(
+        "--database-url",
+        default=None,
+        help="Scratch database to seed and audit (default: a temporary SQLite file). Never point at live data.",
+    )
+    @click.option("--students", type=int, default=20000, show_default=True, help="Synthetic students to seed.")
+    @click.option("--verbose", is_flag=True, help="Print every captured statement with its plan.")
+    def audit_query_plans_command(database_url, students, verbose):
+        """Seed a synthetic institution, EXPLAIN every audited query and fail on sequential scans."""
+        import os
+        import tempfile
+
+        from app import create_app
+        from app.extensions import db
+        from app.models.student import Student
+        from app.services.query_plan_service import audit_query_plans, seed_synthetic_dataset
+
+        scratch = None
+        if database_url is None:
+            scratch = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+            scratch.close()
+            database_url = f"sqlite:///{scratch.name}"
+
+        audit_app = create_app(
+            config_overrides={"SQLALCHEMY_DATABASE_URI": database_url, "AUTO_BOOTSTRAP": False}
+        )
+        try:
+            with audit_app.app_context():
+                db.create_all()
+                if not db.session.query(Student.student_id).first():
+                    seeded = seed_synthetic_dataset(students=students)
+                    click.echo(f"Seeded {seeded['students']} students and {seeded['enrollments']} enrollments")
+                report = audit_query_plans(audit_app)
+                db.session.remove()
+        finally:
+            if scratch is not None:
+                os.unlink(scratch.name)
+
+        failures = [entry for entry in report if entry["sequential_scans"]]
+        for entry in report if verbose else failures:
+            marker = "FAIL" if entry["sequential_scans"] else "ok"
+            click.echo(f"[{marker}] {entry['scenario']}: {' '.join(entry['statement'].split())[:160]}")
+            for line in entry["plan"]:
+                click.echo(f"       {line}")
+        click.echo(f"Audited {len(report)} statements, {len(failures)} with sequential scans on large tables")
+        if failures:
+            raise SystemExit(1)
+
+    @app.cli.command("ensure-indexes")
+    def ensure_indexes_command():
+        """Create any index declared on the models that an existing database is missing."""
+        from app.services.bootstrap_service import ensure_schema_indexes
+
+        created = ensure_schema_indexes()
+        click.echo(f"Created {len(created)} indexes" + (f": {', '.join(created)}" if created else ""))
+
+    @app.cli.command("ensure-schema")
+    def ensure_schema_command():
+        """Add columns declared on the models that existing tables are missing."""
+        from app.services.bootstrap_service import ensure_schema_columns
+
+        added = ensure_schema_columns()
+        click.echo(f"Added {len(added)} columns" + (f": {', '.join(added)}" if added else ""))
+
+    @app.cli.command("bootstrap")
+    def bootstrap_command():
+        """Create tables, seed demo data and record the bootstrap sentinel."""
+        from app.services.bootstrap_service import run_bootstrap
+
+        result = run_bootstrap()
+        click.echo(result.get("message", "Bootstrap completed"))
+        if result["added_columns"]:
+            click.echo(f"Added columns {', '.join(result['added_columns'])}")
+        if result["created_indexes"]:
+            click.echo(f"Created indexes {', '.join(result['created_indexes'])}")
+        if result["backfilled"]:
+            click.echo(f"Backfilled {', '.join(result['backfilled'])}")
+
+    @app.cli.command("import-budget")
+    @click.option("--budget-ms", type=float, default=None, help="Override IMPORT_TIME_BUDGET_MS.")
+    @click.option(
+        "--runs", type=int, default=3, show_default=True, help="Fresh interpreters to profile; the fastest counts."
+    )
+    def import_budget_command(budget_ms, runs):
+        """Profile create_app() imports with -X importtime and fail when they exceed the budget."""
+        from app.services.import_time_service import check_import_budget
+
+        result = check_import_budget(budget_ms or app.config["IMPORT_TIME_BUDGET_MS"], runs=runs)
+        for row in result["slowest"]:
+            click.echo(f"{row['cumulative_ms']:9.1f}ms  {row['module']}")
+        click.echo(f"Startup imports: {result['total_ms']}ms of a {result['budget_ms']}ms budget")
+        for violation in result["violations"]:
+            click.echo(f"FAIL: {violation}")
+        if result["violations"]:
+            raise SystemExit(1)
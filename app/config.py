@@ -10,6 +10,26 @@ class BaseConfig:
     CORS_ORIGINS = os.getenv("CORS_ORIGINS", "*")
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
     AUTO_BOOTSTRAP = os.getenv("AUTO_BOOTSTRAP", "true").lower() == "true"
+    STARTUP_BOOTSTRAP = os.getenv("STARTUP_BOOTSTRAP", "sentinel").lower()
+    CSV_IMPORT_CHUNK_SIZE = int(os.getenv("CSV_IMPORT_CHUNK_SIZE", "1000"))
+    IMPORT_JOB_WORKERS = int(os.getenv("IMPORT_JOB_WORKERS", "2"))
+    IMPORT_JOB_SPOOL_DIR = os.getenv("IMPORT_JOB_SPOOL_DIR")
+    IMPORT_JOB_RECOVERY = os.getenv("IMPORT_JOB_RECOVERY", "true").lower() == "true"
+    IMPORT_JOB_STALE_SECONDS = int(os.getenv("IMPORT_JOB_STALE_SECONDS", "3600"))
+    PAYLOAD_CACHE_MAX_ENTRIES = int(os.getenv("PAYLOAD_CACHE_MAX_ENTRIES", "2048"))
+    PAYLOAD_CACHE_MAX_BYTES = int(os.getenv("PAYLOAD_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+    AGGREGATION_USE_DATAFRAME = os.getenv("AGGREGATION_USE_DATAFRAME", "false").lower() == "true"
+    REPORT_EXPORT_WORKERS = int(os.getenv("REPORT_EXPORT_WORKERS", "2"))
+    REPORT_EXPORT_MAX_CONCURRENT = int(os.getenv("REPORT_EXPORT_MAX_CONCURRENT", "1"))
+    PAGINATION_DEFAULT_LIMIT = int(os.getenv("PAGINATION_DEFAULT_LIMIT", "50"))
+    PAGINATION_MAX_LIMIT = int(os.getenv("PAGINATION_MAX_LIMIT", "200"))
+    PASSWORD_HASH_ALGORITHM = os.getenv("PASSWORD_HASH_ALGORITHM", "bcrypt")
+    PASSWORD_HASH_COST = int(os.getenv("PASSWORD_HASH_COST", "0"))
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "4"))
+    REFERENCE_DATA_CACHE_SECONDS = int(os.getenv("REFERENCE_DATA_CACHE_SECONDS", "300"))
+    REPORT_EXPORT_BATCH_SIZE = int(os.getenv("REPORT_EXPORT_BATCH_SIZE", "100"))
+    IMPORT_TIME_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "1000"))
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
 
 
 class DevelopmentConfig(BaseConfig):
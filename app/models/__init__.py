@@ -1,11 +1,15 @@
 from app.models.analytics_result import AnalyticsResult
 from app.models.assessment import Assessment
+from app.models.bootstrap_state import BootstrapState
 from app.models.course import Course
 from app.models.department import Department
 from app.models.enrollment import Enrollment
 from app.models.faculty import Faculty
+from app.models.import_job import ImportJob
+from app.models.performance_rollup import PerformanceRollup
 from app.models.staff import Staff
 from app.models.student import Student
+from app.models.student_gpa import StudentGpa, StudentTermGpa
 from app.models.university import University
 
 __all__ = [
@@ -18,4 +22,9 @@ __all__ = [
     "Enrollment",
     "Assessment",
     "AnalyticsResult",
+    "ImportJob",
+    "PerformanceRollup",
+    "StudentGpa",
+    "StudentTermGpa",
+    "BootstrapState",
 ]
@@ -8,7 +8,7 @@ class AnalyticsResult(db.Model):
 
     analytics_id = db.Column(db.Integer, primary_key=True)
     enrollment_id = db.Column(db.Integer, db.ForeignKey("enrollments.enrollment_id"), nullable=False, unique=True)
-    risk_level = db.Column(db.String(20), nullable=False)
+    risk_level = db.Column(db.String(20), nullable=False, index=True)
     recommendation = db.Column(db.Text, nullable=False)
     date_computed = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
 
@@ -0,0 +1,14 @@
+from datetime import datetime
+
+from app.extensions import db
+
+
+class BootstrapState(db.Model):
+    """Sentinel row recording which schema and demo-data fingerprint the database was bootstrapped for."""
+
+    __tablename__ = "bootstrap_state"
+
+    key = db.Column(db.String(40), primary_key=True)
+    fingerprint = db.Column(db.String(64), nullable=False)
+    completed_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    duration_ms = db.Column(db.Float, nullable=True)
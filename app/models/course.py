@@ -9,8 +9,8 @@ class Course(db.Model):
     course_title = db.Column(db.String(150), nullable=False)
     credit_units = db.Column(db.Integer, nullable=False)
     semester = db.Column(db.String(20), nullable=False)
-    department_id = db.Column(db.Integer, db.ForeignKey("departments.department_id"), nullable=False)
-    lecturer_id = db.Column(db.Integer, db.ForeignKey("staff.staff_id"), nullable=True)
+    department_id = db.Column(db.Integer, db.ForeignKey("departments.department_id"), nullable=False, index=True)
+    lecturer_id = db.Column(db.Integer, db.ForeignKey("staff.staff_id"), nullable=True, index=True)
 
     department = db.relationship("Department", back_populates="courses")
     lecturer = db.relationship("Staff", back_populates="courses")
@@ -22,5 +22,6 @@ class Enrollment(db.Model):
 
     __table_args__ = (
         db.UniqueConstraint("student_id", "course_id", "session", "semester", name="uq_student_course_session"),
+        db.Index("ix_enrollments_course_term", "course_id", "session", "semester"),
     )
 
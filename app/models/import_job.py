@@ -0,0 +1,35 @@
+from datetime import datetime
+
+from app.extensions import db
+from app.utils.constants import JOB_QUEUED
+
+
+class ImportJob(db.Model):
+    __tablename__ = "import_jobs"
+
+    job_id = db.Column(db.String(32), primary_key=True)
+    lecturer_id = db.Column(db.Integer, db.ForeignKey("staff.staff_id"), nullable=False, index=True)
+    filename = db.Column(db.String(255), nullable=True)
+    session = db.Column(db.String(20), nullable=False)
+    semester = db.Column(db.String(20), nullable=False)
+    mode = db.Column(db.String(20), nullable=False)
+    state = db.Column(db.String(20), nullable=False, default=JOB_QUEUED)
+    rows_processed = db.Column(db.Integer, nullable=False, default=0)
+    created_enrollments = db.Column(db.Integer, nullable=False, default=0)
+    errors = db.Column(db.JSON, nullable=False, default=list)
+    chunks = db.Column(db.JSON, nullable=True)
+    worker_id = db.Column(db.String(128), nullable=True)
+    heartbeat_at = db.Column(db.DateTime, nullable=True)
+    failure_reason = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    lecturer = db.relationship("Staff")
+
+    @property
+    def duration_seconds(self) -> float | None:
+        if not self.started_at:
+            return None
+        end = self.finished_at or datetime.utcnow()
+        return round((end - self.started_at).total_seconds(), 3)
@@ -0,0 +1,32 @@
+from datetime import datetime
+
+from app.extensions import db
+
+
+class PerformanceRollup(db.Model):
+    """Pre-aggregated assessment totals for one course offering (course, session, semester)."""
+
+    __tablename__ = "performance_rollups"
+
+    rollup_id = db.Column(db.Integer, primary_key=True)
+    session = db.Column(db.String(20), nullable=False)
+    semester = db.Column(db.String(20), nullable=False)
+    course_id = db.Column(db.Integer, db.ForeignKey("courses.course_id"), nullable=False)
+    department_id = db.Column(db.Integer, db.ForeignKey("departments.department_id"), nullable=False, index=True)
+    faculty_id = db.Column(db.Integer, db.ForeignKey("faculties.faculty_id"), nullable=False, index=True)
+    record_count = db.Column(db.Integer, nullable=False, default=0)
+    score_sum = db.Column(db.Float, nullable=False, default=0.0)
+    score_sq_sum = db.Column(db.Float, nullable=False, default=0.0)
+    pass_count = db.Column(db.Integer, nullable=False, default=0)
+    grade_a_count = db.Column(db.Integer, nullable=False, default=0)
+    grade_b_count = db.Column(db.Integer, nullable=False, default=0)
+    grade_c_count = db.Column(db.Integer, nullable=False, default=0)
+    grade_d_count = db.Column(db.Integer, nullable=False, default=0)
+    grade_e_count = db.Column(db.Integer, nullable=False, default=0)
+    grade_f_count = db.Column(db.Integer, nullable=False, default=0)
+    refreshed_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        db.UniqueConstraint("course_id", "session", "semester", name="uq_rollup_course_term"),
+        db.Index("ix_rollup_session_semester", "session", "semester"),
+    )
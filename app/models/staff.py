@@ -1,7 +1,8 @@
 from datetime import datetime
 
-from app.extensions import bcrypt, db
+from app.extensions import db
 from app.utils.constants import STAFF_ROLES
+from app.utils.passwords import hash_password, verify_password
 
 
 class Staff(db.Model):
@@ -20,10 +21,10 @@ class Staff(db.Model):
     courses = db.relationship("Course", back_populates="lecturer")
 
     def set_password(self, password: str) -> None:
-        self.password_hash = bcrypt.generate_password_hash(password).decode("utf-8")
+        self.password_hash = hash_password(password)
 
     def check_password(self, password: str) -> bool:
-        return bcrypt.check_password_hash(self.password_hash, password)
+        return verify_password(password, self.password_hash)
 
     def validate_role(self) -> None:
         if self.role not in STAFF_ROLES:
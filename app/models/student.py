@@ -1,6 +1,7 @@
 from datetime import datetime
 
-from app.extensions import bcrypt, db
+from app.extensions import db
+from app.utils.passwords import hash_password, verify_password
 
 
 class Student(db.Model):
@@ -12,17 +13,18 @@ class Student(db.Model):
     gender = db.Column(db.String(20), nullable=False)
     level = db.Column(db.Integer, nullable=False)
     password_hash = db.Column(db.String(255), nullable=False)
-    department_id = db.Column(db.Integer, db.ForeignKey("departments.department_id"), nullable=False)
-    advisor_id = db.Column(db.Integer, db.ForeignKey("staff.staff_id"), nullable=True)
+    department_id = db.Column(db.Integer, db.ForeignKey("departments.department_id"), nullable=False, index=True)
+    advisor_id = db.Column(db.Integer, db.ForeignKey("staff.staff_id"), nullable=True, index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    data_version = db.Column(db.Integer, nullable=False, default=0, server_default="0")
 
     department = db.relationship("Department", back_populates="students")
     advisor = db.relationship("Staff", back_populates="advised_students", foreign_keys=[advisor_id])
     enrollments = db.relationship("Enrollment", back_populates="student", cascade="all, delete-orphan")
 
     def set_password(self, password: str) -> None:
-        self.password_hash = bcrypt.generate_password_hash(password).decode("utf-8")
+        self.password_hash = hash_password(password)
 
     def check_password(self, password: str) -> bool:
-        return bcrypt.check_password_hash(self.password_hash, password)
+        return verify_password(password, self.password_hash)
 
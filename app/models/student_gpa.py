@@ -0,0 +1,31 @@
+from datetime import datetime
+
+from app.extensions import db
+
+
+class StudentGpa(db.Model):
+    """Cumulative grade points and units for one student."""
+
+    __tablename__ = "student_gpa"
+
+    student_id = db.Column(db.Integer, db.ForeignKey("students.student_id"), primary_key=True)
+    department_id = db.Column(db.Integer, db.ForeignKey("departments.department_id"), nullable=False)
+    total_points = db.Column(db.Float, nullable=False, default=0.0)
+    total_units = db.Column(db.Integer, nullable=False, default=0)
+    gpa = db.Column(db.Float, nullable=False, default=0.0)
+    refreshed_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (db.Index("ix_student_gpa_department_gpa", "department_id", "gpa"),)
+
+
+class StudentTermGpa(db.Model):
+    """Grade points and units earned by one student in one session/semester."""
+
+    __tablename__ = "student_term_gpa"
+
+    student_id = db.Column(db.Integer, db.ForeignKey("students.student_id"), primary_key=True)
+    session = db.Column(db.String(20), primary_key=True)
+    semester = db.Column(db.String(20), primary_key=True)
+    term_points = db.Column(db.Float, nullable=False, default=0.0)
+    term_units = db.Column(db.Integer, nullable=False, default=0)
+    gpa = db.Column(db.Float, nullable=False, default=0.0)
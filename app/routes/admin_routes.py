@@ -1,4 +1,6 @@
-from flask import Blueprint, jsonify, request
+import hashlib
+
+from flask import Blueprint, Response, jsonify, request
 from marshmallow import ValidationError
 
 from app.extensions import db
@@ -11,8 +13,21 @@ from app.schemas.course_schema import CourseSchema
 from app.schemas.staff_schema import StaffCreateSchema, StaffSchema
 from app.schemas.university_schema import DepartmentSchema, FacultySchema, UniversitySchema
 from app.services.aggregation_service import system_stats
+from app.services.export_service import export_response
+from app.services.metrics_service import PROMETHEUS_CONTENT_TYPE, render_metrics
+from app.services.provisioning_service import (
+    ProvisioningError,
+    ensure_structure,
+    provision_courses,
+    provision_staff,
+    provision_structure,
+    read_records,
+)
+from app.services.recompute_service import DEFAULT_RECOMPUTE_CHUNK_SIZE, recompute_analytics
+from app.services.reference_data_service import reference_tree, university_subtree
 from app.utils.constants import ADMIN
 from app.utils.helpers import error_response, success_response
+from app.utils.pagination import Filter, ListSpec, paginate_items, parse_page_request
 from app.utils.role_required import role_required
 
 admin_bp = Blueprint("admin", __name__)
@@ -53,26 +68,6 @@ staff_schema = StaffSchema()
 course_schema = CourseSchema()
 
 
-def _ensure_university_structure(university_id: int):
-    created_faculties = 0
-    created_departments = 0
-    for faculty_name, departments in DEFAULT_UNIVERSITY_STRUCTURE.items():
-        faculty = Faculty.query.filter_by(name=faculty_name, university_id=university_id).first()
-        if not faculty:
-            faculty = Faculty(name=faculty_name, university_id=university_id)
-            db.session.add(faculty)
-            db.session.flush()
-            created_faculties += 1
-
-        for dept_name in departments:
-            exists = Department.query.filter_by(name=dept_name, faculty_id=faculty.faculty_id).first()
-            if exists:
-                continue
-            db.session.add(Department(name=dept_name, faculty_id=faculty.faculty_id))
-            created_departments += 1
-    return {"created_faculties": created_faculties, "created_departments": created_departments}
-
-
 @admin_bp.post("/create-university")
 @role_required(ADMIN)
 def create_university():
@@ -93,7 +88,7 @@ def create_university():
     auto_structure = (request.get_json() or {}).get("auto_structure", True)
     structure_result = {"created_faculties": 0, "created_departments": 0}
     if auto_structure:
-        structure_result = _ensure_university_structure(university.university_id)
+        structure_result = ensure_structure(university.university_id, DEFAULT_UNIVERSITY_STRUCTURE)
 
     db.session.commit()
     response_payload = university_schema.dump(university)
@@ -196,6 +191,36 @@ def create_course():
     return jsonify(data), status
 
 
+def _bulk_provision(provision, message: str):
+    try:
+        records = read_records(request.get_json(silent=True), request.files.get("file"))
+        result = provision(records)
+    except ProvisioningError as exc:
+        data, status = error_response(str(exc), 400)
+        data["errors"] = exc.errors
+        return jsonify(data), status
+    data, status = success_response(message, result, 201)
+    return jsonify(data), status
+
+
+@admin_bp.post("/bulk/structure")
+@role_required(ADMIN)
+def bulk_structure():
+    return _bulk_provision(provision_structure, "Faculties and departments provisioned")
+
+
+@admin_bp.post("/bulk/staff")
+@role_required(ADMIN)
+def bulk_staff():
+    return _bulk_provision(provision_staff, "Staff provisioned")
+
+
+@admin_bp.post("/bulk/courses")
+@role_required(ADMIN)
+def bulk_courses():
+    return _bulk_provision(provision_courses, "Courses provisioned")
+
+
 @admin_bp.get("/system-stats")
 @role_required(ADMIN)
 def get_system_stats():
@@ -203,6 +228,70 @@ def get_system_stats():
     return jsonify(data), status
 
 
+@admin_bp.get("/metrics")
+@role_required(ADMIN)
+def get_metrics():
+    return Response(render_metrics(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@admin_bp.post("/recompute-analytics")
+@role_required(ADMIN)
+def recompute_analytics_endpoint():
+    payload = request.get_json() or {}
+    try:
+        course_id = int(payload["course_id"]) if payload.get("course_id") else None
+        department_id = int(payload["department_id"]) if payload.get("department_id") else None
+        chunk_size = int(payload.get("chunk_size") or DEFAULT_RECOMPUTE_CHUNK_SIZE)
+    except (TypeError, ValueError):
+        data, status = error_response("course_id, department_id and chunk_size must be integers", 400)
+        return jsonify(data), status
+    # A whole-institution run, or one fanned out over processes, outlives proxy timeouts.
+    if not course_id and not department_id:
+        data, status = error_response(
+            "course_id or department_id is required; run `flask recompute-analytics` for the whole institution", 400
+        )
+        return jsonify(data), status
+    if payload.get("workers"):
+        data, status = error_response("workers is only available from `flask recompute-analytics`", 400)
+        return jsonify(data), status
+    session = (payload.get("session") or "").strip() or None
+
+    try:
+        result = recompute_analytics(
+            course_id=course_id,
+            department_id=department_id,
+            session=session,
+            chunk_size=chunk_size,
+        )
+    except ValueError as exc:
+        data, status = error_response(str(exc), 400)
+        return jsonify(data), status
+    data, status = success_response("Analytics recomputed", result)
+    return jsonify(data), status
+
+
+@admin_bp.get("/exports/<dataset>")
+@role_required(ADMIN)
+def export_dataset(dataset: str):
+    try:
+        department_id = int(request.args["department_id"]) if request.args.get("department_id") else None
+        course_id = int(request.args["course_id"]) if request.args.get("course_id") else None
+    except ValueError:
+        data, status = error_response("department_id and course_id must be integers", 400)
+        return jsonify(data), status
+    try:
+        return export_response(
+            dataset,
+            (request.args.get("format") or "csv").strip().lower(),
+            session=(request.args.get("session") or "").strip() or None,
+            department_id=department_id,
+            course_id=course_id,
+        )
+    except ValueError as exc:
+        data, status = error_response(str(exc), 400)
+        return jsonify(data), status
+
+
 @admin_bp.post("/bootstrap-structure")
 @role_required(ADMIN)
 def bootstrap_structure():
@@ -249,61 +338,45 @@ def bootstrap_structure():
     return jsonify(data), status
 
 
+def _reference_response(payload, etag: str, message: str):
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        data, status = success_response(message, payload)
+        response = jsonify(data)
+        response.status_code = status
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+
+REFERENCE_LIST = ListSpec(
+    key=University.university_id,
+    sorts={"name": University.name},
+    filters={"q": Filter(University.name, contains=True)},
+    default_sort="name",
+)
+
+
 @admin_bp.get("/reference-data")
 @role_required(ADMIN)
 def reference_data():
-    universities = University.query.order_by(University.name.asc()).all()
-    payload = []
-    for uni in universities:
-        faculties = Faculty.query.filter_by(university_id=uni.university_id).order_by(Faculty.name.asc()).all()
-        faculty_data = []
-        for fac in faculties:
-            departments = Department.query.filter_by(faculty_id=fac.faculty_id).order_by(Department.name.asc()).all()
-            faculty_data.append(
-                {
-                    "faculty_id": fac.faculty_id,
-                    "name": fac.name,
-                    "departments": [{"department_id": d.department_id, "name": d.name} for d in departments],
-                }
-            )
-        payload.append(
-            {
-                "university_id": uni.university_id,
-                "name": uni.name,
-                "location": uni.location,
-                "established_year": uni.established_year,
-                "faculties": faculty_data,
-            }
-        )
-    data, status = success_response("Reference data fetched", payload)
-    return jsonify(data), status
+    try:
+        page = parse_page_request(REFERENCE_LIST, request.args)
+    except ValueError as exc:
+        data, status = error_response(str(exc), 400)
+        return jsonify(data), status
+    tree, etag = reference_tree()
+    # The page depends on the query string, so it is part of the validator.
+    page_etag = f"{etag}-{hashlib.sha1(request.query_string).hexdigest()[:12]}"
+    return _reference_response(paginate_items(tree, REFERENCE_LIST, page), page_etag, "Reference data fetched")
 
 
 @admin_bp.get("/university-structure/<int:university_id>")
 @role_required(ADMIN)
 def university_structure(university_id: int):
-    uni = University.query.get(university_id)
-    if not uni:
+    payload, etag = university_subtree(university_id)
+    if payload is None:
         data, status = error_response("University not found", 404)
         return jsonify(data), status
-
-    faculties = Faculty.query.filter_by(university_id=uni.university_id).order_by(Faculty.name.asc()).all()
-    payload = {
-        "university_id": uni.university_id,
-        "name": uni.name,
-        "location": uni.location,
-        "established_year": uni.established_year,
-        "faculties": [],
-    }
-    for fac in faculties:
-        departments = Department.query.filter_by(faculty_id=fac.faculty_id).order_by(Department.name.asc()).all()
-        payload["faculties"].append(
-            {
-                "faculty_id": fac.faculty_id,
-                "name": fac.name,
-                "departments": [{"department_id": d.department_id, "name": d.name} for d in departments],
-            }
-        )
-
-    data, status = success_response("University structure fetched", payload)
-    return jsonify(data), status
+    return _reference_response(payload, etag, "University structure fetched")
@@ -1,37 +1,52 @@
-from flask import Blueprint, jsonify
-from flask_jwt_extended import get_jwt_identity
+from flask import Blueprint, jsonify, request
 
-from app.models.analytics_result import AnalyticsResult
-from app.models.enrollment import Enrollment
 from app.models.student import Student
+from app.services.aggregation_service import AT_RISK_LIST, advisor_at_risk_summary
+from app.services.personalization_service import COHORT_LIST, build_cohort_summaries
 from app.utils.constants import COURSE_ADVISOR
-from app.utils.helpers import success_response
+from app.utils.helpers import error_response, success_response
+from app.utils.pagination import Filter, ListSpec, paginate, parse_page_request
+from app.utils.principal import current_principal
 from app.utils.role_required import role_required
 
 advisor_bp = Blueprint("advisor", __name__)
 
 
 def _current_staff_id() -> int:
-    identity = get_jwt_identity()
-    _, user_id = identity.split(":")
-    return int(user_id)
+    return current_principal().user_id
+
+
+ADVISEE_LIST = ListSpec(
+    key=Student.student_id,
+    sorts={"matric_no": Student.matric_no, "full_name": Student.full_name, "level": Student.level},
+    filters={
+        "q": Filter(Student.full_name, contains=True),
+        "matric_no": Filter(Student.matric_no, cast=str.upper),
+        "level": Filter(Student.level, cast=int),
+    },
+)
 
 
 @advisor_bp.get("/students")
 @role_required(COURSE_ADVISOR)
 def advisor_students():
-    staff_id = _current_staff_id()
-    students = Student.query.filter_by(advisor_id=staff_id).all()
-    payload = [
-        {
+    try:
+        page = parse_page_request(ADVISEE_LIST, request.args)
+    except ValueError as exc:
+        data, status = error_response(str(exc), 400)
+        return jsonify(data), status
+    payload = paginate(
+        Student.query.filter_by(advisor_id=_current_staff_id()),
+        ADVISEE_LIST,
+        page,
+        lambda s: {
             "student_id": s.student_id,
             "matric_no": s.matric_no,
             "full_name": s.full_name,
             "level": s.level,
             "department_id": s.department_id,
-        }
-        for s in students
-    ]
+        },
+    )
     data, status = success_response("Assigned students fetched", payload)
     return jsonify(data), status
 
@@ -39,21 +54,24 @@ def advisor_students():
 @advisor_bp.get("/at-risk")
 @role_required(COURSE_ADVISOR)
 def advisor_at_risk():
-    staff_id = _current_staff_id()
-    rows = (
-        Student.query.join(Enrollment, Enrollment.student_id == Student.student_id)
-        .join(AnalyticsResult, AnalyticsResult.enrollment_id == Enrollment.enrollment_id)
-        .filter(Student.advisor_id == staff_id, AnalyticsResult.risk_level.in_(["HIGH", "MEDIUM"]))
-        .all()
-    )
-    payload = [
-        {
-            "student_id": s.student_id,
-            "matric_no": s.matric_no,
-            "full_name": s.full_name,
-        }
-        for s in rows
-    ]
+    try:
+        page = parse_page_request(AT_RISK_LIST, request.args)
+    except ValueError as exc:
+        data, status = error_response(str(exc), 400)
+        return jsonify(data), status
+    payload = advisor_at_risk_summary(_current_staff_id(), page)
     data, status = success_response("At-risk advisees fetched", payload)
     return jsonify(data), status
 
+
+@advisor_bp.get("/personalization")
+@role_required(COURSE_ADVISOR)
+def advisor_personalization():
+    try:
+        page = parse_page_request(COHORT_LIST, request.args)
+    except ValueError as exc:
+        data, status = error_response(str(exc), 400)
+        return jsonify(data), status
+    payload = build_cohort_summaries(advisor_id=_current_staff_id(), page=page)
+    data, status = success_response("Advisee personalization fetched", payload)
+    return jsonify(data), status
@@ -1,16 +1,21 @@
-from flask import Blueprint, jsonify, request
-from flask_jwt_extended import create_access_token, get_jwt, get_jwt_identity, jwt_required
+import time
+
+from flask import Blueprint, after_this_request, jsonify, request
+from flask_jwt_extended import create_access_token, get_jwt, jwt_required
 from marshmallow import ValidationError
+from sqlalchemy import literal, select, union_all, update
 
 from app.extensions import db
-from app.models.department import Department
-from app.models.faculty import Faculty
 from app.models.staff import Staff
 from app.models.student import Student
 from app.models.university import University
 from app.schemas.student_schema import StudentRegisterSchema, StudentSchema
+from app.services.reference_data_service import department_university_id, reference_tree, university_name
 from app.utils.constants import STUDENT
 from app.utils.helpers import error_response, success_response
+from app.utils.pagination import Filter, ListSpec, paginate_items, parse_page_request
+from app.utils.passwords import hash_password, needs_rehash, verify_password
+from app.utils.principal import current_principal
 
 auth_bp = Blueprint("auth", __name__)
 
@@ -18,38 +23,68 @@ student_register_schema = StudentRegisterSchema()
 student_schema = StudentSchema()
 
 
-def _department_university_id(department_id: int | None) -> int | None:
-    if not department_id:
-        return None
-    department = Department.query.get(department_id)
-    if not department:
-        return None
-    faculty = Faculty.query.get(department.faculty_id)
-    return faculty.university_id if faculty else None
-
-
-def _staff_university_id(staff: Staff) -> int | None:
-    return _department_university_id(staff.department_id)
+_ACCOUNT_MODELS = {"staff": Staff, "student": Student}
+
+
+def _login_candidates(identifier: str):
+    """Staff matching the email and students matching the matric number, staff first, in one query."""
+    staff = select(
+        literal("staff").label("user_type"),
+        Staff.staff_id.label("user_id"),
+        Staff.password_hash,
+        Staff.role,
+        Staff.department_id,
+        Staff.full_name,
+    ).where(Staff.email == identifier.lower())
+    student = select(
+        literal("student").label("user_type"),
+        Student.student_id.label("user_id"),
+        Student.password_hash,
+        literal(STUDENT).label("role"),
+        Student.department_id,
+        Student.full_name,
+    ).where(Student.matric_no == identifier.upper())
+    rows = db.session.execute(union_all(staff, student)).all()
+    return sorted(rows, key=lambda row: row.user_type != "staff")
+
+
+def _verify_and_upgrade(account, password: str, timings: dict) -> bool:
+    """Check a password and, on success, rehash it if the hashing policy has changed."""
+    started = time.perf_counter()
+    valid = verify_password(password, account.password_hash)
+    timings["verify"] = timings.get("verify", 0.0) + (time.perf_counter() - started) * 1000
+    if valid and needs_rehash(account.password_hash):
+        started = time.perf_counter()
+        model = _ACCOUNT_MODELS[account.user_type]
+        primary_key = model.__mapper__.primary_key[0]
+        db.session.execute(
+            update(model).where(primary_key == account.user_id).values(password_hash=hash_password(password))
+        )
+        db.session.commit()
+        timings["rehash"] = (time.perf_counter() - started) * 1000
+    return valid
 
 
-def _student_university_id(student: Student) -> int | None:
-    return _department_university_id(student.department_id)
+UNIVERSITY_LIST = ListSpec(
+    key=University.university_id,
+    sorts={"name": University.name},
+    filters={"q": Filter(University.name, contains=True), "location": Filter(University.location)},
+    default_sort="name",
+)
 
 
 @auth_bp.get("/universities")
 def auth_universities():
-    universities = University.query.order_by(University.name.asc()).all()
-    data, status = success_response(
-        "Universities fetched",
-        [
-            {
-                "university_id": uni.university_id,
-                "name": uni.name,
-                "location": uni.location,
-            }
-            for uni in universities
-        ],
-    )
+    try:
+        page = parse_page_request(UNIVERSITY_LIST, request.args)
+    except ValueError as exc:
+        data, status = error_response(str(exc), 400)
+        return jsonify(data), status
+    tree, _ = reference_tree()
+    universities = [
+        {"university_id": uni["university_id"], "name": uni["name"], "location": uni["location"]} for uni in tree
+    ]
+    data, status = success_response("Universities fetched", paginate_items(universities, UNIVERSITY_LIST, page))
     return jsonify(data), status
 
 
@@ -84,6 +119,15 @@ def register():
 
 @auth_bp.post("/login")
 def login():
+    started = time.perf_counter()
+    timings = {}
+
+    @after_this_request
+    def _server_timing(response):
+        timings["total"] = (time.perf_counter() - started) * 1000
+        response.headers["Server-Timing"] = ", ".join(f"{name};dur={ms:.1f}" for name, ms in timings.items())
+        return response
+
     payload = request.get_json() or {}
     identifier = str(payload.get("identifier", "")).strip()
     password = str(payload.get("password", "")).strip()
@@ -98,64 +142,39 @@ def login():
         data, status = error_response("university_id must be a valid integer", 400)
         return jsonify(data), status
 
-    university = University.query.get(university_id)
-    if not university:
+    uni_name = university_name(university_id)
+    if not uni_name:
         data, status = error_response("University not found", 404)
         return jsonify(data), status
 
-    staff = Staff.query.filter_by(email=identifier.lower()).first()
-    if staff and staff.check_password(password):
-        staff_uni_id = _staff_university_id(staff)
-        if staff_uni_id and staff_uni_id != university_id:
+    for account in _login_candidates(identifier):
+        if not _verify_and_upgrade(account, password, timings):
+            continue
+        account_uni_id = department_university_id(account.department_id)
+        if account.user_type == "staff" and account_uni_id and account_uni_id != university_id:
             data, status = error_response("This staff account does not belong to the selected university", 403)
             return jsonify(data), status
-
-        claims = {
-            "role": staff.role,
-            "user_type": "staff",
-            "department_id": staff.department_id,
-            "university_id": university_id,
-        }
-        token = create_access_token(identity=f"staff:{staff.staff_id}", additional_claims=claims)
-        data, status = success_response(
-            "Login successful",
-            {
-                "access_token": token,
-                "user": {
-                    "id": staff.staff_id,
-                    "name": staff.full_name,
-                    "role": staff.role,
-                    "university_id": university_id,
-                    "university_name": university.name,
-                },
-            },
-        )
-        return jsonify(data), status
-
-    student = Student.query.filter_by(matric_no=identifier.upper()).first()
-    if student and student.check_password(password):
-        student_uni_id = _student_university_id(student)
-        if student_uni_id != university_id:
+        if account.user_type == "student" and account_uni_id != university_id:
             data, status = error_response("This student account does not belong to the selected university", 403)
             return jsonify(data), status
 
         claims = {
-            "role": STUDENT,
-            "user_type": "student",
-            "department_id": student.department_id,
+            "role": account.role,
+            "user_type": account.user_type,
+            "department_id": account.department_id,
             "university_id": university_id,
         }
-        token = create_access_token(identity=f"student:{student.student_id}", additional_claims=claims)
+        token = create_access_token(identity=f"{account.user_type}:{account.user_id}", additional_claims=claims)
         data, status = success_response(
             "Login successful",
             {
                 "access_token": token,
                 "user": {
-                    "id": student.student_id,
-                    "name": student.full_name,
-                    "role": STUDENT,
+                    "id": account.user_id,
+                    "name": account.full_name,
+                    "role": account.role,
                     "university_id": university_id,
-                    "university_name": university.name,
+                    "university_name": uni_name,
                 },
             },
         )
@@ -168,41 +187,36 @@ def login():
 @auth_bp.get("/me")
 @jwt_required()
 def me():
-    identity = get_jwt_identity()
+    principal = current_principal()
     claims = get_jwt()
-    user_type, user_id = identity.split(":")
+    account = principal.load()
+    if not account:
+        data, status = error_response("User not found", 404)
+        return jsonify(data), status
 
-    if user_type == "staff":
-        staff = Staff.query.get(int(user_id))
-        if not staff:
-            data, status = error_response("User not found", 404)
-            return jsonify(data), status
+    if principal.is_staff:
         payload = {
-            "id": staff.staff_id,
-            "full_name": staff.full_name,
-            "email": staff.email,
-            "role": staff.role,
-            "department_id": staff.department_id,
-            "university_id": claims.get("university_id"),
+            "id": account.staff_id,
+            "full_name": account.full_name,
+            "email": account.email,
+            "role": account.role,
+            "department_id": account.department_id,
+            "university_id": principal.university_id,
         }
     else:
-        student = Student.query.get(int(user_id))
-        if not student:
-            data, status = error_response("User not found", 404)
-            return jsonify(data), status
         payload = {
-            "id": student.student_id,
-            "full_name": student.full_name,
-            "matric_no": student.matric_no,
+            "id": account.student_id,
+            "full_name": account.full_name,
+            "matric_no": account.matric_no,
             "role": STUDENT,
-            "department_id": student.department_id,
-            "university_id": claims.get("university_id"),
+            "department_id": account.department_id,
+            "university_id": principal.university_id,
         }
 
     payload["claims"] = {
-        "role": claims.get("role"),
+        "role": principal.role,
         "user_type": claims.get("user_type"),
-        "university_id": claims.get("university_id"),
+        "university_id": principal.university_id,
     }
     data, status = success_response("User profile fetched", payload)
     return jsonify(data), status
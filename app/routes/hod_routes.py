@@ -1,17 +1,25 @@
-from flask import Blueprint, jsonify
+from datetime import datetime
+
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
 from flask_jwt_extended import get_jwt, get_jwt_identity, jwt_required
-from sqlalchemy import func
 
-from app.extensions import db
 from app.models.analytics_result import AnalyticsResult
-from app.models.assessment import Assessment
-from app.models.course import Course
 from app.models.department import Department
-from app.models.enrollment import Enrollment
 from app.models.staff import Staff
-from app.services.aggregation_service import department_analytics_snapshot
+from app.services.aggregation_service import department_analytics_snapshot, department_high_risk_courses
+from app.services.batch_report_service import open_department_report_export, validate_report_format
+from app.services.export_service import export_response
+from app.services.gpa_service import (
+    GPA_RANKING_LIST,
+    PROBATION_LIST,
+    degree_class_bands,
+    department_gpa_ranking,
+    probation_list,
+)
+from app.services.personalization_service import COHORT_LIST, build_cohort_summaries
 from app.utils.constants import HOD, LECTURER
 from app.utils.helpers import error_response, success_response
+from app.utils.pagination import Filter, ListSpec, paginate, parse_page_request
 from app.utils.role_required import role_required
 
 hod_bp = Blueprint("hod", __name__)
@@ -25,21 +33,35 @@ def department_analytics():
     if not department_id:
         data, status = error_response("HOD has no department assigned", 400)
         return jsonify(data), status
-    snapshot = department_analytics_snapshot(department_id)
+    snapshot = department_analytics_snapshot(
+        department_id, use_dataframe=current_app.config.get("AGGREGATION_USE_DATAFRAME", False)
+    )
     data, status = success_response("Department analytics fetched", snapshot)
     return jsonify(data), status
 
 
+LECTURER_LIST = ListSpec(
+    key=Staff.staff_id,
+    sorts={"full_name": Staff.full_name, "email": Staff.email},
+    filters={"q": Filter(Staff.full_name, contains=True), "email": Filter(Staff.email, cast=str.lower)},
+)
+
+
 @hod_bp.get("/lecturers")
 @role_required(HOD)
 def lecturers():
-    claims = get_jwt()
-    department_id = claims.get("department_id")
-    lecturers_q = Staff.query.filter_by(department_id=department_id, role=LECTURER).all()
-    payload = [
-        {"staff_id": x.staff_id, "full_name": x.full_name, "email": x.email, "role": x.role}
-        for x in lecturers_q
-    ]
+    try:
+        page = parse_page_request(LECTURER_LIST, request.args)
+    except ValueError as exc:
+        data, status = error_response(str(exc), 400)
+        return jsonify(data), status
+    department_id = get_jwt().get("department_id")
+    payload = paginate(
+        Staff.query.filter_by(department_id=department_id, role=LECTURER),
+        LECTURER_LIST,
+        page,
+        lambda x: {"staff_id": x.staff_id, "full_name": x.full_name, "email": x.email, "role": x.role},
+    )
     data, status = success_response("Department lecturers fetched", payload)
     return jsonify(data), status
 
@@ -49,16 +71,118 @@ def lecturers():
 def high_risk_courses():
     claims = get_jwt()
     department_id = claims.get("department_id")
-    rows = (
-        db.session.query(Course.course_id, Course.course_code, func.avg(Assessment.total_score).label("avg_score"))
-        .join(Enrollment, Enrollment.course_id == Course.course_id)
-        .join(Assessment, Assessment.enrollment_id == Enrollment.enrollment_id)
-        .filter(Course.department_id == department_id)
-        .group_by(Course.course_id, Course.course_code)
-        .having(func.avg(Assessment.total_score) < 50)
-        .all()
-    )
-    payload = [{"course_id": cid, "course_code": code, "average_score": round(float(avg), 2)} for cid, code, avg in rows]
+    payload = department_high_risk_courses(department_id)
     data, status = success_response("High-risk courses fetched", payload)
     return jsonify(data), status
 
+
+@hod_bp.get("/personalization")
+@role_required(HOD)
+def department_personalization():
+    department_id = get_jwt().get("department_id")
+    if not department_id:
+        data, status = error_response("HOD has no department assigned", 400)
+        return jsonify(data), status
+    try:
+        page = parse_page_request(COHORT_LIST, request.args)
+    except ValueError as exc:
+        data, status = error_response(str(exc), 400)
+        return jsonify(data), status
+    payload = build_cohort_summaries(department_id=department_id, page=page)
+    data, status = success_response("Department personalization fetched", payload)
+    return jsonify(data), status
+
+
+@hod_bp.get("/gpa-ranking")
+@role_required(HOD)
+def gpa_ranking():
+    try:
+        page = parse_page_request(GPA_RANKING_LIST, request.args)
+    except ValueError as exc:
+        data, status = error_response(str(exc), 400)
+        return jsonify(data), status
+    department_id = get_jwt().get("department_id")
+    data, status = success_response("Department GPA ranking fetched", department_gpa_ranking(department_id, page))
+    return jsonify(data), status
+
+
+@hod_bp.get("/degree-classes")
+@role_required(HOD)
+def degree_classes():
+    department_id = get_jwt().get("department_id")
+    data, status = success_response("Class of degree bands fetched", degree_class_bands(department_id))
+    return jsonify(data), status
+
+
+@hod_bp.get("/probation")
+@role_required(HOD)
+def probation():
+    try:
+        page = parse_page_request(PROBATION_LIST, request.args)
+    except ValueError as exc:
+        data, status = error_response(str(exc), 400)
+        return jsonify(data), status
+    department_id = get_jwt().get("department_id")
+    data, status = success_response("Probation list fetched", probation_list(department_id, page))
+    return jsonify(data), status
+
+
+@hod_bp.get("/exports/<dataset>")
+@role_required(HOD)
+def export_department_dataset(dataset: str):
+    department_id = get_jwt().get("department_id")
+    if not department_id:
+        data, status = error_response("HOD has no department assigned", 400)
+        return jsonify(data), status
+    try:
+        course_id = int(request.args["course_id"]) if request.args.get("course_id") else None
+    except ValueError:
+        data, status = error_response("course_id must be an integer", 400)
+        return jsonify(data), status
+    try:
+        return export_response(
+            dataset,
+            (request.args.get("format") or "csv").strip().lower(),
+            session=(request.args.get("session") or "").strip() or None,
+            department_id=department_id,
+            course_id=course_id,
+        )
+    except ValueError as exc:
+        data, status = error_response(str(exc), 400)
+        return jsonify(data), status
+
+
+@hod_bp.get("/reports/export")
+@role_required(HOD)
+def export_department_reports():
+    department_id = get_jwt().get("department_id")
+    if not department_id:
+        data, status = error_response("HOD has no department assigned", 400)
+        return jsonify(data), status
+    export_format = (request.args.get("format") or "pdf").strip().lower()
+    try:
+        validate_report_format(export_format)
+    except ValueError as exc:
+        data, status = error_response(str(exc), 400)
+        return jsonify(data), status
+    except RuntimeError as exc:
+        data, status = error_response(str(exc), 501)
+        return jsonify(data), status
+
+    stream = open_department_report_export(
+        department_id,
+        export_format,
+        workers=current_app.config.get("REPORT_EXPORT_WORKERS", 2),
+        batch_size=current_app.config.get("REPORT_EXPORT_BATCH_SIZE", 100),
+    )
+    if stream is None:
+        data, status = error_response("Another report export is running; try again shortly", 429)
+        return jsonify(data), status
+    stamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    response = Response(stream_with_context(stream), mimetype="application/zip")
+    # HEAD requests and early teardowns close the response without iterating it.
+    response.call_on_close(stream.release)
+    response.headers["Content-Disposition"] = (
+        f"attachment; filename=department_{department_id}_reports_{export_format}_{stamp}.zip"
+    )
+    return response
@@ -1,25 +1,21 @@
-from flask import Blueprint, jsonify, request
-from flask_jwt_extended import get_jwt_identity
-from sqlalchemy import func
+from flask import Blueprint, current_app, jsonify, request
 
 from app.extensions import db
-from app.models.analytics_result import AnalyticsResult
-from app.models.assessment import Assessment
-from app.models.course import Course
-from app.models.enrollment import Enrollment
+from app.models.import_job import ImportJob
 from app.models.student import Student
-from app.services.csv_import_service import process_result_csv
+from app.services.aggregation_service import course_performance_summary
+from app.services.csv_import_service import IMPORT_MODE_BULK, IMPORT_MODES, process_result_csv
+from app.services.job_service import enqueue_result_import, serialize_job
 from app.utils.constants import LECTURER
 from app.utils.helpers import error_response, success_response
+from app.utils.principal import current_principal
 from app.utils.role_required import role_required
 
 lecturer_bp = Blueprint("lecturer", __name__)
 
 
 def _current_lecturer_id() -> int:
-    identity = get_jwt_identity()
-    _, user_id = identity.split(":")
-    return int(user_id)
+    return current_principal().user_id
 
 
 @lecturer_bp.post("/upload-results")
@@ -32,17 +28,36 @@ def upload_results():
     csv_file = request.files["file"]
     session = (request.form.get("session") or "").strip()
     semester = (request.form.get("semester") or "").strip()
+    mode = (request.form.get("mode") or IMPORT_MODE_BULK).strip().lower()
     if not session or not semester:
         data, status = error_response("session and semester are required", 400)
         return jsonify(data), status
+    if mode not in IMPORT_MODES:
+        data, status = error_response(f"mode must be one of {sorted(IMPORT_MODES)}", 400)
+        return jsonify(data), status
 
     lecturer_id = _current_lecturer_id()
+    background = (request.form.get("background") or "true").strip().lower() != "false"
+    if background:
+        job = enqueue_result_import(
+            current_app._get_current_object(),
+            file_storage=csv_file,
+            lecturer_id=lecturer_id,
+            session=session,
+            semester=semester,
+            mode=mode,
+        )
+        data, status = success_response("CSV import queued", serialize_job(job), 202)
+        return jsonify(data), status
+
     try:
         summary = process_result_csv(
             file_storage=csv_file,
             lecturer_id=lecturer_id,
             session=session,
             semester=semester,
+            mode=mode,
+            chunk_size=current_app.config.get("CSV_IMPORT_CHUNK_SIZE", 1000),
         )
         data, status = success_response("CSV processed successfully", summary, 201)
         return jsonify(data), status
@@ -52,46 +67,22 @@ def upload_results():
         return jsonify(data), status
 
 
+@lecturer_bp.get("/upload-jobs/<job_id>")
+@role_required(LECTURER)
+def upload_job_status(job_id: str):
+    job = db.session.get(ImportJob, job_id)
+    if not job or job.lecturer_id != _current_lecturer_id():
+        data, status = error_response("Import job not found", 404)
+        return jsonify(data), status
+    data, status = success_response("Import job fetched", serialize_job(job))
+    return jsonify(data), status
+
+
 @lecturer_bp.get("/class-analytics")
 @role_required(LECTURER)
 def class_analytics():
     lecturer_id = _current_lecturer_id()
-    courses = Course.query.filter_by(lecturer_id=lecturer_id).all()
-    results = []
-    for c in courses:
-        total = (
-            db.session.query(func.count(Assessment.assessment_id))
-            .join(Enrollment, Enrollment.enrollment_id == Assessment.enrollment_id)
-            .filter(Enrollment.course_id == c.course_id)
-            .scalar()
-            or 0
-        )
-        passed = (
-            db.session.query(func.count(Assessment.assessment_id))
-            .join(Enrollment, Enrollment.enrollment_id == Assessment.enrollment_id)
-            .filter(Enrollment.course_id == c.course_id, Assessment.total_score >= 50)
-            .scalar()
-            or 0
-        )
-        at_risk = (
-            db.session.query(func.count(AnalyticsResult.analytics_id))
-            .join(Enrollment, Enrollment.enrollment_id == AnalyticsResult.enrollment_id)
-            .filter(Enrollment.course_id == c.course_id, AnalyticsResult.risk_level.in_(["HIGH", "MEDIUM"]))
-            .scalar()
-            or 0
-        )
-        pass_rate = round((passed / total) * 100, 2) if total else 0.0
-        results.append(
-            {
-                "course_id": c.course_id,
-                "course_code": c.course_code,
-                "course_title": c.course_title,
-                "pass_rate": pass_rate,
-                "at_risk_students": at_risk,
-                "records": total,
-            }
-        )
-
+    by_term = (request.args.get("by_term") or "").strip().lower() in {"1", "true", "yes"}
+    results = course_performance_summary(lecturer_id=lecturer_id, by_term=by_term)
     data, status = success_response("Class analytics fetched", results)
     return jsonify(data), status
-
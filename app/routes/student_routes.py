@@ -1,46 +1,65 @@
 from datetime import datetime
 
-from flask import Blueprint, jsonify, make_response, request
-from flask_jwt_extended import get_jwt_identity
+from flask import Blueprint, Response, jsonify, make_response, request
+from sqlalchemy.orm import joinedload
 
 from app.models.enrollment import Enrollment
 from app.models.student import Student
-from app.services.personalization_service import build_personalized_learning_payload
+from app.services.payload_cache_service import get_personalized_learning_payload, student_payload_etag
 from app.services.report_service import build_student_report_csv, build_student_report_pdf
 from app.utils.constants import STUDENT
 from app.utils.helpers import error_response, success_response
+from app.utils.pagination import Filter, ListSpec, paginate, parse_page_request
+from app.utils.principal import current_principal
 from app.utils.role_required import role_required
 
 student_bp = Blueprint("student", __name__)
 
 
 def _current_student() -> Student | None:
-    identity = get_jwt_identity()
-    user_type, user_id = identity.split(":")
-    if user_type != "student":
-        return None
-    return Student.query.get(int(user_id))
+    principal = current_principal()
+    return principal.load() if principal.is_student else None
+
+
+def _cached_payload_response(student: Student, message: str):
+    etag = student_payload_etag(student)
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        data, status = success_response(message, get_personalized_learning_payload(student))
+        response = jsonify(data)
+        response.status_code = status
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+
+COURSE_LIST = ListSpec(
+    key=Enrollment.enrollment_id,
+    filters={"session": Filter(Enrollment.session), "semester": Filter(Enrollment.semester, cast=str.upper)},
+)
 
 
 @student_bp.get("/courses")
 @role_required(STUDENT)
 def student_courses():
-    student = _current_student()
-    if not student:
-        data, status = error_response("Student profile not found", 404)
+    try:
+        page = parse_page_request(COURSE_LIST, request.args)
+    except ValueError as exc:
+        data, status = error_response(str(exc), 400)
         return jsonify(data), status
-
-    enrollments = Enrollment.query.filter_by(student_id=student.student_id).all()
-    payload = [
-        {
+    payload = paginate(
+        Enrollment.query.options(joinedload(Enrollment.course)).filter_by(student_id=current_principal().user_id),
+        COURSE_LIST,
+        page,
+        lambda e: {
             "course_code": e.course.course_code,
             "course_title": e.course.course_title,
             "credit_units": e.course.credit_units,
             "session": e.session,
             "semester": e.semester,
-        }
-        for e in enrollments
-    ]
+        },
+    )
     data, status = success_response("Student courses fetched", payload)
     return jsonify(data), status
 
@@ -53,9 +72,7 @@ def dashboard():
         data, status = error_response("Student profile not found", 404)
         return jsonify(data), status
 
-    payload = build_personalized_learning_payload(student)
-    data, status = success_response("Student dashboard fetched", payload)
-    return jsonify(data), status
+    return _cached_payload_response(student, "Student dashboard fetched")
 
 
 @student_bp.get("/personalized-learning")
@@ -65,9 +82,7 @@ def personalized_learning():
     if not student:
         data, status = error_response("Student profile not found", 404)
         return jsonify(data), status
-    payload = build_personalized_learning_payload(student)
-    data, status = success_response("Personalized learning analytics fetched", payload)
-    return jsonify(data), status
+    return _cached_payload_response(student, "Personalized learning analytics fetched")
 
 
 @student_bp.get("/personalized-learning-report")
@@ -78,7 +93,7 @@ def personalized_learning_report():
         data, status = error_response("Student profile not found", 404)
         return jsonify(data), status
 
-    payload = build_personalized_learning_payload(student)
+    payload = get_personalized_learning_payload(student)
     export_format = (request.args.get("format") or "csv").strip().lower()
     stamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
     base_filename = f"{student.matric_no.replace('/', '_')}_personalized_report_{stamp}"
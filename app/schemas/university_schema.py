@@ -21,3 +21,8 @@ class DepartmentSchema(ma.Schema):
     name = fields.Str(required=True)
     faculty_id = fields.Int(required=True)
 
+
+class StructureRowSchema(ma.Schema):
+    university_id = fields.Int(required=True)
+    faculty = fields.Str(required=True)
+    department = fields.Str(load_default=None)
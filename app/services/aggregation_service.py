@@ -1,19 +1,28 @@
-from sqlalchemy import func
-
-import numpy as np
-import pandas as pd
+from sqlalchemy import case, func
 
 from app.extensions import db
+from app.models.analytics_result import AnalyticsResult
 from app.models.assessment import Assessment
 from app.models.course import Course
 from app.models.department import Department
 from app.models.enrollment import Enrollment
 from app.models.faculty import Faculty
+from app.models.performance_rollup import PerformanceRollup
 from app.models.student import Student
-from app.utils.constants import GRADE_POINTS
+from app.services.gpa_service import student_gpa
+from app.services.rollup_service import ROLLUP_GRADE_COLUMNS
+from app.utils.constants import GRADE_POINTS, RISK_HIGH, RISK_MEDIUM
+from app.utils.pagination import ListSpec, PageRequest, paginate, parse_page_request
+
+AT_RISK_LIST = ListSpec(
+    key=Student.student_id,
+    sorts={"matric_no": Student.matric_no, "full_name": Student.full_name},
+)
 
 
 def _assessment_dataframe(query):
+    import pandas as pd
+
     rows = query.all()
     if not rows:
         return pd.DataFrame(columns=["grade", "total_score", "course_code", "department_id", "faculty_id"])
@@ -23,19 +32,11 @@ def _assessment_dataframe(query):
     )
 
 
-def student_gpa_estimate(student_id: int) -> float:
-    rows = (
-        db.session.query(Assessment.grade, Course.credit_units)
-        .join(Enrollment, Enrollment.enrollment_id == Assessment.enrollment_id)
-        .join(Course, Course.course_id == Enrollment.course_id)
-        .filter(Enrollment.student_id == student_id)
-        .all()
-    )
-    if not rows:
-        return 0.0
+def gpa_from_grades(grade_units) -> float:
+    """GPA from ``(grade, credit_units)`` pairs that are already loaded."""
     total_points = 0.0
     total_units = 0
-    for grade, units in rows:
+    for grade, units in grade_units:
         total_points += GRADE_POINTS.get(grade, 0.0) * units
         total_units += units
     if total_units == 0:
@@ -43,73 +44,205 @@ def student_gpa_estimate(student_id: int) -> float:
     return round(total_points / total_units, 2)
 
 
-def course_pass_rate(course_id: int) -> float:
-    total = (
-        db.session.query(func.count(Assessment.assessment_id))
-        .join(Enrollment, Enrollment.enrollment_id == Assessment.enrollment_id)
-        .filter(Enrollment.course_id == course_id)
-        .scalar()
-        or 0
+def student_gpa_estimate(student_id: int) -> float:
+    return student_gpa(student_id)
+
+
+def course_performance_summary(
+    course_ids: list[int] | None = None,
+    lecturer_id: int | None = None,
+    by_term: bool = False,
+) -> list[dict]:
+    """Totals, pass rate and at-risk counts for many courses from one GROUP BY.
+
+    Courses without any records are still returned with zero counts. With
+    ``by_term`` each course also carries a per session/semester breakdown.
+    """
+    passed = func.sum(case((Assessment.total_score >= 50, 1), else_=0))
+    at_risk = func.sum(case((AnalyticsResult.risk_level.in_([RISK_HIGH, RISK_MEDIUM]), 1), else_=0))
+    group_columns = [Course.course_id, Course.course_code, Course.course_title]
+    if by_term:
+        group_columns += [Enrollment.session, Enrollment.semester]
+
+    query = (
+        db.session.query(*group_columns, func.count(Assessment.assessment_id), passed, at_risk)
+        .outerjoin(Enrollment, Enrollment.course_id == Course.course_id)
+        .outerjoin(Assessment, Assessment.enrollment_id == Enrollment.enrollment_id)
+        .outerjoin(AnalyticsResult, AnalyticsResult.enrollment_id == Enrollment.enrollment_id)
     )
-    if total == 0:
-        return 0.0
-    passed = (
-        db.session.query(func.count(Assessment.assessment_id))
-        .join(Enrollment, Enrollment.enrollment_id == Assessment.enrollment_id)
-        .filter(Enrollment.course_id == course_id, Assessment.total_score >= 50)
-        .scalar()
-        or 0
+    if course_ids is not None:
+        query = query.filter(Course.course_id.in_(course_ids))
+    if lecturer_id is not None:
+        query = query.filter(Course.lecturer_id == lecturer_id)
+    rows = query.group_by(*group_columns).order_by(*group_columns).all()
+
+    def _pass_rate(total: int, passed_count: int) -> float:
+        return round((passed_count / total) * 100, 2) if total else 0.0
+
+    summaries = {}
+    for row in rows:
+        course_id, course_code, course_title = row[:3]
+        total, passed_count, at_risk_count = row[-3:]
+        summary = summaries.setdefault(
+            course_id,
+            {
+                "course_id": course_id,
+                "course_code": course_code,
+                "course_title": course_title,
+                "records": 0,
+                "passed": 0,
+                "at_risk_students": 0,
+            },
+        )
+        summary["records"] += int(total or 0)
+        summary["passed"] += int(passed_count or 0)
+        summary["at_risk_students"] += int(at_risk_count or 0)
+        if by_term:
+            terms = summary.setdefault("terms", [])
+            session, semester = row[3], row[4]
+            if session is not None:
+                terms.append(
+                    {
+                        "session": session,
+                        "semester": semester,
+                        "records": int(total or 0),
+                        "passed": int(passed_count or 0),
+                        "pass_rate": _pass_rate(int(total or 0), int(passed_count or 0)),
+                        "at_risk_students": int(at_risk_count or 0),
+                    }
+                )
+
+    for summary in summaries.values():
+        summary["pass_rate"] = _pass_rate(summary["records"], summary["passed"])
+    return list(summaries.values())
+
+
+def course_pass_rate(course_id: int) -> float:
+    summaries = course_performance_summary(course_ids=[course_id])
+    return summaries[0]["pass_rate"] if summaries else 0.0
+
+
+def _rollup_totals(*filters) -> tuple[int, float, int]:
+    count, score_sum, passed = (
+        db.session.query(
+            func.sum(PerformanceRollup.record_count),
+            func.sum(PerformanceRollup.score_sum),
+            func.sum(PerformanceRollup.pass_count),
+        )
+        .filter(*filters)
+        .one()
     )
-    return round((passed / total) * 100, 2)
+    return int(count or 0), float(score_sum or 0.0), int(passed or 0)
 
 
 def department_average(department_id: int) -> float:
-    avg_score = (
-        db.session.query(func.avg(Assessment.total_score))
-        .join(Enrollment, Enrollment.enrollment_id == Assessment.enrollment_id)
-        .join(Course, Course.course_id == Enrollment.course_id)
-        .filter(Course.department_id == department_id)
-        .scalar()
-    )
-    return round(float(avg_score), 2) if avg_score is not None else 0.0
+    count, score_sum, _ = _rollup_totals(PerformanceRollup.department_id == department_id)
+    return round(score_sum / count, 2) if count else 0.0
 
 
 def faculty_pass_rate(faculty_id: int) -> float:
-    total = (
-        db.session.query(func.count(Assessment.assessment_id))
-        .join(Enrollment, Enrollment.enrollment_id == Assessment.enrollment_id)
-        .join(Course, Course.course_id == Enrollment.course_id)
-        .join(Department, Department.department_id == Course.department_id)
-        .filter(Department.faculty_id == faculty_id)
-        .scalar()
-        or 0
-    )
-    if total == 0:
+    count, _, passed = _rollup_totals(PerformanceRollup.faculty_id == faculty_id)
+    if count == 0:
         return 0.0
-    passed = (
-        db.session.query(func.count(Assessment.assessment_id))
-        .join(Enrollment, Enrollment.enrollment_id == Assessment.enrollment_id)
-        .join(Course, Course.course_id == Enrollment.course_id)
-        .join(Department, Department.department_id == Course.department_id)
-        .filter(Department.faculty_id == faculty_id, Assessment.total_score >= 50)
-        .scalar()
-        or 0
-    )
-    return round((passed / total) * 100, 2)
+    return round((passed / count) * 100, 2)
 
 
 def institution_performance_trend():
     rows = (
-        db.session.query(Enrollment.session, func.avg(Assessment.total_score))
-        .join(Assessment, Assessment.enrollment_id == Enrollment.enrollment_id)
-        .group_by(Enrollment.session)
-        .order_by(Enrollment.session.asc())
+        db.session.query(
+            PerformanceRollup.session,
+            func.sum(PerformanceRollup.score_sum),
+            func.sum(PerformanceRollup.record_count),
+        )
+        .group_by(PerformanceRollup.session)
+        .order_by(PerformanceRollup.session.asc())
         .all()
     )
-    return [{"session": s, "average_score": round(float(avg), 2)} for s, avg in rows]
+    return [
+        {"session": s, "average_score": round(float(score_sum) / count, 2)}
+        for s, score_sum, count in rows
+        if count
+    ]
+
 
+def department_high_risk_courses(department_id: int) -> list[dict]:
+    average = func.sum(PerformanceRollup.score_sum) / func.sum(PerformanceRollup.record_count)
+    rows = (
+        db.session.query(Course.course_id, Course.course_code, average)
+        .join(PerformanceRollup, PerformanceRollup.course_id == Course.course_id)
+        .filter(PerformanceRollup.department_id == department_id)
+        .group_by(Course.course_id, Course.course_code)
+        .having(average < 50)
+        .order_by(Course.course_code.asc())
+        .all()
+    )
+    return [{"course_id": cid, "course_code": code, "average_score": round(float(avg), 2)} for cid, code, avg in rows]
 
-def grade_distribution(department_id: int | None = None):
+
+def advisor_at_risk_summary(advisor_id: int, page: PageRequest | None = None) -> dict:
+    """One row per at-risk advisee with HIGH/MEDIUM counts, worst course and latest computation.
+
+    A window function ranks each advisee's risky enrollments (HIGH before
+    MEDIUM, then lowest total) so the worst course falls out of the same
+    GROUP BY as the counts. Pages come from the shared keyset layer over
+    the grouped student columns.
+    """
+    severity = case((AnalyticsResult.risk_level == RISK_HIGH, 0), else_=1)
+    ranked = (
+        db.session.query(
+            Enrollment.student_id.label("student_id"),
+            AnalyticsResult.risk_level.label("risk_level"),
+            AnalyticsResult.date_computed.label("date_computed"),
+            Course.course_code.label("course_code"),
+            Assessment.total_score.label("total_score"),
+            func.row_number()
+            .over(
+                partition_by=Enrollment.student_id,
+                order_by=(severity, Assessment.total_score.asc(), Enrollment.enrollment_id.asc()),
+            )
+            .label("severity_rank"),
+        )
+        .select_from(AnalyticsResult)
+        .join(Enrollment, Enrollment.enrollment_id == AnalyticsResult.enrollment_id)
+        .join(Student, Student.student_id == Enrollment.student_id)
+        .join(Course, Course.course_id == Enrollment.course_id)
+        .outerjoin(Assessment, Assessment.enrollment_id == Enrollment.enrollment_id)
+        .filter(Student.advisor_id == advisor_id, AnalyticsResult.risk_level.in_([RISK_HIGH, RISK_MEDIUM]))
+    )
+    ranked = ranked.subquery()
+
+    is_worst = ranked.c.severity_rank == 1
+    query = (
+        db.session.query(
+            Student.student_id,
+            Student.matric_no,
+            Student.full_name,
+            func.sum(case((ranked.c.risk_level == RISK_HIGH, 1), else_=0)),
+            func.sum(case((ranked.c.risk_level == RISK_MEDIUM, 1), else_=0)),
+            func.max(case((is_worst, ranked.c.course_code))),
+            func.max(case((is_worst, ranked.c.total_score))),
+            func.max(ranked.c.date_computed),
+        )
+        .join(ranked, ranked.c.student_id == Student.student_id)
+        .group_by(Student.student_id, Student.matric_no, Student.full_name)
+    )
+    return paginate(query, AT_RISK_LIST, page or parse_page_request(AT_RISK_LIST, {}), _serialize_at_risk_row)
+
+
+def _serialize_at_risk_row(row) -> dict:
+    student_id, matric_no, full_name, high, medium, worst_code, worst_score, last_computed = row
+    return {
+        "student_id": student_id,
+        "matric_no": matric_no,
+        "full_name": full_name,
+        "high_risk_courses": int(high or 0),
+        "medium_risk_courses": int(medium or 0),
+        "worst_course": {"course_code": worst_code, "total_score": worst_score},
+        "last_computed": last_computed.isoformat() if last_computed else None,
+    }
+
+
+def _department_assessment_query(department_id: int | None):
     query = (
         db.session.query(
             Assessment.grade,
@@ -124,39 +257,62 @@ def grade_distribution(department_id: int | None = None):
     )
     if department_id:
         query = query.filter(Course.department_id == department_id)
+    return query
+
 
-    df = _assessment_dataframe(query)
+def _grade_distribution_sql(department_id: int | None) -> dict:
+    query = db.session.query(
+        *[func.sum(getattr(PerformanceRollup, column)) for column in ROLLUP_GRADE_COLUMNS.values()]
+    )
+    if department_id:
+        query = query.filter(PerformanceRollup.department_id == department_id)
+    counts = query.one()
+    return {grade: int(count) for grade, count in zip(ROLLUP_GRADE_COLUMNS, counts) if count}
+
+
+def _grade_distribution_dataframe(department_id: int | None) -> dict:
+    df = _assessment_dataframe(_department_assessment_query(department_id))
     if df.empty:
         return {}
     counts = df["grade"].value_counts().to_dict()
     return {str(k): int(v) for k, v in counts.items()}
 
 
-def department_analytics_snapshot(department_id: int):
-    query = (
-        db.session.query(
-            Assessment.grade,
-            Assessment.total_score,
-            Course.course_code,
-            Course.department_id,
-            Department.faculty_id,
-        )
-        .join(Enrollment, Enrollment.enrollment_id == Assessment.enrollment_id)
-        .join(Course, Course.course_id == Enrollment.course_id)
-        .join(Department, Department.department_id == Course.department_id)
-        .filter(Course.department_id == department_id)
-    )
-    df = _assessment_dataframe(query)
+def grade_distribution(department_id: int | None = None, use_dataframe: bool = False):
+    if use_dataframe:
+        return _grade_distribution_dataframe(department_id)
+    return _grade_distribution_sql(department_id)
+
+
+def _empty_department_snapshot() -> dict:
+    return {
+        "average_score": 0.0,
+        "pass_rate": 0.0,
+        "grade_distribution": {},
+        "high_risk_courses": [],
+    }
+
+
+def _department_analytics_snapshot_sql(department_id: int) -> dict:
+    count, score_sum, passed = _rollup_totals(PerformanceRollup.department_id == department_id)
+    if not count:
+        return _empty_department_snapshot()
+
+    return {
+        "average_score": round(score_sum / count, 2),
+        "pass_rate": round((passed / count) * 100, 2),
+        "grade_distribution": _grade_distribution_sql(department_id),
+        "high_risk_courses": [row["course_code"] for row in department_high_risk_courses(department_id)],
+    }
+
+
+def _department_analytics_snapshot_dataframe(department_id: int) -> dict:
+    df = _assessment_dataframe(_department_assessment_query(department_id))
     if df.empty:
-        return {
-            "average_score": 0.0,
-            "pass_rate": 0.0,
-            "grade_distribution": {},
-            "high_risk_courses": [],
-        }
-
-    average_score = float(np.round(df["total_score"].mean(), 2))
-    pass_rate = float(np.round((df["total_score"] >= 50).mean() * 100, 2))
+        return _empty_department_snapshot()
+
+    average_score = float(round(df["total_score"].mean(), 2))
+    pass_rate = float(round((df["total_score"] >= 50).mean() * 100, 2))
     grade_dist = {str(k): int(v) for k, v in df["grade"].value_counts().to_dict().items()}
     high_risk = (
         df.groupby("course_code")["total_score"].mean().reset_index().query("total_score < 50")["course_code"].tolist()
@@ -170,6 +326,13 @@ def department_analytics_snapshot(department_id: int):
     }
 
 
+def department_analytics_snapshot(department_id: int, use_dataframe: bool = False):
+    """Department KPIs computed in the database; ``use_dataframe`` keeps the pandas path."""
+    if use_dataframe:
+        return _department_analytics_snapshot_dataframe(department_id)
+    return _department_analytics_snapshot_sql(department_id)
+
+
 def system_stats():
     return {
         "students": db.session.query(func.count(Student.student_id)).scalar() or 0,
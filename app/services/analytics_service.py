@@ -1,11 +1,16 @@
 from datetime import datetime
 
+from sqlalchemy import insert, update
+
 from app.extensions import db
 from app.models.analytics_result import AnalyticsResult
 from app.models.assessment import Assessment
 from app.models.enrollment import Enrollment
-from app.services.recommendation_engine import generate_recommendation
-from app.utils.helpers import compute_grade, compute_risk_level, compute_total
+from app.services.gpa_service import mark_gpa_dirty
+from app.services.payload_cache_service import mark_students_changed
+from app.services.recommendation_engine import generate_recommendation, generate_recommendations
+from app.services.rollup_service import mark_rollups_dirty
+from app.utils.helpers import compute_grade, compute_risk_level, compute_score_columns, compute_total
 
 
 def compute_and_store_analytics(enrollment: Enrollment, ca_score: float, exam_score: float):
@@ -45,6 +50,9 @@ def compute_and_store_analytics(enrollment: Enrollment, ca_score: float, exam_sc
         analytics.date_computed = datetime.utcnow()
 
     db.session.flush()
+    mark_rollups_dirty([(enrollment.course_id, enrollment.session, enrollment.semester)])
+    mark_students_changed([enrollment.student_id])
+    mark_gpa_dirty([enrollment.student_id])
     return {
         "enrollment_id": enrollment.enrollment_id,
         "total_score": total_score,
@@ -53,3 +61,79 @@ def compute_and_store_analytics(enrollment: Enrollment, ca_score: float, exam_sc
         "recommendation": recommendation,
     }
 
+
+def bulk_store_analytics(scores: dict[int, tuple[float, float]]) -> int:
+    """Upsert assessments and analytics results for many enrollments at once.
+
+    ``scores`` maps enrollment_id to ``(ca_score, exam_score)``. Existing rows and
+    the affected course terms are resolved with one joined IN-query, totals/grades/risk levels are computed
+    over the whole batch with the array helpers, and rows are written back with
+    batched INSERT/UPDATE statements instead of one flush per enrollment.
+    """
+    if not scores:
+        return 0
+
+    enrollment_ids = list(scores)
+    rows = (
+        db.session.query(
+            Enrollment.enrollment_id,
+            Enrollment.student_id,
+            Enrollment.course_id,
+            Enrollment.session,
+            Enrollment.semester,
+            Assessment.assessment_id,
+            AnalyticsResult.analytics_id,
+        )
+        .outerjoin(Assessment, Assessment.enrollment_id == Enrollment.enrollment_id)
+        .outerjoin(AnalyticsResult, AnalyticsResult.enrollment_id == Enrollment.enrollment_id)
+        .filter(Enrollment.enrollment_id.in_(enrollment_ids))
+        .all()
+    )
+    assessment_ids = {row.enrollment_id: row.assessment_id for row in rows if row.assessment_id is not None}
+    analytics_ids = {row.enrollment_id: row.analytics_id for row in rows if row.analytics_id is not None}
+    terms = {(row.course_id, row.session, row.semester) for row in rows}
+    student_ids = {row.student_id for row in rows}
+
+    ca_scores = [ca_score for ca_score, _ in scores.values()]
+    exam_scores = [exam_score for _, exam_score in scores.values()]
+    totals, grades, risk_levels = compute_score_columns(ca_scores, exam_scores)
+    recommendations = generate_recommendations(risk_levels, grades)
+
+    computed_at = datetime.utcnow()
+    new_assessments, changed_assessments = [], []
+    new_analytics, changed_analytics = [], []
+    for position, enrollment_id in enumerate(enrollment_ids):
+        assessment_values = {
+            "ca_score": ca_scores[position],
+            "exam_score": exam_scores[position],
+            "total_score": float(totals[position]),
+            "grade": grades[position],
+        }
+        analytics_values = {
+            "risk_level": risk_levels[position],
+            "recommendation": recommendations[position],
+            "date_computed": computed_at,
+        }
+
+        if enrollment_id in assessment_ids:
+            changed_assessments.append({"assessment_id": assessment_ids[enrollment_id], **assessment_values})
+        else:
+            new_assessments.append({"enrollment_id": enrollment_id, **assessment_values})
+
+        if enrollment_id in analytics_ids:
+            changed_analytics.append({"analytics_id": analytics_ids[enrollment_id], **analytics_values})
+        else:
+            new_analytics.append({"enrollment_id": enrollment_id, **analytics_values})
+
+    if new_assessments:
+        db.session.execute(insert(Assessment), new_assessments)
+    if changed_assessments:
+        db.session.execute(update(Assessment), changed_assessments)
+    if new_analytics:
+        db.session.execute(insert(AnalyticsResult), new_analytics)
+    if changed_analytics:
+        db.session.execute(update(AnalyticsResult), changed_analytics)
+    mark_rollups_dirty(terms)
+    mark_students_changed(student_ids)
+    mark_gpa_dirty(student_ids)
+    return len(scores)
@@ -0,0 +1,190 @@
+import importlib.util
+import json
+import multiprocessing
+import os
+import threading
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from flask import current_app
+
+from app.models.student import Student
+from app.services.personalization_service import build_personalized_learning_payloads
+from app.services.report_service import build_student_report_csv, build_student_report_pdf
+
+REPORT_FORMATS = {"pdf": build_student_report_pdf, "csv": build_student_report_csv}
+DEFAULT_REPORT_BATCH_SIZE = 100
+
+_export_slots: threading.BoundedSemaphore | None = None
+_export_slots_lock = threading.Lock()
+
+
+class _ZipSink:
+    """Write-only buffer for ``zipfile``; bytes are handed out as soon as each entry is written.
+
+    It has no ``tell``/``seek``, so ``ZipFile`` writes data descriptors instead of
+    rewinding to patch local headers, which is what makes the archive streamable.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class _ReleasingStream:
+    """Iterate a report stream and give its export slot back exactly once.
+
+    ``close`` only runs once the body has started iterating, which a HEAD
+    request or an early teardown never does, so callers must also register
+    ``release`` with the response (``Response.call_on_close``).
+    """
+
+    def __init__(self, stream, release):
+        self._stream = stream
+        self._release = release
+        self._release_lock = threading.Lock()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._stream)
+
+    def release(self) -> None:
+        with self._release_lock:
+            release, self._release = self._release, None
+        if release is not None:
+            release()
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+        finally:
+            self.release()
+
+
+def _get_export_slots() -> threading.BoundedSemaphore:
+    global _export_slots
+    with _export_slots_lock:
+        if _export_slots is None:
+            limit = max(int(current_app.config.get("REPORT_EXPORT_MAX_CONCURRENT", 1)), 1)
+            _export_slots = threading.BoundedSemaphore(limit)
+        return _export_slots
+
+
+def open_department_report_export(department_id: int, export_format: str, workers: int, batch_size: int):
+    """``iter_department_report_zip`` for an HTTP response, or ``None`` when this process is at its export limit.
+
+    Each export may run its own render pool, so the HTTP path caps both the
+    pool size (REPORT_EXPORT_WORKERS) and how many exports run at once per
+    process (REPORT_EXPORT_MAX_CONCURRENT). The caller must register the
+    returned stream's ``release`` with ``Response.call_on_close`` so the slot
+    comes back whether or not the body is ever iterated.
+    """
+    slots = _get_export_slots()
+    if not slots.acquire(blocking=False):
+        return None
+    stream = iter_department_report_zip(
+        department_id, export_format=export_format, workers=workers, batch_size=batch_size
+    )
+    return _ReleasingStream(stream, slots.release)
+
+
+def validate_report_format(export_format: str) -> None:
+    """Fail before streaming starts rather than halfway through the archive."""
+    if export_format not in REPORT_FORMATS:
+        raise ValueError(f"format must be one of: {', '.join(sorted(REPORT_FORMATS))}")
+    if export_format == "pdf" and importlib.util.find_spec("reportlab") is None:
+        raise RuntimeError("PDF export unavailable. Install reportlab.")
+
+
+def _department_student_batches(department_id: int, batch_size: int):
+    last_id = 0
+    while True:
+        students = (
+            Student.query.filter(Student.department_id == department_id, Student.student_id > last_id)
+            .order_by(Student.student_id.asc())
+            .limit(batch_size)
+            .all()
+        )
+        if not students:
+            return
+        yield students
+        last_id = students[-1].student_id
+
+
+def iter_department_report_zip(
+    department_id: int,
+    export_format: str = "pdf",
+    workers: int | None = None,
+    batch_size: int = DEFAULT_REPORT_BATCH_SIZE,
+    stats: dict | None = None,
+):
+    """Yield a ZIP of every student's report in a department, one batch at a time.
+
+    Payloads are built in bulk per batch of students and, when ``workers`` is
+    above one, rendered across a process pool (``None`` means one process per
+    CPU). Only one batch of payloads and
+    rendered reports is held in memory at once. The archive ends with a
+    ``summary.json`` entry carrying the report count and throughput, which is
+    also written into ``stats`` when given.
+    """
+    validate_report_format(export_format)
+    if batch_size < 1:
+        raise ValueError("batch_size must be a positive integer")
+
+    render = REPORT_FORMATS[export_format]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    started = time.perf_counter()
+    stamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    reports = 0
+    sink = _ZipSink()
+
+    pool = None
+    # CSV rendering is cheaper than shipping payloads to another process.
+    if workers > 1 and export_format == "pdf":
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    try:
+        with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for students in _department_student_batches(department_id, batch_size):
+                payloads = build_personalized_learning_payloads(students)
+                if pool is not None:
+                    rendered = pool.map(render, payloads, chunksize=max(len(payloads) // (workers * 4), 1))
+                else:
+                    rendered = map(render, payloads)
+                for student, report_bytes in zip(students, rendered):
+                    name = f"{student.matric_no.replace('/', '_')}_personalized_report_{stamp}.{export_format}"
+                    archive.writestr(name, report_bytes)
+                    reports += 1
+                    yield sink.drain()
+
+            elapsed = time.perf_counter() - started
+            summary = {
+                "department_id": department_id,
+                "format": export_format,
+                "reports": reports,
+                "workers": workers if pool is not None else 1,
+                "seconds": round(elapsed, 3),
+                "reports_per_second": round(reports / elapsed, 2) if elapsed > 0 else 0.0,
+            }
+            if stats is not None:
+                stats.update(summary)
+            archive.writestr("summary.json", json.dumps(summary, indent=2))
+        yield sink.drain()
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
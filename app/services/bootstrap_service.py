@@ -1,13 +1,41 @@
+import hashlib
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from flask import Flask
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
 from app.extensions import db
+from app.models.assessment import Assessment
+from app.models.bootstrap_state import BootstrapState
 from app.models.course import Course
 from app.models.department import Department
 from app.models.enrollment import Enrollment
 from app.models.faculty import Faculty
+from app.models.performance_rollup import PerformanceRollup
 from app.models.staff import Staff
 from app.models.student import Student
+from app.models.student_gpa import StudentGpa
 from app.models.university import University
+from app.services.gpa_service import rebuild_student_gpa
+from app.services.rollup_service import rebuild_rollups
 from app.utils.constants import ADMIN, COURSE_ADVISOR, HOD, LECTURER
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX hosts fall back to no cross-process lock
+    fcntl = None
+
+# Bump when bootstrap_demo_data changes what it creates, so databases re-run it once.
+BOOTSTRAP_DATA_VERSION = 1
+
+_SENTINEL_KEY = "startup"
+_ADVISORY_LOCK_KEY = 727_001
+
 
 def _get_or_create(model, defaults=None, **kwargs):
     instance = model.query.filter_by(**kwargs).first()
@@ -125,3 +153,161 @@ def bootstrap_demo_data():
     db.session.commit()
     return {"bootstrapped": created_any, "message": "Demo data ready"}
 
+
+def ensure_schema_columns() -> list[str]:
+    """Add mapped columns that existing tables lack; ``create_all`` only ever creates whole tables."""
+    inspector = db.inspect(db.engine)
+    dialect = db.engine.dialect
+    preparer = dialect.identifier_preparer
+    existing_tables = set(inspector.get_table_names())
+    added = []
+    for table in db.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        present = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in present:
+                continue
+            if not column.nullable and column.server_default is None:
+                raise RuntimeError(
+                    f"{table.name}.{column.name} is NOT NULL without a server default and cannot be added in place"
+                )
+            ddl = (
+                f"ALTER TABLE {preparer.format_table(table)} "
+                f"ADD COLUMN {preparer.format_column(column)} {column.type.compile(dialect=dialect)}"
+            )
+            if column.server_default is not None:
+                ddl += f" DEFAULT {column.server_default.arg}"
+            if not column.nullable:
+                ddl += " NOT NULL"
+            db.session.execute(text(ddl))
+            added.append(f"{table.name}.{column.name}")
+    db.session.commit()
+    return added
+
+
+def ensure_schema_indexes() -> list[str]:
+    """Create mapped indexes that existing tables lack; ``create_all`` skips tables that already exist."""
+    inspector = db.inspect(db.engine)
+    existing_tables = set(inspector.get_table_names())
+    created = []
+    for table in db.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        present = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in present:
+                index.create(bind=db.engine, checkfirst=True)
+                created.append(index.name)
+    return created
+
+
+def backfill_derived_tables() -> list[str]:
+    """Rebuild derived tables that are empty while assessments exist, e.g. right after they were created."""
+    if db.session.query(Assessment.assessment_id).first() is None:
+        return []
+    backfilled = []
+    if db.session.query(PerformanceRollup.rollup_id).first() is None:
+        rebuild_rollups()
+        backfilled.append(PerformanceRollup.__tablename__)
+    if db.session.query(StudentGpa.student_id).first() is None:
+        rebuild_student_gpa()
+        backfilled.append(StudentGpa.__tablename__)
+    return backfilled
+
+
+def schema_fingerprint() -> str:
+    """Hash of every mapped table, column and index plus the demo-data version."""
+    parts = [f"data:{BOOTSTRAP_DATA_VERSION}"]
+    for table in db.metadata.sorted_tables:
+        parts.append(f"table:{table.name}")
+        parts.extend(f"column:{c.name}:{c.type}:{c.nullable}" for c in table.columns)
+        parts.extend(sorted(f"index:{index.name}" for index in table.indexes))
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def bootstrap_is_current(fingerprint: str) -> bool:
+    """The single sentinel query serving workers make at boot."""
+    try:
+        stored = db.session.execute(
+            db.select(BootstrapState.fingerprint).where(BootstrapState.key == _SENTINEL_KEY)
+        ).scalar()
+    except SQLAlchemyError:
+        # Most likely the sentinel table does not exist yet.
+        db.session.rollback()
+        return False
+    db.session.rollback()
+    return stored == fingerprint
+
+
+@contextmanager
+def _leader_lock(app: Flask):
+    """Yield True in exactly one process at a time: a PostgreSQL advisory lock, else a file lock."""
+    if db.engine.dialect.name == "postgresql":
+        with db.engine.connect() as connection:
+            acquired = bool(
+                connection.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": _ADVISORY_LOCK_KEY}).scalar()
+            )
+            try:
+                yield acquired
+            finally:
+                if acquired:
+                    connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": _ADVISORY_LOCK_KEY})
+        return
+
+    if fcntl is None:
+        yield True
+        return
+    Path(app.instance_path).mkdir(parents=True, exist_ok=True)
+    with open(os.path.join(app.instance_path, "bootstrap.lock"), "w") as handle:
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def run_bootstrap(fingerprint: str | None = None) -> dict:
+    """Create tables, add missing columns and indexes, seed demo data and record the sentinel.
+
+    This is what ``flask bootstrap`` runs. The sentinel fingerprint covers
+    columns and indexes, so a model change re-runs this once per database.
+    """
+    started = time.perf_counter()
+    db.create_all()
+    added_columns = ensure_schema_columns()
+    # After the columns, since a new index may cover a column added just now.
+    created_indexes = ensure_schema_indexes()
+    result = bootstrap_demo_data()
+    result["added_columns"] = added_columns
+    result["created_indexes"] = created_indexes
+    result["backfilled"] = backfill_derived_tables()
+    state = db.session.get(BootstrapState, _SENTINEL_KEY) or BootstrapState(key=_SENTINEL_KEY)
+    state.fingerprint = fingerprint or schema_fingerprint()
+    state.completed_at = datetime.utcnow()
+    state.duration_ms = round((time.perf_counter() - started) * 1000, 1)
+    db.session.add(state)
+    db.session.commit()
+    return result
+
+
+def ensure_bootstrapped(app: Flask) -> str:
+    """Skip when the sentinel matches; otherwise let one leader process bootstrap.
+
+    Returns ``"current"``, ``"bootstrapped"`` or ``"deferred"`` (another process holds the lock).
+    """
+    fingerprint = schema_fingerprint()
+    if bootstrap_is_current(fingerprint):
+        return "current"
+    with _leader_lock(app) as leader:
+        if not leader:
+            return "deferred"
+        # The previous leader may have finished between our check and taking the lock.
+        if bootstrap_is_current(fingerprint):
+            return "current"
+        run_bootstrap(fingerprint)
+        return "bootstrapped"
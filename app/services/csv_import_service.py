@@ -1,26 +1,99 @@
 from io import StringIO
 
-import pandas as pd
+from sqlalchemy import insert
 
 from app.extensions import db
 from app.models.course import Course
 from app.models.enrollment import Enrollment
 from app.models.student import Student
-from app.services.analytics_service import compute_and_store_analytics
+from app.services.analytics_service import bulk_store_analytics, compute_and_store_analytics
 
 REQUIRED_COLUMNS = {"matric_no", "course_code", "ca_score", "exam_score"}
 
+IMPORT_MODE_ROW = "row"
+IMPORT_MODE_BULK = "bulk"
+IMPORT_MODE_STREAM = "stream"
+IMPORT_MODES = {IMPORT_MODE_ROW, IMPORT_MODE_BULK, IMPORT_MODE_STREAM}
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def process_result_csv(
+    file_storage,
+    lecturer_id: int,
+    session: str,
+    semester: str,
+    mode: str = IMPORT_MODE_BULK,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    on_chunk=None,
+):
+    if mode not in IMPORT_MODES:
+        raise ValueError(f"Unsupported import mode: {mode}")
+
+    summary = {"processed": 0, "created_enrollments": 0, "errors": []}
+
+    if mode == IMPORT_MODE_STREAM:
+        _ingest_stream(file_storage, lecturer_id, session, semester, chunk_size, summary, on_chunk)
+        return summary
+
+    import pandas as pd
 
-def process_result_csv(file_storage, lecturer_id: int, session: str, semester: str):
     content = file_storage.read().decode("utf-8")
     df = pd.read_csv(StringIO(content))
-    columns = {c.strip() for c in df.columns}
+    _normalize_columns(df)
+
+    if mode == IMPORT_MODE_ROW:
+        _ingest_rows(df, lecturer_id, session, semester, summary)
+    else:
+        _ingest_bulk(df, lecturer_id, session, semester, summary)
+
+    db.session.commit()
+    return summary
+
+
+def _normalize_columns(df) -> None:
+    df.columns = [str(c).strip() for c in df.columns]
+    columns = set(df.columns)
     if not REQUIRED_COLUMNS.issubset(columns):
         missing = list(REQUIRED_COLUMNS - columns)
         raise ValueError(f"CSV missing required columns: {missing}")
 
-    summary = {"processed": 0, "created_enrollments": 0, "errors": []}
 
+def _ingest_stream(
+    file_storage, lecturer_id: int, session: str, semester: str, chunk_size: int, summary: dict, on_chunk=None
+) -> None:
+    """Read the upload straight off its stream and commit every ``chunk_size`` rows.
+
+    Only one chunk is held in memory at a time, so peak memory does not grow
+    with the size of the file. Chunks committed before a failure stay committed.
+    ``on_chunk`` is called with the running summary after each commit.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer")
+
+    import pandas as pd
+
+    summary["chunks"] = []
+    stream = getattr(file_storage, "stream", file_storage)
+    with pd.read_csv(stream, chunksize=chunk_size, encoding="utf-8") as reader:
+        for number, chunk in enumerate(reader, start=1):
+            _normalize_columns(chunk)
+            errors_before = len(summary["errors"])
+            _ingest_bulk(chunk, lecturer_id, session, semester, summary)
+            db.session.commit()
+            summary["chunks"].append(
+                {
+                    "chunk": number,
+                    "rows": len(chunk),
+                    "errors": len(summary["errors"]) - errors_before,
+                    "processed_total": summary["processed"],
+                }
+            )
+            if on_chunk is not None:
+                on_chunk(summary)
+
+
+def _ingest_rows(df, lecturer_id: int, session: str, semester: str, summary: dict) -> None:
     for idx, row in df.iterrows():
         try:
             matric_no = str(row["matric_no"]).strip()
@@ -60,6 +133,90 @@ def process_result_csv(file_storage, lecturer_id: int, session: str, semester: s
         except Exception as exc:
             summary["errors"].append({"row": int(idx) + 1, "error": str(exc)})
 
-    db.session.commit()
-    return summary
 
+def _ingest_bulk(df, lecturer_id: int, session: str, semester: str, summary: dict) -> None:
+    errors = []
+    parsed = []
+    for idx, matric_no, course_code, ca_score, exam_score in zip(
+        df.index, df["matric_no"], df["course_code"], df["ca_score"], df["exam_score"]
+    ):
+        try:
+            parsed.append(
+                (int(idx) + 1, str(matric_no).strip(), str(course_code).strip().upper(), float(ca_score), float(exam_score))
+            )
+        except (TypeError, ValueError) as exc:
+            errors.append({"row": int(idx) + 1, "error": str(exc)})
+
+    students = {}
+    courses = {}
+    if parsed:
+        students = dict(
+            db.session.query(Student.matric_no, Student.student_id)
+            .filter(Student.matric_no.in_({row[1] for row in parsed}))
+            .all()
+        )
+        courses = {
+            code: (course_id, course_lecturer_id)
+            for code, course_id, course_lecturer_id in db.session.query(
+                Course.course_code, Course.course_id, Course.lecturer_id
+            )
+            .filter(Course.course_code.in_({row[2] for row in parsed}))
+            .all()
+        }
+
+    resolved = []
+    for row_no, matric_no, course_code, ca_score, exam_score in parsed:
+        student_id = students.get(matric_no)
+        if student_id is None:
+            errors.append({"row": row_no, "error": f"Student not found for matric_no={matric_no}"})
+            continue
+        course = courses.get(course_code)
+        if course is None:
+            errors.append({"row": row_no, "error": f"Course not found for course_code={course_code}"})
+            continue
+        course_id, course_lecturer_id = course
+        if course_lecturer_id != lecturer_id:
+            errors.append({"row": row_no, "error": f"Unauthorized upload for course={course_code}"})
+            continue
+        resolved.append((student_id, course_id, ca_score, exam_score))
+
+    if resolved:
+        enrollment_ids = {
+            (student_id, course_id): enrollment_id
+            for enrollment_id, student_id, course_id in db.session.query(
+                Enrollment.enrollment_id, Enrollment.student_id, Enrollment.course_id
+            )
+            .filter(
+                Enrollment.session == session,
+                Enrollment.semester == semester,
+                Enrollment.student_id.in_({row[0] for row in resolved}),
+                Enrollment.course_id.in_({row[1] for row in resolved}),
+            )
+            .all()
+        }
+        missing = {}
+        for student_id, course_id, _, _ in resolved:
+            if (student_id, course_id) not in enrollment_ids:
+                missing[(student_id, course_id)] = {
+                    "student_id": student_id,
+                    "course_id": course_id,
+                    "session": session,
+                    "semester": semester,
+                }
+        if missing:
+            created = db.session.execute(
+                insert(Enrollment).returning(Enrollment.enrollment_id, Enrollment.student_id, Enrollment.course_id),
+                list(missing.values()),
+            )
+            for enrollment_id, student_id, course_id in created:
+                enrollment_ids[(student_id, course_id)] = enrollment_id
+            summary["created_enrollments"] += len(missing)
+
+        # Later rows for the same enrollment win, matching the row-by-row path.
+        scores = {}
+        for student_id, course_id, ca_score, exam_score in resolved:
+            scores[enrollment_ids[(student_id, course_id)]] = (ca_score, exam_score)
+        bulk_store_analytics(scores)
+        summary["processed"] += len(resolved)
+
+    summary["errors"].extend(sorted(errors, key=lambda e: e["row"]))
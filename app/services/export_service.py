@@ -0,0 +1,123 @@
+import csv
+import json
+from datetime import datetime
+from io import StringIO
+
+from flask import Response, stream_with_context
+from sqlalchemy import select
+
+from app.extensions import db
+from app.models.analytics_result import AnalyticsResult
+from app.models.assessment import Assessment
+from app.models.course import Course
+from app.models.enrollment import Enrollment
+from app.models.student import Student
+
+EXPORT_FORMATS = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+DEFAULT_EXPORT_BATCH_SIZE = 2000
+
+_ENROLLMENT_COLUMNS = [
+    Enrollment.enrollment_id,
+    Student.matric_no,
+    Course.course_code,
+    Course.department_id,
+    Enrollment.session,
+    Enrollment.semester,
+]
+
+EXPORT_DATASETS = {
+    "enrollments": (None, []),
+    "assessments": (
+        Assessment,
+        [
+            Assessment.ca_score,
+            Assessment.exam_score,
+            Assessment.total_score,
+            Assessment.grade,
+            Assessment.created_at,
+        ],
+    ),
+    "analytics-results": (
+        AnalyticsResult,
+        [AnalyticsResult.risk_level, AnalyticsResult.recommendation, AnalyticsResult.date_computed],
+    ),
+}
+
+
+def _export_select(dataset: str, session: str | None, department_id: int | None, course_id: int | None):
+    model, columns = EXPORT_DATASETS[dataset]
+    stmt = select(*_ENROLLMENT_COLUMNS, *columns).select_from(Enrollment)
+    if model is not None:
+        stmt = stmt.join(model, model.enrollment_id == Enrollment.enrollment_id)
+    stmt = stmt.join(Student, Student.student_id == Enrollment.student_id).join(
+        Course, Course.course_id == Enrollment.course_id
+    )
+    if session:
+        stmt = stmt.where(Enrollment.session == session)
+    if department_id:
+        stmt = stmt.where(Course.department_id == department_id)
+    if course_id:
+        stmt = stmt.where(Enrollment.course_id == course_id)
+    return stmt.order_by(Enrollment.enrollment_id.asc())
+
+
+def _plain(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def iter_export_rows(
+    dataset: str,
+    export_format: str = "csv",
+    session: str | None = None,
+    department_id: int | None = None,
+    course_id: int | None = None,
+    batch_size: int = DEFAULT_EXPORT_BATCH_SIZE,
+):
+    """Yield an export as text chunks, one chunk per fetched batch of rows.
+
+    Rows come off a server-side cursor via ``yield_per``, so only one batch
+    is ever held in memory regardless of how large the dataset is.
+    """
+    if dataset not in EXPORT_DATASETS:
+        raise ValueError(f"dataset must be one of: {', '.join(sorted(EXPORT_DATASETS))}")
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"format must be one of: {', '.join(sorted(EXPORT_FORMATS))}")
+
+    stmt = _export_select(dataset, session, department_id, course_id)
+    result = db.session.execute(stmt.execution_options(yield_per=batch_size))
+    header = list(result.keys())
+
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+    if export_format == "csv":
+        writer.writerow(header)
+        yield buffer.getvalue()
+
+    for partition in result.partitions():
+        buffer.seek(0)
+        buffer.truncate()
+        if export_format == "csv":
+            writer.writerows([[_plain(value) for value in row] for row in partition])
+        else:
+            for row in partition:
+                buffer.write(json.dumps(dict(zip(header, map(_plain, row)))))
+                buffer.write("\n")
+        yield buffer.getvalue()
+
+
+def export_response(dataset: str, export_format: str, **filters) -> Response:
+    """Wrap ``iter_export_rows`` in a streamed attachment response."""
+    rows = iter_export_rows(dataset, export_format, **filters)
+    # Prime the generator so bad arguments raise here rather than mid-stream.
+    first_chunk = next(rows, "")
+
+    def generate():
+        if first_chunk:
+            yield first_chunk
+        yield from rows
+
+    stamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    extension = "csv" if export_format == "csv" else "ndjson"
+    response = Response(stream_with_context(generate()), content_type=EXPORT_FORMATS[export_format])
+    response.headers["Content-Disposition"] = f"attachment; filename={dataset}_{stamp}.{extension}"
+    return response
@@ -0,0 +1,215 @@
+from datetime import datetime
+
+from sqlalchemy import case, delete, event, func, insert, literal, select
+from sqlalchemy.orm import Session
+
+from app.extensions import db
+from app.models.assessment import Assessment
+from app.models.course import Course
+from app.models.enrollment import Enrollment
+from app.models.student import Student
+from app.models.student_gpa import StudentGpa, StudentTermGpa
+from app.utils.constants import DEGREE_CLASSES, GRADE_POINTS, PROBATION_GPA
+from app.utils.pagination import ListSpec, PageRequest, paginate, parse_page_request
+
+_DIRTY_GPA_KEY = "dirty_gpa_student_ids"
+
+PROBATION_LIST = ListSpec(key=StudentGpa.student_id, sorts={"gpa": StudentGpa.gpa}, default_sort="gpa")
+# Validates ranking requests; the query itself pages over a ranked subquery with the same names.
+GPA_RANKING_LIST = ListSpec(key=StudentGpa.student_id, sorts={"gpa": StudentGpa.gpa}, default_sort="-gpa")
+
+
+def mark_gpa_dirty(student_ids) -> None:
+    """Queue students whose GPA must be re-derived when the session commits."""
+    db.session.info.setdefault(_DIRTY_GPA_KEY, set()).update(student_ids)
+
+
+def _points_and_units():
+    grade_points = case(
+        *[(Assessment.grade == grade, points) for grade, points in GRADE_POINTS.items()],
+        else_=0.0,
+    )
+    return func.sum(grade_points * Course.credit_units), func.sum(Course.credit_units)
+
+
+def _gpa_expression(points, units):
+    return case((units > 0, points / units), else_=0.0)
+
+
+def _graded_rows(stmt, student_ids=None):
+    stmt = (
+        stmt.select_from(Assessment)
+        .join(Enrollment, Enrollment.enrollment_id == Assessment.enrollment_id)
+        .join(Course, Course.course_id == Enrollment.course_id)
+    )
+    if student_ids is not None:
+        stmt = stmt.where(Enrollment.student_id.in_(student_ids))
+    return stmt
+
+
+def _lock_students(session: Session, student_ids=None) -> None:
+    # Concurrent refreshes of the same students would both delete and both
+    # re-insert, failing one commit on the primary key. Row-locking the
+    # students in key order makes the second wait and then see the first's rows.
+    stmt = select(Student.student_id).order_by(Student.student_id.asc()).with_for_update()
+    if student_ids is not None:
+        stmt = stmt.where(Student.student_id.in_(student_ids))
+    session.execute(stmt).all()
+
+
+def refresh_student_gpa(student_ids=None, session: Session | None = None) -> None:
+    """Re-derive term and cumulative GPA rows for some students, or everyone when ``None``."""
+    session = session or db.session
+    _lock_students(session, student_ids)
+    points, units = _points_and_units()
+    term_delete = delete(StudentTermGpa)
+    total_delete = delete(StudentGpa)
+    if student_ids is not None:
+        term_delete = term_delete.where(StudentTermGpa.student_id.in_(student_ids))
+        total_delete = total_delete.where(StudentGpa.student_id.in_(student_ids))
+    session.execute(term_delete)
+    session.execute(total_delete)
+
+    term_select = _graded_rows(
+        select(
+            Enrollment.student_id,
+            Enrollment.session,
+            Enrollment.semester,
+            points,
+            units,
+            _gpa_expression(points, units),
+        ),
+        student_ids,
+    ).group_by(Enrollment.student_id, Enrollment.session, Enrollment.semester)
+    session.execute(
+        insert(StudentTermGpa).from_select(
+            ["student_id", "session", "semester", "term_points", "term_units", "gpa"], term_select
+        )
+    )
+
+    total_select = (
+        _graded_rows(
+            select(
+                Enrollment.student_id,
+                Student.department_id,
+                points,
+                units,
+                _gpa_expression(points, units),
+                literal(datetime.utcnow(), db.DateTime),
+            ),
+            student_ids,
+        )
+        .join(Student, Student.student_id == Enrollment.student_id)
+        .group_by(Enrollment.student_id, Student.department_id)
+    )
+    session.execute(
+        insert(StudentGpa).from_select(
+            ["student_id", "department_id", "total_points", "total_units", "gpa", "refreshed_at"], total_select
+        )
+    )
+
+
+def rebuild_student_gpa() -> int:
+    db.session.info.pop(_DIRTY_GPA_KEY, None)
+    refresh_student_gpa()
+    db.session.commit()
+    return db.session.query(func.count(StudentGpa.student_id)).scalar() or 0
+
+
+def student_gpa(student_id: int) -> float:
+    row = db.session.get(StudentGpa, student_id)
+    return round(row.gpa, 2) if row else 0.0
+
+
+def _ranked_department_gpa(department_id: int):
+    return (
+        select(
+            StudentGpa.student_id,
+            StudentGpa.gpa,
+            StudentGpa.total_units,
+            func.row_number()
+            .over(order_by=(StudentGpa.gpa.desc(), StudentGpa.student_id.asc()))
+            .label("position"),
+        )
+        .where(StudentGpa.department_id == department_id)
+        .subquery()
+    )
+
+
+def department_gpa_ranking(department_id: int, page: PageRequest | None = None) -> dict:
+    """A page of the department ranking; ``rank`` is the GPA position whatever the page or sort."""
+    ranked = _ranked_department_gpa(department_id)
+    spec = ListSpec(key=ranked.c.student_id, sorts={"gpa": ranked.c.gpa}, default_sort="-gpa")
+    query = db.session.query(
+        ranked.c.position,
+        ranked.c.student_id,
+        ranked.c.gpa,
+        ranked.c.total_units,
+        Student.matric_no,
+        Student.full_name,
+        Student.level,
+    ).join(Student, Student.student_id == ranked.c.student_id)
+    return paginate(
+        query,
+        spec,
+        page or parse_page_request(GPA_RANKING_LIST, {}),
+        lambda row: {
+            "rank": row.position,
+            "student_id": row.student_id,
+            "matric_no": row.matric_no,
+            "full_name": row.full_name,
+            "level": row.level,
+            "GPA": round(row.gpa, 2),
+            "total_units": row.total_units,
+        },
+    )
+
+
+def degree_class_bands(department_id: int) -> list[dict]:
+    # Bands compare against the GPA as displayed, i.e. rounded to two decimals.
+    band = case(
+        *[(StudentGpa.gpa >= lower - 0.005, label) for lower, label in DEGREE_CLASSES[:-1]],
+        else_=DEGREE_CLASSES[-1][1],
+    )
+    counts = dict(
+        db.session.query(band, func.count(StudentGpa.student_id))
+        .filter(StudentGpa.department_id == department_id)
+        .group_by(band)
+        .all()
+    )
+    return [{"class": label, "min_gpa": lower, "students": int(counts.get(label, 0))} for lower, label in DEGREE_CLASSES]
+
+
+def probation_list(
+    department_id: int, page: PageRequest | None = None, threshold: float = PROBATION_GPA
+) -> dict:
+    query = (
+        db.session.query(StudentGpa.student_id, StudentGpa.gpa, Student.matric_no, Student.full_name, Student.level)
+        .join(Student, Student.student_id == StudentGpa.student_id)
+        .filter(StudentGpa.department_id == department_id, StudentGpa.gpa < threshold - 0.005)
+    )
+    return paginate(
+        query,
+        PROBATION_LIST,
+        page or parse_page_request(PROBATION_LIST, {}),
+        lambda row: {
+            "student_id": row.student_id,
+            "matric_no": row.matric_no,
+            "full_name": row.full_name,
+            "level": row.level,
+            "GPA": round(row.gpa, 2),
+        },
+    )
+
+
+@event.listens_for(Session, "before_commit")
+def _refresh_dirty_gpa(session: Session) -> None:
+    student_ids = session.info.pop(_DIRTY_GPA_KEY, None)
+    if student_ids:
+        session.flush()
+        refresh_student_gpa(student_ids, session)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_dirty_gpa(session: Session) -> None:
+    session.info.pop(_DIRTY_GPA_KEY, None)
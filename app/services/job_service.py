@@ -0,0 +1,209 @@
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from flask import Flask
+
+from app.extensions import db
+from app.models.import_job import ImportJob
+from app.services.csv_import_service import process_result_csv
+from app.utils.constants import JOB_FAILED, JOB_QUEUED, JOB_RUNNING, JOB_SUCCEEDED
+
+# Spool files younger than this may belong to a job whose row is not committed yet.
+_SPOOL_SWEEP_MIN_AGE_SECONDS = 300
+_INTERRUPTED_REASON = "Interrupted: the worker running this import stopped before it finished. Upload the file again."
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor(app: Flask) -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            workers = max(int(app.config.get("IMPORT_JOB_WORKERS", 2)), 1)
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="import-job")
+        return _executor
+
+
+def _spool_dir(app: Flask) -> str:
+    path = app.config.get("IMPORT_JOB_SPOOL_DIR") or os.path.join(app.instance_path, "import_jobs")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _process_start(pid: int) -> str:
+    # Start time from /proc tells a live process apart from a reused PID; empty where unavailable.
+    try:
+        with open(f"/proc/{pid}/stat") as handle:
+            return handle.read().rsplit(")", 1)[1].split()[19]
+    except (OSError, IndexError):
+        return ""
+
+
+def _worker_id() -> str:
+    pid = os.getpid()
+    return f"{socket.gethostname()}:{pid}:{_process_start(pid)}"
+
+
+def _worker_alive(worker_id: str | None) -> bool | None:
+    """Whether the process that owns a job still runs; ``None`` when it runs on another host."""
+    if not worker_id:
+        return False
+    host, pid, started = worker_id.rsplit(":", 2)
+    if host != socket.gethostname():
+        return None
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return _process_start(int(pid)) == started
+
+
+def recover_interrupted_jobs(app: Flask) -> dict:
+    """Fail queued/running jobs whose worker process is gone and delete spool files nobody will read.
+
+    Jobs run on an in-process pool, so a restart or crash strands them.
+    Each live worker on this host keeps its own jobs; only dead owners'
+    jobs are failed, which makes it safe for every worker to run this at boot.
+    A process on another host cannot be checked from here, and a dead
+    container's hostname never comes back, so those jobs are failed once
+    their heartbeat is older than IMPORT_JOB_STALE_SECONDS.
+    """
+    active = ImportJob.query.filter(ImportJob.state.in_([JOB_QUEUED, JOB_RUNNING])).all()
+    spool = _spool_dir(app)
+    stale_before = datetime.utcnow() - timedelta(seconds=app.config.get("IMPORT_JOB_STALE_SECONDS", 3600))
+    interrupted = []
+    for job in active:
+        alive = _worker_alive(job.worker_id)
+        if alive is None:
+            last_seen = job.heartbeat_at or job.started_at or job.created_at
+            alive = last_seen is not None and last_seen >= stale_before
+        if alive:
+            continue
+        job.state = JOB_FAILED
+        job.failure_reason = _INTERRUPTED_REASON
+        job.finished_at = datetime.utcnow()
+        interrupted.append(job.job_id)
+    db.session.commit()
+
+    live_ids = {job.job_id for job in active} - set(interrupted)
+    swept = 0
+    for name in os.listdir(spool):
+        path = os.path.join(spool, name)
+        job_id, extension = os.path.splitext(name)
+        if extension != ".csv" or job_id in live_ids:
+            continue
+        try:
+            if job_id in interrupted or time.time() - os.path.getmtime(path) > _SPOOL_SWEEP_MIN_AGE_SECONDS:
+                os.remove(path)
+                swept += 1
+        except OSError:
+            # Another worker booting at the same time removed it first.
+            pass
+    return {"interrupted": interrupted, "swept_files": swept}
+
+
+def enqueue_result_import(
+    app: Flask, file_storage, lecturer_id: int, session: str, semester: str, mode: str
+) -> ImportJob:
+    """Persist a queued job, spool the upload to disk and hand it to the worker pool.
+
+    The request returns as soon as the file is on disk; the CSV is parsed and
+    written by ``process_result_csv`` on a pool thread with its own app context.
+    """
+    job = ImportJob(
+        job_id=uuid.uuid4().hex,
+        lecturer_id=lecturer_id,
+        filename=getattr(file_storage, "filename", None),
+        session=session,
+        semester=semester,
+        mode=mode,
+        state=JOB_QUEUED,
+        worker_id=_worker_id(),
+        heartbeat_at=datetime.utcnow(),
+    )
+    path = os.path.join(_spool_dir(app), f"{job.job_id}.csv")
+    file_storage.save(path)
+
+    db.session.add(job)
+    db.session.commit()
+
+    _get_executor(app).submit(_run_import_job, app, job.job_id, path)
+    return job
+
+
+def _run_import_job(app: Flask, job_id: str, path: str) -> None:
+    with app.app_context():
+        job = db.session.get(ImportJob, job_id)
+        if job is None:
+            return
+        job.state = JOB_RUNNING
+        job.started_at = job.heartbeat_at = datetime.utcnow()
+        db.session.commit()
+
+        def record_progress(summary: dict) -> None:
+            job.rows_processed = summary["processed"]
+            job.created_enrollments = summary["created_enrollments"]
+            job.errors = list(summary["errors"])
+            job.chunks = list(summary.get("chunks", []))
+            # Other hosts judge whether this job is still alive by its heartbeat.
+            job.heartbeat_at = datetime.utcnow()
+            db.session.commit()
+
+        try:
+            with open(path, "rb") as handle:
+                summary = process_result_csv(
+                    file_storage=handle,
+                    lecturer_id=job.lecturer_id,
+                    session=job.session,
+                    semester=job.semester,
+                    mode=job.mode,
+                    chunk_size=app.config.get("CSV_IMPORT_CHUNK_SIZE", 1000),
+                    on_chunk=record_progress,
+                )
+            job.rows_processed = summary["processed"]
+            job.created_enrollments = summary["created_enrollments"]
+            job.errors = summary["errors"]
+            job.chunks = summary.get("chunks")
+            job.state = JOB_SUCCEEDED
+        except Exception as exc:
+            db.session.rollback()
+            app.logger.exception("Import job %s failed: %s", job_id, exc)
+            job = db.session.get(ImportJob, job_id)
+            job.state = JOB_FAILED
+            job.failure_reason = str(exc)
+        finally:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+        job.finished_at = datetime.utcnow()
+        db.session.commit()
+
+
+def serialize_job(job: ImportJob) -> dict:
+    return {
+        "job_id": job.job_id,
+        "state": job.state,
+        "filename": job.filename,
+        "session": job.session,
+        "semester": job.semester,
+        "mode": job.mode,
+        "rows_processed": job.rows_processed,
+        "created_enrollments": job.created_enrollments,
+        "errors": job.errors or [],
+        "chunks": job.chunks or [],
+        "failure_reason": job.failure_reason,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+        "duration_seconds": job.duration_seconds,
+    }
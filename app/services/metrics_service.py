@@ -0,0 +1,208 @@
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from flask import Flask, g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+STATEMENT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+_PREFIX = "edu_analytics"
+
+# [statements, seconds] for the request running in this context; None outside requests.
+_request_sql: ContextVar[list | None] = ContextVar("request_sql", default=None)
+
+
+class _Histogram:
+    __slots__ = ("buckets", "counts", "total", "count")
+
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """Per-process request and SQL metrics, rendered in the Prometheus text format.
+
+    Each request takes the lock once, when it is recorded; SQL statements
+    are tallied lock-free against the request's own context first. Every
+    worker process keeps its own counters, so a scrape sees the worker that
+    answered it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._requests = {}
+            self._latency = {}
+            self._sizes = {}
+            self._statements = {}
+            self._sql_seconds = {}
+
+    def record_request(
+        self,
+        endpoint: str,
+        method: str,
+        status: int,
+        seconds: float,
+        size: int | None,
+        statements: int,
+        sql_seconds: float,
+    ) -> None:
+        with self._lock:
+            key = (endpoint, method, str(status))
+            self._requests[key] = self._requests.get(key, 0) + 1
+            self._histogram(self._latency, endpoint, LATENCY_BUCKETS).observe(seconds)
+            if size is not None:
+                self._histogram(self._sizes, endpoint, SIZE_BUCKETS).observe(size)
+            self._histogram(self._statements, endpoint, STATEMENT_BUCKETS).observe(statements)
+            self._sql_seconds[endpoint] = self._sql_seconds.get(endpoint, 0.0) + sql_seconds
+
+    @staticmethod
+    def _histogram(histograms: dict, endpoint: str, buckets: tuple) -> _Histogram:
+        histogram = histograms.get(endpoint)
+        if histogram is None:
+            histogram = histograms[endpoint] = _Histogram(buckets)
+        return histogram
+
+    def render(self) -> str:
+        with self._lock:
+            requests = dict(self._requests)
+            latency = {endpoint: _copy(h) for endpoint, h in self._latency.items()}
+            sizes = {endpoint: _copy(h) for endpoint, h in self._sizes.items()}
+            statements = {endpoint: _copy(h) for endpoint, h in self._statements.items()}
+            sql_seconds = dict(self._sql_seconds)
+
+        lines = [
+            f"# HELP {_PREFIX}_http_requests_total Requests handled, by endpoint, method and status.",
+            f"# TYPE {_PREFIX}_http_requests_total counter",
+        ]
+        for (endpoint, method, status), count in sorted(requests.items()):
+            lines.append(
+                f"{_PREFIX}_http_requests_total{_labels(endpoint=endpoint, method=method, status=status)} {count}"
+            )
+        _render_histogram(
+            lines, f"{_PREFIX}_http_request_duration_seconds", "Request latency in seconds.", latency
+        )
+        _render_histogram(
+            lines, f"{_PREFIX}_http_response_size_bytes", "Response body size in bytes, when known.", sizes
+        )
+        _render_histogram(
+            lines, f"{_PREFIX}_sql_statements_per_request", "SQL statements executed per request.", statements
+        )
+        lines.append(f"# HELP {_PREFIX}_sql_duration_seconds_total Time spent executing SQL, by endpoint.")
+        lines.append(f"# TYPE {_PREFIX}_sql_duration_seconds_total counter")
+        for endpoint, seconds in sorted(sql_seconds.items()):
+            lines.append(f"{_PREFIX}_sql_duration_seconds_total{_labels(endpoint=endpoint)} {seconds:.6f}")
+        return "\n".join(lines) + "\n"
+
+
+def _copy(histogram: _Histogram) -> _Histogram:
+    copy = _Histogram(histogram.buckets)
+    copy.counts = list(histogram.counts)
+    copy.total = histogram.total
+    copy.count = histogram.count
+    return copy
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _render_histogram(lines: list, name: str, help_text: str, histograms: dict) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for endpoint, histogram in sorted(histograms.items()):
+        cumulative = 0
+        for bound, count in zip((*histogram.buckets, "+Inf"), histogram.counts):
+            cumulative += count
+            lines.append(f"{name}_bucket{_labels(endpoint=endpoint, le=str(bound))} {cumulative}")
+        lines.append(f"{name}_sum{_labels(endpoint=endpoint)} {histogram.total:.6f}")
+        lines.append(f"{name}_count{_labels(endpoint=endpoint)} {histogram.count}")
+
+
+_registry = MetricsRegistry()
+
+
+def get_registry() -> MetricsRegistry:
+    return _registry
+
+
+def render_metrics() -> str:
+    return _registry.render()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _request_sql.get() is not None:
+        conn.info["metrics_started"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    tally = _request_sql.get()
+    if tally is not None:
+        tally[0] += 1
+        tally[1] += time.perf_counter() - conn.info.pop("metrics_started", time.perf_counter())
+
+
+def _start_request() -> None:
+    g._metrics_started = time.perf_counter()
+    g._metrics_token = _request_sql.set([0, 0.0])
+
+
+def _finish_request(response):
+    started = g.get("_metrics_started")
+    if started is None:
+        return response
+    statements, sql_seconds = _request_sql.get() or (0, 0.0)
+    _registry.record_request(
+        endpoint=request.endpoint or "unmatched",
+        method=request.method,
+        status=response.status_code,
+        seconds=time.perf_counter() - started,
+        size=response.content_length,
+        statements=statements,
+        sql_seconds=sql_seconds,
+    )
+    return response
+
+
+def _end_request(exc) -> None:
+    token = g.pop("_metrics_token", None)
+    if token is not None:
+        try:
+            _request_sql.reset(token)
+        except ValueError:
+            # Torn down from a different context than the one that started it.
+            _request_sql.set(None)
+
+
+def init_metrics(app: Flask) -> None:
+    """Time every request and count the SQL it runs when METRICS_ENABLED is on."""
+    if not app.config.get("METRICS_ENABLED", True):
+        return
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+    app.teardown_request(_end_request)
@@ -0,0 +1,124 @@
+import json
+import threading
+from collections import OrderedDict
+
+from flask import current_app
+from sqlalchemy import event, update
+from sqlalchemy.orm import Session, object_session
+
+from app.extensions import db
+from app.models.enrollment import Enrollment
+from app.models.student import Student
+from app.services.personalization_service import build_personalized_learning_payload
+
+_CHANGED_STUDENTS_KEY = "changed_student_ids"
+
+
+class PayloadCache:
+    """Thread-safe LRU of built payloads, bounded by entry count and approximate size."""
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, payload: dict) -> None:
+        size = len(json.dumps(payload, default=str))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (payload, size)
+            self._bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+
+    def discard_student(self, student_id: int) -> None:
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == student_id]:
+                self._bytes -= self._entries.pop(key)[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+_cache: PayloadCache | None = None
+_cache_lock = threading.Lock()
+
+
+def _get_cache() -> PayloadCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = PayloadCache(
+                max_entries=current_app.config.get("PAYLOAD_CACHE_MAX_ENTRIES", 2048),
+                max_bytes=current_app.config.get("PAYLOAD_CACHE_MAX_BYTES", 32 * 1024 * 1024),
+            )
+        return _cache
+
+
+def student_payload_etag(student: Student) -> str:
+    return f"student-{student.student_id}-v{student.data_version or 0}"
+
+
+def get_personalized_learning_payload(student: Student) -> dict:
+    """Cached ``build_personalized_learning_payload`` keyed by student and data version.
+
+    Writes bump ``Student.data_version`` in the database, so every worker's
+    cache misses on the next request after a change; older versions age out
+    of the LRU.
+    """
+    cache = _get_cache()
+    key = (student.student_id, student.data_version or 0)
+    payload = cache.get(key)
+    if payload is None:
+        payload = build_personalized_learning_payload(student)
+        cache.discard_student(student.student_id)
+        cache.put(key, payload)
+    return payload
+
+
+def mark_students_changed(student_ids) -> None:
+    """Queue a data_version bump for these students when the session commits."""
+    db.session.info.setdefault(_CHANGED_STUDENTS_KEY, set()).update(student_ids)
+
+
+@event.listens_for(Enrollment, "after_insert")
+@event.listens_for(Enrollment, "after_delete")
+def _enrollment_changed(mapper, connection, target: Enrollment) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_CHANGED_STUDENTS_KEY, set()).add(target.student_id)
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_student_versions(session: Session) -> None:
+    session.flush()
+    student_ids = session.info.pop(_CHANGED_STUDENTS_KEY, None)
+    if student_ids:
+        session.execute(
+            update(Student)
+            .where(Student.student_id.in_(student_ids))
+            .values(data_version=Student.data_version + 1)
+            .execution_options(synchronize_session=False)
+        )
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_student_changes(session: Session) -> None:
+    session.info.pop(_CHANGED_STUDENTS_KEY, None)
@@ -1,7 +1,21 @@
 from collections import defaultdict
 
+from sqlalchemy.orm import joinedload
+
+from app.extensions import db
+from app.models.analytics_result import AnalyticsResult
+from app.models.assessment import Assessment
+from app.models.course import Course
+from app.models.enrollment import Enrollment
 from app.models.student import Student
-from app.services.aggregation_service import student_gpa_estimate
+from app.services.aggregation_service import gpa_from_grades
+from app.utils.constants import GRADE_POINTS
+from app.utils.pagination import ListSpec, PageRequest, paginate, parse_page_request
+
+COHORT_LIST = ListSpec(
+    key=Student.student_id,
+    sorts={"matric_no": Student.matric_no, "full_name": Student.full_name, "level": Student.level},
+)
 
 
 def _course_status(total_score: float) -> str:
@@ -22,8 +36,37 @@ def _predict_outcome(gpa: float, high_risk_count: int, medium_risk_count: int) -
     return "On track for strong academic standing"
 
 
-def build_personalized_learning_payload(student: Student) -> dict:
-    enrollments = list(student.enrollments)
+def _weekly_target_hours(weak_count: int, high_risk_count: int, medium_risk_count: int) -> int:
+    weekly_hours = 8 + (2 * weak_count) + (2 * high_risk_count) + medium_risk_count
+    return min(max(weekly_hours, 8), 26)
+
+
+def _load_enrollments(student_ids: list[int]) -> list[Enrollment]:
+    return (
+        Enrollment.query.options(
+            joinedload(Enrollment.course),
+            joinedload(Enrollment.assessment),
+            joinedload(Enrollment.analytics_result),
+        )
+        .filter(Enrollment.student_id.in_(student_ids))
+        .order_by(Enrollment.enrollment_id.asc())
+        .all()
+    )
+
+
+def build_personalized_learning_payloads(students: list[Student]) -> list[dict]:
+    """Payloads for many students from a single joined enrollment query."""
+    by_student = defaultdict(list)
+    if students:
+        for enrollment in _load_enrollments([s.student_id for s in students]):
+            by_student[enrollment.student_id].append(enrollment)
+    return [build_personalized_learning_payload(s, by_student[s.student_id]) for s in students]
+
+
+def build_personalized_learning_payload(student: Student, enrollments: list[Enrollment] | None = None) -> dict:
+    # One joined query feeds every section below, including the GPA.
+    if enrollments is None:
+        enrollments = _load_enrollments([student.student_id])
     course_performance = []
     score_rows = []
     weak_courses = []
@@ -109,13 +152,14 @@ def build_personalized_learning_payload(student: Student) -> dict:
             }
         )
 
-    gpa = student_gpa_estimate(student.student_id)
+    gpa = gpa_from_grades(
+        (e.assessment.grade, e.course.credit_units) for e in enrollments if e.assessment is not None
+    )
     assessed_count = len(course_performance)
     enrolled_count = len(enrollments)
     engagement_index = round((assessed_count / enrolled_count) * 100, 2) if enrolled_count else 0.0
 
-    weekly_hours = 8 + (2 * len(weak_courses)) + (2 * risk_counts["HIGH"]) + risk_counts["MEDIUM"]
-    weekly_hours = min(max(weekly_hours, 8), 26)
+    weekly_hours = _weekly_target_hours(len(weak_courses), risk_counts["HIGH"], risk_counts["MEDIUM"])
 
     study_plan = [
         {"day": "Monday", "focus": "Review lecture notes and summarize key concepts", "hours": 2},
@@ -177,3 +221,100 @@ def build_personalized_learning_payload(student: Student) -> dict:
         "next_actions": next_actions,
     }
 
+
+def build_cohort_summaries(
+    advisor_id: int | None = None,
+    department_id: int | None = None,
+    page: PageRequest | None = None,
+) -> dict:
+    """Compact personalization summaries for a page of an advisor caseload or department.
+
+    One query loads the page of students and one loads all of their enrollment
+    rows; the per-student figures come from a single pandas groupby.
+    """
+    students_query = Student.query
+    if advisor_id is not None:
+        students_query = students_query.filter(Student.advisor_id == advisor_id)
+    if department_id is not None:
+        students_query = students_query.filter(Student.department_id == department_id)
+    student_page = paginate(students_query, COHORT_LIST, page or parse_page_request(COHORT_LIST, {}), lambda s: s)
+    students = student_page["items"]
+    if not students:
+        return {"items": [], "next_cursor": None}
+
+    import pandas as pd
+
+    rows = (
+        db.session.query(
+            Enrollment.student_id,
+            Course.course_code,
+            Course.credit_units,
+            Assessment.total_score,
+            Assessment.grade,
+            AnalyticsResult.risk_level,
+        )
+        .join(Course, Course.course_id == Enrollment.course_id)
+        .outerjoin(Assessment, Assessment.enrollment_id == Enrollment.enrollment_id)
+        .outerjoin(AnalyticsResult, AnalyticsResult.enrollment_id == Enrollment.enrollment_id)
+        .filter(Enrollment.student_id.in_([s.student_id for s in students]))
+        .order_by(Enrollment.enrollment_id.asc())
+        .all()
+    )
+    df = pd.DataFrame(
+        rows, columns=["student_id", "course_code", "credit_units", "total_score", "grade", "risk_level"]
+    )
+    assessed = df["total_score"].notna()
+    df["status"] = df["total_score"].where(assessed).map(_course_status, na_action="ignore")
+    df["points"] = df["grade"].map(GRADE_POINTS).fillna(0.0) * df["credit_units"]
+    df["assessed_units"] = df["credit_units"].where(assessed, 0)
+    df["points"] = df["points"].where(assessed, 0.0)
+    df["is_weak"] = df["status"].isin(["CRITICAL", "AT_RISK"])
+    for level in ("LOW", "MEDIUM", "HIGH"):
+        df[f"risk_{level}"] = df["risk_level"] == level
+
+    grouped = df.groupby("student_id").agg(
+        enrolled=("course_code", "size"),
+        assessed=("total_score", "count"),
+        points=("points", "sum"),
+        units=("assessed_units", "sum"),
+        weak=("is_weak", "sum"),
+        risk_low=("risk_LOW", "sum"),
+        risk_medium=("risk_MEDIUM", "sum"),
+        risk_high=("risk_HIGH", "sum"),
+    )
+    weak_courses = df[df["is_weak"]].groupby("student_id")["course_code"].apply(list)
+
+    items = []
+    for student in students:
+        if student.student_id in grouped.index:
+            stats = grouped.loc[student.student_id]
+            enrolled, assessed_count = int(stats["enrolled"]), int(stats["assessed"])
+            units = float(stats["units"])
+            gpa = round(float(stats["points"]) / units, 2) if units else 0.0
+            risk_counts = {
+                "LOW": int(stats["risk_low"]),
+                "MEDIUM": int(stats["risk_medium"]),
+                "HIGH": int(stats["risk_high"]),
+            }
+            weak_count = int(stats["weak"])
+        else:
+            enrolled, assessed_count, gpa, weak_count = 0, 0, 0.0, 0
+            risk_counts = {"LOW": 0, "MEDIUM": 0, "HIGH": 0}
+
+        items.append(
+            {
+                "student_id": student.student_id,
+                "matric_no": student.matric_no,
+                "full_name": student.full_name,
+                "level": student.level,
+                "department_id": student.department_id,
+                "GPA_estimate": gpa,
+                "engagement_index": round((assessed_count / enrolled) * 100, 2) if enrolled else 0.0,
+                "risk_breakdown": risk_counts,
+                "weak_courses": weak_courses.get(student.student_id, []),
+                "predicted_outcome": _predict_outcome(gpa, risk_counts["HIGH"], risk_counts["MEDIUM"]),
+                "weekly_target_hours": _weekly_target_hours(weak_count, risk_counts["HIGH"], risk_counts["MEDIUM"]),
+            }
+        )
+
+    return {"items": items, "next_cursor": student_page["next_cursor"]}
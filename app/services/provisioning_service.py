@@ -0,0 +1,204 @@
+import csv
+import io
+
+from marshmallow import ValidationError
+from sqlalchemy import insert, select, tuple_
+
+from app.extensions import db
+from app.models.course import Course
+from app.models.department import Department
+from app.models.faculty import Faculty
+from app.models.staff import Staff
+from app.models.university import University
+from app.schemas.course_schema import CourseSchema
+from app.schemas.staff_schema import StaffCreateSchema
+from app.schemas.university_schema import StructureRowSchema
+from app.services.reference_data_service import mark_reference_data_changed
+from app.utils.passwords import hash_passwords
+
+structure_row_schema = StructureRowSchema()
+staff_create_schema = StaffCreateSchema()
+course_schema = CourseSchema()
+
+
+class ProvisioningError(ValueError):
+    """Raised with per-row errors when a batch fails validation; nothing is written."""
+
+    def __init__(self, errors: list[dict]):
+        super().__init__(f"{len(errors)} invalid row(s); nothing was created")
+        self.errors = errors
+
+
+def read_records(json_payload, file_storage=None) -> list[dict]:
+    """Rows from an uploaded CSV file, a JSON array, or a JSON object with ``items``."""
+    if file_storage is not None:
+        text = io.TextIOWrapper(file_storage.stream, encoding="utf-8-sig")
+        return [
+            {key.strip().lower(): (value.strip() or None) for key, value in row.items() if key and value is not None}
+            for row in csv.DictReader(text)
+        ]
+    if isinstance(json_payload, dict):
+        json_payload = json_payload.get("items")
+    if not isinstance(json_payload, list) or not all(isinstance(item, dict) for item in json_payload):
+        raise ProvisioningError([{"row": 0, "error": "Expected a JSON array of objects or a CSV file"}])
+    return json_payload
+
+
+def _load_all(schema, records: list[dict]) -> tuple[list[tuple[int, dict]], list[dict]]:
+    """Validate every record, returning (row number, loaded row) pairs and the errors."""
+    loaded, errors = [], []
+    for row_no, record in enumerate(records, start=1):
+        try:
+            loaded.append((row_no, schema.load({k: v for k, v in record.items() if v is not None})))
+        except ValidationError as err:
+            errors.append({"row": row_no, "error": err.messages})
+    return loaded, errors
+
+
+def _existing_ids(column, ids) -> set:
+    ids = {value for value in ids if value is not None}
+    if not ids:
+        return set()
+    return set(db.session.scalars(select(column).where(column.in_(ids))))
+
+
+def ensure_structure(university_id: int, structure: dict[str, list[str]]) -> dict:
+    """Create any missing faculties and departments under one university with set-based queries."""
+    faculty_ids = dict(
+        db.session.execute(
+            select(Faculty.name, Faculty.faculty_id).where(
+                Faculty.university_id == university_id, Faculty.name.in_(list(structure))
+            )
+        ).all()
+    )
+    missing_faculties = [name for name in structure if name not in faculty_ids]
+    if missing_faculties:
+        created = db.session.execute(
+            insert(Faculty).returning(Faculty.name, Faculty.faculty_id),
+            [{"name": name, "university_id": university_id} for name in missing_faculties],
+        ).all()
+        faculty_ids.update(dict(created))
+
+    wanted = {(faculty_ids[faculty], dept) for faculty, departments in structure.items() for dept in departments}
+    existing = set()
+    if wanted:
+        existing = set(
+            db.session.execute(
+                select(Department.faculty_id, Department.name).where(
+                    tuple_(Department.faculty_id, Department.name).in_(list(wanted))
+                )
+            ).all()
+        )
+    missing_departments = [
+        {"faculty_id": faculty_ids[faculty], "name": dept}
+        for faculty, departments in structure.items()
+        for dept in dict.fromkeys(departments)
+        if (faculty_ids[faculty], dept) not in existing
+    ]
+    if missing_departments:
+        db.session.execute(insert(Department), missing_departments)
+    if missing_faculties or missing_departments:
+        mark_reference_data_changed()
+    return {"created_faculties": len(missing_faculties), "created_departments": len(missing_departments)}
+
+
+def provision_structure(records: list[dict]) -> dict:
+    rows, errors = _load_all(structure_row_schema, records)
+    known_universities = _existing_ids(University.university_id, [row["university_id"] for _, row in rows])
+    for row_no, row in rows:
+        if row["university_id"] not in known_universities:
+            errors.append({"row": row_no, "error": f"University {row['university_id']} does not exist"})
+    if errors:
+        raise ProvisioningError(sorted(errors, key=lambda item: item["row"]))
+
+    by_university = {}
+    for _, row in rows:
+        departments = by_university.setdefault(row["university_id"], {}).setdefault(row["faculty"].strip(), [])
+        if row.get("department"):
+            departments.append(row["department"].strip())
+
+    result = {"created_faculties": 0, "created_departments": 0}
+    for university_id, structure in by_university.items():
+        for key, value in ensure_structure(university_id, structure).items():
+            result[key] += value
+    db.session.commit()
+    return result
+
+
+def provision_staff(records: list[dict]) -> dict:
+    rows, errors = _load_all(staff_create_schema, records)
+    for _, row in rows:
+        row["email"] = row["email"].lower()
+
+    existing_emails = _existing_ids(Staff.email, [row["email"] for _, row in rows])
+    known_departments = _existing_ids(Department.department_id, [row.get("department_id") for _, row in rows])
+    seen = set()
+    for row_no, row in rows:
+        if row["email"] in existing_emails:
+            errors.append({"row": row_no, "error": f"Staff email already exists: {row['email']}"})
+        elif row["email"] in seen:
+            errors.append({"row": row_no, "error": f"Duplicate email in batch: {row['email']}"})
+        if row.get("department_id") is not None and row["department_id"] not in known_departments:
+            errors.append({"row": row_no, "error": f"Department {row['department_id']} does not exist"})
+        seen.add(row["email"])
+    if errors:
+        raise ProvisioningError(sorted(errors, key=lambda item: item["row"]))
+
+    hashes = hash_passwords([row["password"] for _, row in rows])
+    if rows:
+        db.session.execute(
+            insert(Staff),
+            [
+                {
+                    "full_name": row["full_name"],
+                    "email": row["email"],
+                    "role": row["role"],
+                    "department_id": row.get("department_id"),
+                    "password_hash": password_hash,
+                }
+                for (_, row), password_hash in zip(rows, hashes)
+            ],
+        )
+    db.session.commit()
+    return {"created_staff": len(rows)}
+
+
+def provision_courses(records: list[dict]) -> dict:
+    rows, errors = _load_all(course_schema, records)
+    for _, row in rows:
+        row["course_code"] = row["course_code"].upper()
+
+    existing_codes = _existing_ids(Course.course_code, [row["course_code"] for _, row in rows])
+    known_departments = _existing_ids(Department.department_id, [row["department_id"] for _, row in rows])
+    known_lecturers = _existing_ids(Staff.staff_id, [row.get("lecturer_id") for _, row in rows])
+    seen = set()
+    for row_no, row in rows:
+        if row["course_code"] in existing_codes:
+            errors.append({"row": row_no, "error": f"Course code already exists: {row['course_code']}"})
+        elif row["course_code"] in seen:
+            errors.append({"row": row_no, "error": f"Duplicate course code in batch: {row['course_code']}"})
+        if row["department_id"] not in known_departments:
+            errors.append({"row": row_no, "error": f"Department {row['department_id']} does not exist"})
+        if row.get("lecturer_id") is not None and row["lecturer_id"] not in known_lecturers:
+            errors.append({"row": row_no, "error": "Assigned lecturer does not exist"})
+        seen.add(row["course_code"])
+    if errors:
+        raise ProvisioningError(sorted(errors, key=lambda item: item["row"]))
+
+    if rows:
+        db.session.execute(
+            insert(Course),
+            [
+                {
+                    "course_code": row["course_code"],
+                    "course_title": row["course_title"],
+                    "credit_units": row["credit_units"],
+                    "semester": row["semester"],
+                    "department_id": row["department_id"],
+                    "lecturer_id": row.get("lecturer_id"),
+                }
+                for _, row in rows
+            ],
+        )
+    db.session.commit()
+    return {"created_courses": len(rows)}
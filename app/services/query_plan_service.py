@@ -0,0 +1,243 @@
+import re
+from contextlib import contextmanager
+from datetime import datetime
+
+from flask import Flask
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event, func, insert, select, text
+
+from app.extensions import db
+from app.models.course import Course
+from app.models.department import Department
+from app.models.enrollment import Enrollment
+from app.models.faculty import Faculty
+from app.models.staff import Staff
+from app.models.student import Student
+from app.models.university import University
+from app.services import aggregation_service
+from app.services.analytics_service import bulk_store_analytics
+from app.utils.constants import ADMIN, COURSE_ADVISOR, HOD, LECTURER, STUDENT
+
+# Tables that grow with the student body; a sequential scan on any of them is a regression.
+LARGE_TABLES = {"students", "enrollments", "assessments", "analytics_results", "student_gpa", "student_term_gpa"}
+
+_SQLITE_FULL_SCAN = re.compile(r"^SCAN (\w+)(?! USING (?:COVERING )?INDEX)")
+_POSTGRES_FULL_SCAN = re.compile(r"Seq Scan on (\w+)")
+
+
+def seed_synthetic_dataset(
+    students: int = 20000, departments: int = 4, courses_per_department: int = 20, enrollments_per_student: int = 6
+) -> dict:
+    """Fill an empty database with a deterministic institution large enough for the planner to prefer indexes."""
+    import numpy as np
+
+    rng = np.random.default_rng(2024)
+    university = University(name="Synthetic University", location="Audit", established_year=2000)
+    faculty = Faculty(name="Faculty of Audit", university=university)
+    db.session.add_all([university, faculty])
+    db.session.flush()
+
+    department_ids = db.session.scalars(
+        insert(Department).returning(Department.department_id),
+        [{"name": f"Department {n}", "faculty_id": faculty.faculty_id} for n in range(departments)],
+    ).all()
+    # Every synthetic account shares one cheap hash; the audit never verifies passwords.
+    password_hash = "$2b$04$" + "a" * 53
+    staff_rows = [{"full_name": "Audit Admin", "email": "audit-admin@synthetic.edu", "role": ADMIN}]
+    for dept_id in department_ids:
+        staff_rows += [
+            {"full_name": f"HOD {dept_id}", "email": f"hod{dept_id}@synthetic.edu", "role": HOD, "department_id": dept_id},
+            {"full_name": f"Advisor {dept_id}", "email": f"advisor{dept_id}@synthetic.edu", "role": COURSE_ADVISOR, "department_id": dept_id},
+        ]
+        staff_rows += [
+            {"full_name": f"Lecturer {dept_id}-{n}", "email": f"lecturer{dept_id}-{n}@synthetic.edu", "role": LECTURER, "department_id": dept_id}
+            for n in range(courses_per_department // 2)
+        ]
+    staff = db.session.execute(
+        insert(Staff).returning(Staff.staff_id, Staff.role, Staff.department_id),
+        [{"department_id": None, "password_hash": password_hash, **row} for row in staff_rows],
+    ).all()
+    lecturers = {}
+    advisors = {}
+    for staff_id, role, dept_id in staff:
+        if role == LECTURER:
+            lecturers.setdefault(dept_id, []).append(staff_id)
+        elif role == COURSE_ADVISOR:
+            advisors[dept_id] = staff_id
+
+    course_rows = [
+        {
+            "course_code": f"AUD{dept_id}{n:03d}",
+            "course_title": f"Audit Course {n}",
+            "credit_units": int(1 + n % 4),
+            "semester": "FIRST",
+            "department_id": dept_id,
+            "lecturer_id": lecturers[dept_id][n % len(lecturers[dept_id])],
+        }
+        for dept_id in department_ids
+        for n in range(courses_per_department)
+    ]
+    course_ids = db.session.execute(
+        insert(Course).returning(Course.course_id, Course.department_id), course_rows
+    ).all()
+    courses_by_department = {}
+    for course_id, dept_id in course_ids:
+        courses_by_department.setdefault(dept_id, []).append(course_id)
+
+    student_rows = [
+        {
+            "matric_no": f"AUD/{n:06d}",
+            "full_name": f"Student {n}",
+            "gender": "F" if n % 2 else "M",
+            "level": int(100 * (1 + n % 4)),
+            "password_hash": password_hash,
+            "department_id": department_ids[n % departments],
+            "advisor_id": advisors[department_ids[n % departments]],
+            "created_at": datetime.utcnow(),
+        }
+        for n in range(students)
+    ]
+    student_ids = db.session.execute(
+        insert(Student).returning(Student.student_id, Student.department_id), student_rows
+    ).all()
+
+    enrollment_rows = []
+    for student_id, dept_id in student_ids:
+        picks = rng.choice(courses_by_department[dept_id], size=enrollments_per_student, replace=False)
+        enrollment_rows += [
+            {"student_id": student_id, "course_id": int(course_id), "session": "2025/2026", "semester": "FIRST"}
+            for course_id in picks
+        ]
+    enrollment_ids = db.session.scalars(insert(Enrollment).returning(Enrollment.enrollment_id), enrollment_rows).all()
+    db.session.commit()
+
+    ca_scores = rng.uniform(5, 40, size=len(enrollment_ids)).round(2)
+    exam_scores = rng.uniform(5, 60, size=len(enrollment_ids)).round(2)
+    for start in range(0, len(enrollment_ids), 20000):
+        stop = start + 20000
+        bulk_store_analytics(
+            dict(zip(enrollment_ids[start:stop], zip(ca_scores[start:stop].tolist(), exam_scores[start:stop].tolist())))
+        )
+        db.session.commit()
+
+    analyze = {"sqlite": "ANALYZE", "postgresql": "ANALYZE"}.get(db.engine.dialect.name)
+    if analyze:
+        db.session.execute(text(analyze))
+        db.session.commit()
+    return {"students": len(student_ids), "courses": len(course_ids), "enrollments": len(enrollment_ids)}
+
+
+@contextmanager
+def capture_selects():
+    """Record every SELECT issued on the engine while the block runs."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")) and not executemany:
+            statements.append((statement, parameters))
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+
+
+def explain(statement: str, parameters) -> list[str]:
+    dialect = db.engine.dialect.name
+    prefix = "EXPLAIN QUERY PLAN " if dialect == "sqlite" else "EXPLAIN "
+    with db.engine.connect() as connection:
+        rows = connection.exec_driver_sql(prefix + statement, parameters).all()
+    if dialect == "sqlite":
+        return [row[-1] for row in rows]
+    return [row[0] for row in rows]
+
+
+def sequential_scans(plan: list[str]) -> set[str]:
+    pattern = _SQLITE_FULL_SCAN if db.engine.dialect.name == "sqlite" else _POSTGRES_FULL_SCAN
+    scanned = set()
+    for line in plan:
+        match = pattern.search(line.strip())
+        if match:
+            scanned.add(match.group(1))
+    return scanned & LARGE_TABLES
+
+
+def _first(column):
+    return select(column).order_by(column.asc()).limit(1)
+
+
+def _audit_scenarios(app: Flask) -> list[tuple[str, object, set]]:
+    """(name, callable, tables a full scan is legitimate for) for every audited code path."""
+    department = db.session.scalars(_first(Department.department_id)).first()
+    faculty_id = db.session.get(Department, department).faculty_id
+    hod = db.session.scalars(_first(Staff.staff_id).where(Staff.role == HOD)).first()
+    advisor = db.session.scalars(_first(Staff.staff_id).where(Staff.role == COURSE_ADVISOR)).first()
+    lecturer = db.session.scalars(_first(Staff.staff_id).where(Staff.role == LECTURER)).first()
+    admin = db.session.scalars(_first(Staff.staff_id).where(Staff.role == ADMIN)).first()
+    course = db.session.scalars(_first(Course.course_id).where(Course.lecturer_id == lecturer)).first()
+    middle = db.session.query(func.max(Student.student_id)).scalar() // 2
+    student = db.session.get(Student, middle)
+
+    def token(identity: str, role: str, department_id) -> dict:
+        access = create_access_token(
+            identity=identity,
+            additional_claims={"role": role, "user_type": identity.split(":")[0], "department_id": department_id, "university_id": 1},
+        )
+        return {"Authorization": f"Bearer {access}"}
+
+    headers = {
+        STUDENT: token(f"student:{student.student_id}", STUDENT, student.department_id),
+        LECTURER: token(f"staff:{lecturer}", LECTURER, department),
+        COURSE_ADVISOR: token(f"staff:{advisor}", COURSE_ADVISOR, department),
+        HOD: token(f"staff:{hod}", HOD, department),
+        ADMIN: token(f"staff:{admin}", ADMIN, None),
+    }
+    client = app.test_client()
+
+    def get(role: str, url: str):
+        return lambda: client.get(url, headers=headers[role])
+
+    return [
+        ("aggregation.course_performance_summary", lambda: aggregation_service.course_performance_summary(lecturer_id=lecturer), set()),
+        ("aggregation.course_pass_rate", lambda: aggregation_service.course_pass_rate(course), set()),
+        ("aggregation.department_average", lambda: aggregation_service.department_average(department), set()),
+        ("aggregation.faculty_pass_rate", lambda: aggregation_service.faculty_pass_rate(faculty_id), set()),
+        ("aggregation.institution_performance_trend", aggregation_service.institution_performance_trend, set()),
+        ("aggregation.department_high_risk_courses", lambda: aggregation_service.department_high_risk_courses(department), set()),
+        ("aggregation.grade_distribution", lambda: aggregation_service.grade_distribution(department), set()),
+        ("aggregation.department_analytics_snapshot", lambda: aggregation_service.department_analytics_snapshot(department), set()),
+        ("aggregation.advisor_at_risk_summary", lambda: aggregation_service.advisor_at_risk_summary(advisor), set()),
+        ("aggregation.student_gpa_estimate", lambda: aggregation_service.student_gpa_estimate(student.student_id), set()),
+        # Counting every student is a whole-table aggregate by definition.
+        ("aggregation.system_stats", aggregation_service.system_stats, {"students"}),
+        ("GET /api/student/courses", get(STUDENT, "/api/student/courses"), set()),
+        ("GET /api/student/dashboard", get(STUDENT, "/api/student/dashboard"), set()),
+        ("GET /api/auth/me", get(STUDENT, "/api/auth/me"), set()),
+        ("GET /api/lecturer/class-analytics", get(LECTURER, "/api/lecturer/class-analytics"), set()),
+        ("GET /api/advisor/students", get(COURSE_ADVISOR, "/api/advisor/students?sort=full_name"), set()),
+        ("GET /api/advisor/at-risk", get(COURSE_ADVISOR, "/api/advisor/at-risk"), set()),
+        ("GET /api/advisor/personalization", get(COURSE_ADVISOR, "/api/advisor/personalization"), set()),
+        ("GET /api/hod/department-analytics", get(HOD, "/api/hod/department-analytics"), set()),
+        ("GET /api/hod/lecturers", get(HOD, "/api/hod/lecturers"), set()),
+        ("GET /api/hod/high-risk-courses", get(HOD, "/api/hod/high-risk-courses"), set()),
+        ("GET /api/hod/personalization", get(HOD, "/api/hod/personalization"), set()),
+        ("GET /api/hod/gpa-ranking", get(HOD, "/api/hod/gpa-ranking"), set()),
+        ("GET /api/hod/degree-classes", get(HOD, "/api/hod/degree-classes"), set()),
+        ("GET /api/hod/probation", get(HOD, "/api/hod/probation"), set()),
+        ("GET /api/admin/system-stats", get(ADMIN, "/api/admin/system-stats"), {"students"}),
+        ("GET /api/admin/reference-data", get(ADMIN, "/api/admin/reference-data"), set()),
+    ]
+
+
+def audit_query_plans(app: Flask) -> list[dict]:
+    """Run every audited code path, EXPLAIN each SELECT it issued and report sequential scans."""
+    report = []
+    for name, run, allowed in _audit_scenarios(app):
+        with capture_selects() as statements:
+            run()
+        for statement, parameters in statements:
+            plan = explain(statement, parameters)
+            scans = sequential_scans(plan) - allowed
+            report.append({"scenario": name, "statement": statement, "plan": plan, "sequential_scans": sorted(scans)})
+    return report
@@ -10,3 +10,13 @@ def generate_recommendation(risk_level: str, grade: str) -> str:
         return "Maintain performance: continue consistent study habits and support peers through study groups."
     return "Low risk: keep steady effort and monitor progress with periodic self-assessment."
 
+
+def generate_recommendations(risk_levels, grades) -> list[str]:
+    cache = {}
+    recommendations = []
+    for risk_level, grade in zip(risk_levels, grades):
+        key = (risk_level, grade)
+        if key not in cache:
+            cache[key] = generate_recommendation(risk_level, grade)
+        recommendations.append(cache[key])
+    return recommendations
@@ -0,0 +1,115 @@
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from flask import Flask, current_app
+
+from app.config import get_config
+from app.extensions import db
+from app.models.assessment import Assessment
+from app.models.course import Course
+from app.models.enrollment import Enrollment
+from app.services.analytics_service import bulk_store_analytics
+
+DEFAULT_RECOMPUTE_CHUNK_SIZE = 5000
+
+
+def _scoped_score_query(course_id: int | None, department_id: int | None, session: str | None):
+    query = db.session.query(Assessment.enrollment_id, Assessment.ca_score, Assessment.exam_score).join(
+        Enrollment, Enrollment.enrollment_id == Assessment.enrollment_id
+    )
+    if course_id:
+        query = query.filter(Enrollment.course_id == course_id)
+    if department_id:
+        query = query.join(Course, Course.course_id == Enrollment.course_id).filter(
+            Course.department_id == department_id
+        )
+    if session:
+        query = query.filter(Enrollment.session == session)
+    return query
+
+
+def _recompute_scope(
+    course_id: int | None, department_id: int | None, session: str | None, chunk_size: int
+) -> tuple[int, int]:
+    """Walk the scope in enrollment_id order and rewrite it one chunk at a time."""
+    query = _scoped_score_query(course_id, department_id, session)
+    rows_done = 0
+    chunks = 0
+    last_id = 0
+    while True:
+        rows = (
+            query.filter(Assessment.enrollment_id > last_id)
+            .order_by(Assessment.enrollment_id.asc())
+            .limit(chunk_size)
+            .all()
+        )
+        if not rows:
+            break
+        bulk_store_analytics({enrollment_id: (ca, exam) for enrollment_id, ca, exam in rows})
+        db.session.commit()
+        rows_done += len(rows)
+        chunks += 1
+        last_id = rows[-1][0]
+    return rows_done, chunks
+
+
+def _department_worker(database_uri: str, department_id: int, session: str | None, chunk_size: int):
+    app = Flask(__name__)
+    app.config.from_object(get_config())
+    app.config["SQLALCHEMY_DATABASE_URI"] = database_uri
+    db.init_app(app)
+    with app.app_context():
+        return department_id, *_recompute_scope(None, department_id, session, chunk_size)
+
+
+def recompute_analytics(
+    course_id: int | None = None,
+    department_id: int | None = None,
+    session: str | None = None,
+    chunk_size: int = DEFAULT_RECOMPUTE_CHUNK_SIZE,
+    workers: int = 0,
+) -> dict:
+    """Rebuild stored grades, risk levels and recommendations for a scope.
+
+    With no filters the whole institution is recomputed. When ``workers`` is
+    above one and the scope is not a single course, departments are fanned out
+    across a process pool, each worker committing its own chunks.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer")
+
+    started = time.perf_counter()
+    per_department = []
+    if workers > 1 and not course_id:
+        if department_id:
+            department_ids = [department_id]
+        else:
+            department_ids = [row[0] for row in db.session.query(Course.department_id).distinct().all()]
+        # Release our read transaction so the workers' writes are not blocked by it.
+        db.session.commit()
+        database_uri = current_app.config["SQLALCHEMY_DATABASE_URI"]
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            futures = [
+                pool.submit(_department_worker, database_uri, dept_id, session, chunk_size)
+                for dept_id in department_ids
+            ]
+            for future in futures:
+                dept_id, rows, chunks = future.result()
+                per_department.append({"department_id": dept_id, "rows": rows, "chunks": chunks})
+        rows_done = sum(item["rows"] for item in per_department)
+        chunks = sum(item["chunks"] for item in per_department)
+    else:
+        rows_done, chunks = _recompute_scope(course_id, department_id, session, chunk_size)
+
+    elapsed = time.perf_counter() - started
+    return {
+        "scope": {"course_id": course_id, "department_id": department_id, "session": session},
+        "rows": rows_done,
+        "chunks": chunks,
+        "workers": workers if per_department else 1,
+        "departments": per_department,
+        "seconds": round(elapsed, 3),
+        "rows_per_second": round(rows_done / elapsed, 2) if elapsed > 0 else 0.0,
+    }
@@ -0,0 +1,175 @@
+import hashlib
+import json
+import threading
+import time
+
+from flask import current_app
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session, object_session
+
+from app.extensions import db
+from app.models.department import Department
+from app.models.faculty import Faculty
+from app.models.university import University
+
+_REFERENCE_CHANGED_KEY = "reference_data_changed"
+
+_cached = None
+_cached_at = 0.0
+# Bumped by every invalidation; a load that started before a bump is not cached.
+_generation = 0
+_cache_lock = threading.Lock()
+
+
+def _load_reference_tree() -> list[dict]:
+    rows = db.session.execute(
+        select(
+            University.university_id,
+            University.name,
+            University.location,
+            University.established_year,
+            Faculty.faculty_id,
+            Faculty.name,
+            Department.department_id,
+            Department.name,
+        )
+        .select_from(University)
+        .outerjoin(Faculty, Faculty.university_id == University.university_id)
+        .outerjoin(Department, Department.faculty_id == Faculty.faculty_id)
+        .order_by(University.name.asc(), Faculty.name.asc(), Department.name.asc())
+    ).all()
+
+    universities = {}
+    faculties = {}
+    for uni_id, uni_name, location, established_year, fac_id, fac_name, dept_id, dept_name in rows:
+        university = universities.get(uni_id)
+        if university is None:
+            university = universities[uni_id] = {
+                "university_id": uni_id,
+                "name": uni_name,
+                "location": location,
+                "established_year": established_year,
+                "faculties": [],
+            }
+        if fac_id is None:
+            continue
+        faculty = faculties.get(fac_id)
+        if faculty is None:
+            faculty = faculties[fac_id] = {"faculty_id": fac_id, "name": fac_name, "departments": []}
+            university["faculties"].append(faculty)
+        if dept_id is not None:
+            faculty["departments"].append({"department_id": dept_id, "name": dept_name})
+    return list(universities.values())
+
+
+def _reference_cache(force: bool = False) -> tuple[list[dict], str, dict]:
+    global _cached, _cached_at
+    ttl = current_app.config.get("REFERENCE_DATA_CACHE_SECONDS", 300)
+    with _cache_lock:
+        if not force and _cached is not None and time.monotonic() - _cached_at < ttl:
+            return _cached
+        generation = _generation
+    tree = _load_reference_tree()
+    etag = hashlib.sha1(json.dumps(tree, sort_keys=True).encode("utf-8")).hexdigest()
+    index = {
+        "universities": {uni["university_id"]: uni["name"] for uni in tree},
+        "departments": {
+            dept["department_id"]: uni["university_id"]
+            for uni in tree
+            for faculty in uni["faculties"]
+            for dept in faculty["departments"]
+        },
+    }
+    result = (tree, etag, index)
+    with _cache_lock:
+        # An invalidation during the load means the tree may predate that commit: serve it, don't keep it.
+        if generation == _generation:
+            _cached = result
+            _cached_at = time.monotonic()
+    return result
+
+
+def reference_tree() -> tuple[list[dict], str]:
+    """The university → faculty → department tree and its ETag, cached in-process.
+
+    Commits that touch any of the three tables drop the cache in this process;
+    ``REFERENCE_DATA_CACHE_SECONDS`` bounds how long another worker process
+    can serve a tree built before such a commit.
+    """
+    tree, etag, _ = _reference_cache()
+    return tree, etag
+
+
+# One primary-key query per kind, answering a lookup the cached index misses.
+_LOOKUP_QUERIES = {
+    "universities": lambda key: select(University.name).where(University.university_id == key),
+    "departments": lambda key: select(Faculty.university_id)
+    .join(Department, Department.faculty_id == Faculty.faculty_id)
+    .where(Department.department_id == key),
+}
+
+
+def _lookup(kind: str, key: int | None):
+    if key is None:
+        return None
+    mapping = _reference_cache()[2][kind]
+    if key in mapping:
+        return mapping[key]
+    # Possibly created by another worker since our copy was built. Keys come from
+    # request input, so a miss costs one primary-key query, never a tree rebuild.
+    return db.session.execute(_LOOKUP_QUERIES[kind](key)).scalar_one_or_none()
+
+
+def department_university_id(department_id: int | None) -> int | None:
+    return _lookup("departments", department_id)
+
+
+def university_name(university_id: int) -> str | None:
+    return _lookup("universities", university_id)
+
+
+def university_subtree(university_id: int) -> tuple[dict | None, str]:
+    tree, etag = reference_tree()
+    university = next((uni for uni in tree if uni["university_id"] == university_id), None)
+    return university, f"{etag}-{university_id}"
+
+
+def mark_reference_data_changed() -> None:
+    """Flag the current session so the cache is dropped on commit.
+
+    Mapper events cover ORM adds; bulk ``insert()`` statements must call this.
+    """
+    db.session.info[_REFERENCE_CHANGED_KEY] = True
+
+
+def invalidate_reference_data() -> None:
+    global _cached, _generation
+    with _cache_lock:
+        _cached = None
+        _generation += 1
+
+
+@event.listens_for(University, "after_insert")
+@event.listens_for(University, "after_update")
+@event.listens_for(University, "after_delete")
+@event.listens_for(Faculty, "after_insert")
+@event.listens_for(Faculty, "after_update")
+@event.listens_for(Faculty, "after_delete")
+@event.listens_for(Department, "after_insert")
+@event.listens_for(Department, "after_update")
+@event.listens_for(Department, "after_delete")
+def _reference_row_changed(mapper, connection, target) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info[_REFERENCE_CHANGED_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _drop_reference_cache(session: Session) -> None:
+    if session.info.pop(_REFERENCE_CHANGED_KEY, False):
+        invalidate_reference_data()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_reference_change(session: Session) -> None:
+    session.info.pop(_REFERENCE_CHANGED_KEY, None)
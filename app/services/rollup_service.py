@@ -0,0 +1,124 @@
+from collections import defaultdict
+from datetime import datetime
+
+from sqlalchemy import case, delete, event, func, insert, literal, select
+from sqlalchemy.orm import Session
+
+from app.extensions import db
+from app.models.assessment import Assessment
+from app.models.course import Course
+from app.models.department import Department
+from app.models.enrollment import Enrollment
+from app.models.performance_rollup import PerformanceRollup
+
+_DIRTY_TERMS_KEY = "dirty_rollup_terms"
+
+ROLLUP_GRADE_COLUMNS = {
+    "A": "grade_a_count",
+    "B": "grade_b_count",
+    "C": "grade_c_count",
+    "D": "grade_d_count",
+    "E": "grade_e_count",
+    "F": "grade_f_count",
+}
+
+_ROLLUP_COLUMNS = [
+    "session",
+    "semester",
+    "course_id",
+    "department_id",
+    "faculty_id",
+    "record_count",
+    "score_sum",
+    "score_sq_sum",
+    "pass_count",
+    *ROLLUP_GRADE_COLUMNS.values(),
+    "refreshed_at",
+]
+
+
+def mark_rollups_dirty(terms) -> None:
+    """Queue (course_id, session, semester) groups for refresh when the session commits."""
+    db.session.info.setdefault(_DIRTY_TERMS_KEY, set()).update(terms)
+
+
+def _aggregate_select(session_name: str | None = None, semester: str | None = None, course_ids=None):
+    total = Assessment.total_score
+    group_columns = [Enrollment.session, Enrollment.semester, Course.course_id, Course.department_id, Department.faculty_id]
+    stmt = (
+        select(
+            *group_columns,
+            func.count(Assessment.assessment_id),
+            func.sum(total),
+            func.sum(total * total),
+            func.sum(case((total >= 50, 1), else_=0)),
+            *[func.sum(case((Assessment.grade == grade, 1), else_=0)) for grade in ROLLUP_GRADE_COLUMNS],
+            literal(datetime.utcnow(), db.DateTime),
+        )
+        .select_from(Assessment)
+        .join(Enrollment, Enrollment.enrollment_id == Assessment.enrollment_id)
+        .join(Course, Course.course_id == Enrollment.course_id)
+        .join(Department, Department.department_id == Course.department_id)
+        .group_by(*group_columns)
+    )
+    if session_name is not None:
+        stmt = stmt.where(Enrollment.session == session_name, Enrollment.semester == semester)
+    if course_ids is not None:
+        stmt = stmt.where(Course.course_id.in_(course_ids))
+    return stmt
+
+
+def _lock_courses(session: Session, course_ids=None) -> None:
+    # Two refreshes of the same course term would both delete and both
+    # re-insert, failing one commit on uq_rollup_course_term. Row-locking the
+    # courses in key order makes the second wait and then see the first's rows.
+    stmt = select(Course.course_id).order_by(Course.course_id.asc()).with_for_update()
+    if course_ids is not None:
+        stmt = stmt.where(Course.course_id.in_(course_ids))
+    session.execute(stmt).all()
+
+
+def refresh_rollups(terms, session: Session | None = None) -> int:
+    """Re-aggregate the given (course_id, session, semester) groups from the raw assessments."""
+    session = session or db.session
+    by_term = defaultdict(set)
+    for course_id, session_name, semester in terms:
+        by_term[(session_name, semester)].add(course_id)
+    _lock_courses(session, set().union(*by_term.values()))
+
+    for (session_name, semester), course_ids in by_term.items():
+        session.execute(
+            delete(PerformanceRollup).where(
+                PerformanceRollup.session == session_name,
+                PerformanceRollup.semester == semester,
+                PerformanceRollup.course_id.in_(course_ids),
+            )
+        )
+        session.execute(
+            insert(PerformanceRollup).from_select(
+                _ROLLUP_COLUMNS, _aggregate_select(session_name, semester, course_ids)
+            )
+        )
+    return sum(len(course_ids) for course_ids in by_term.values())
+
+
+def rebuild_rollups() -> int:
+    _lock_courses(db.session)
+    db.session.execute(delete(PerformanceRollup))
+    db.session.execute(insert(PerformanceRollup).from_select(_ROLLUP_COLUMNS, _aggregate_select()))
+    db.session.info.pop(_DIRTY_TERMS_KEY, None)
+    db.session.commit()
+    return db.session.query(func.count(PerformanceRollup.rollup_id)).scalar() or 0
+
+
+@event.listens_for(Session, "before_commit")
+def _refresh_dirty_rollups(session: Session) -> None:
+    terms = session.info.pop(_DIRTY_TERMS_KEY, None)
+    if terms:
+        session.flush()
+        refresh_rollups(terms, session)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_dirty_rollups(session: Session) -> None:
+    session.info.pop(_DIRTY_TERMS_KEY, None)
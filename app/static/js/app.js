@@ -86,6 +86,10 @@ function metricGrid(items) {
   return wrap;
 }
 
+function pageItems(res) {
+  return (res.data && res.data.items) || [];
+}
+
 function table(columns, rows) {
   const wrap = document.createElement("div");
   wrap.className = "table-wrap";
@@ -208,8 +212,8 @@ async function loadUniversityOptions() {
   const select = document.getElementById("universityId");
   select.innerHTML = `<option value="">Select university</option>`;
   try {
-    const res = await api("/api/auth/universities");
-    state.universities = res.data || [];
+    const res = await api("/api/auth/universities?limit=200");
+    state.universities = pageItems(res);
     state.universities.forEach((u) => {
       const option = document.createElement("option");
       option.value = String(u.university_id);
@@ -226,9 +230,9 @@ async function loadUniversityOptions() {
 
 async function renderAdminOverview() {
   clearContent();
-  const [statsRes, refRes] = await Promise.all([api("/api/admin/system-stats"), api("/api/admin/reference-data")]);
+  const [statsRes, refRes] = await Promise.all([api("/api/admin/system-stats"), api("/api/admin/reference-data?limit=200")]);
   const stats = statsRes.data;
-  const hierarchy = refRes.data || [];
+  const hierarchy = pageItems(refRes);
 
   const top = makeCard("Institution Summary");
   top.appendChild(
@@ -320,7 +324,7 @@ async function renderHodActions() {
         clearContent();
         const [analytics, lecturers, riskCourses] = await Promise.all([
           api("/api/hod/department-analytics"),
-          api("/api/hod/lecturers"),
+          api("/api/hod/lecturers?limit=200"),
           api("/api/hod/high-risk-courses"),
         ]);
 
@@ -330,7 +334,7 @@ async function renderHodActions() {
             { label: "Average Score", value: analytics.data.average_score },
             { label: "Pass Rate %", value: analytics.data.pass_rate },
             { label: "High-Risk Courses", value: (analytics.data.high_risk_courses || []).length },
-            { label: "Lecturers", value: (lecturers.data || []).length },
+            { label: "Lecturers", value: pageItems(lecturers).length },
           ])
         );
         contentGrid.appendChild(summary);
@@ -343,7 +347,7 @@ async function renderHodActions() {
               { key: "full_name", label: "Name" },
               { key: "email", label: "Email" },
             ],
-            lecturers.data || []
+            pageItems(lecturers)
           )
         );
         contentGrid.appendChild(lCard);
@@ -370,19 +374,38 @@ async function renderAdvisorActions() {
       label: "Advisory Dashboard",
       run: async () => {
         clearContent();
-        const [studentsRes, riskRes] = await Promise.all([api("/api/advisor/students"), api("/api/advisor/at-risk")]);
-        const students = studentsRes.data || [];
-        const risks = riskRes.data || [];
+        const [studentsRes, riskRes] = await Promise.all([
+          api("/api/advisor/students?limit=200"),
+          api("/api/advisor/at-risk?limit=200"),
+        ]);
+        const students = pageItems(studentsRes);
+        const risks = (riskRes.data && riskRes.data.items) || [];
+        const moreRisks = Boolean(riskRes.data && riskRes.data.next_cursor);
 
         const summary = makeCard("Advisor Summary");
         summary.appendChild(
           metricGrid([
             { label: "Assigned Students", value: students.length },
-            { label: "At-Risk", value: risks.length },
+            { label: "At-Risk", value: moreRisks ? `${risks.length}+` : risks.length },
           ])
         );
         contentGrid.appendChild(summary);
 
+        const riskCard = makeCard("At-Risk Advisees");
+        riskCard.appendChild(
+          table(
+            [
+              { key: "matric_no", label: "Matric No" },
+              { key: "full_name", label: "Name" },
+              { key: "high_risk_courses", label: "High" },
+              { key: "medium_risk_courses", label: "Medium" },
+              { key: "worst_course_code", label: "Worst Course" },
+            ],
+            risks.map((row) => ({ ...row, worst_course_code: row.worst_course.course_code }))
+          )
+        );
+        contentGrid.appendChild(riskCard);
+
         const studentsCard = makeCard("Assigned Students");
         studentsCard.appendChild(
           table(
@@ -400,6 +423,14 @@ async function renderAdvisorActions() {
   ]);
 }
 
+async function waitForImportJob(jobId) {
+  for (;;) {
+    const res = await api(`/api/lecturer/upload-jobs/${jobId}`);
+    if (res.data.state === "SUCCEEDED" || res.data.state === "FAILED") return res;
+    await new Promise((resolve) => setTimeout(resolve, 1500));
+  }
+}
+
 function renderUploadForm() {
   const card = makeCard("Upload Result CSV", "Format: matric_no, course_code, ca_score, exam_score");
   const form = document.createElement("form");
@@ -407,20 +438,38 @@ function renderUploadForm() {
   form.innerHTML = `
     <label>Session <input type="text" name="session" placeholder="2025/2026" required></label>
     <label>Semester <input type="text" name="semester" placeholder="FIRST" required></label>
+    <label>Import mode
+      <select name="mode">
+        <option value="bulk">Bulk</option>
+        <option value="stream">Streaming (large files)</option>
+        <option value="row">Row by row</option>
+      </select>
+    </label>
     <label>CSV file <input type="file" name="file" accept=".csv" required></label>
     <button type="submit">Upload</button>
   `;
   form.addEventListener("submit", async (e) => {
     e.preventDefault();
     const payload = new FormData(form);
-    const res = await api("/api/lecturer/upload-results", { method: "POST", body: payload });
+    let res = await api("/api/lecturer/upload-results", { method: "POST", body: payload });
     showToast(res.message || "Upload complete");
+    if (res.data.job_id) {
+      res = await waitForImportJob(res.data.job_id);
+      if (res.data.state === "FAILED") {
+        showToast(res.data.failure_reason || "Import failed", true);
+        return;
+      }
+      res.data.processed = res.data.rows_processed;
+      showToast("Import complete");
+    }
     const resultCard = makeCard("Upload Summary");
     resultCard.appendChild(
       metricGrid([
         { label: "Processed", value: res.data.processed },
         { label: "Enrollments Created", value: res.data.created_enrollments },
         { label: "Errors", value: (res.data.errors || []).length },
+        { label: "Chunks", value: (res.data.chunks || []).length || "-" },
+        { label: "Duration (s)", value: res.data.duration_seconds ?? "-" },
       ])
     );
     if ((res.data.errors || []).length) {
@@ -491,7 +540,7 @@ async function renderStudentActions() {
         clearContent();
         const [dashRes, coursesRes] = await Promise.all([
           api("/api/student/dashboard"),
-          api("/api/student/courses"),
+          api("/api/student/courses?limit=200"),
         ]);
         const d = dashRes.data;
 
@@ -529,7 +578,7 @@ async function renderStudentActions() {
               { key: "session", label: "Session" },
               { key: "semester", label: "Semester" },
             ],
-            coursesRes.data || []
+            pageItems(coursesRes)
           )
         );
         contentGrid.appendChild(coursesCard);
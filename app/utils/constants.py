@@ -26,7 +26,24 @@ GRADE_POINTS = {
     "F": 0.0,
 }
 
+# Lower GPA bound of each class of degree on the 5-point scale, best first.
+DEGREE_CLASSES = [
+    (4.5, "First Class"),
+    (3.5, "Second Class Upper"),
+    (2.4, "Second Class Lower"),
+    (1.5, "Third Class"),
+    (1.0, "Pass"),
+    (0.0, "Fail"),
+]
+
+PROBATION_GPA = 1.5
+
 RISK_LOW = "LOW"
 RISK_MEDIUM = "MEDIUM"
 RISK_HIGH = "HIGH"
 
+
+JOB_QUEUED = "QUEUED"
+JOB_RUNNING = "RUNNING"
+JOB_SUCCEEDED = "SUCCEEDED"
+JOB_FAILED = "FAILED"
@@ -1,5 +1,23 @@
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
 from app.utils.constants import GRADE_SCALE, RISK_HIGH, RISK_LOW, RISK_MEDIUM
 
+if TYPE_CHECKING:
+    import numpy as np
+
+# numpy is imported inside the array helpers below: every route imports this
+# module for success_response/error_response and most requests never grade.
+
+
+@lru_cache(maxsize=1)
+def _grade_table():
+    import numpy as np
+
+    boundaries = np.array([boundary for boundary, _ in reversed(GRADE_SCALE)], dtype=float)
+    labels = np.array([grade for _, grade in reversed(GRADE_SCALE)] + ["F"], dtype=object)
+    return boundaries, labels
+
 
 def compute_total(ca_score: float, exam_score: float) -> float:
     return round(float(ca_score) + float(exam_score), 2)
@@ -20,6 +38,40 @@ def compute_risk_level(total_score: float) -> str:
     return RISK_LOW
 
 
+def compute_totals(ca_scores, exam_scores) -> "np.ndarray":
+    import numpy as np
+
+    return np.round(np.asarray(ca_scores, dtype=float) + np.asarray(exam_scores, dtype=float), 2)
+
+
+def compute_grades(total_scores) -> "np.ndarray":
+    import numpy as np
+
+    boundaries, labels = _grade_table()
+    totals = np.asarray(total_scores, dtype=float)
+    positions = np.searchsorted(boundaries, totals, side="right") - 1
+    # Below the lowest boundary, or NaN, falls back to "F" like compute_grade.
+    positions[(positions < 0) | np.isnan(totals)] = -1
+    return labels[positions]
+
+
+def compute_risk_levels(total_scores) -> "np.ndarray":
+    import numpy as np
+
+    totals = np.asarray(total_scores, dtype=float)
+    return np.select(
+        [totals < 40, (totals >= 40) & (totals <= 49)],
+        [RISK_HIGH, RISK_MEDIUM],
+        default=RISK_LOW,
+    ).astype(object)
+
+
+def compute_score_columns(ca_scores, exam_scores) -> tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+    """Array form of compute_total/compute_grade/compute_risk_level over whole score columns."""
+    totals = compute_totals(ca_scores, exam_scores)
+    return totals, compute_grades(totals), compute_risk_levels(totals)
+
+
 def success_response(message: str, data=None, status: int = 200):
     payload = {"message": message}
     if data is not None:
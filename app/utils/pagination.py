@@ -0,0 +1,179 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+
+from flask import current_app
+from sqlalchemy import and_, or_
+
+
+class Filter:
+    """A whitelisted query-string filter: exact match, or case-insensitive substring with ``contains``."""
+
+    def __init__(self, column, cast=str, contains: bool = False):
+        self.column = column
+        self.cast = cast
+        self.contains = contains
+
+    def clause(self, value):
+        if self.contains:
+            return self.column.ilike(f"%{value}%")
+        return self.column == value
+
+
+class ListSpec:
+    """What a list endpoint allows: its key column, sortable columns and filters.
+
+    Sort columns must be non-nullable so the (sort value, key) cursor is total.
+    """
+
+    def __init__(self, key, sorts: dict | None = None, filters: dict | None = None, default_sort: str | None = None):
+        self.key = key
+        self.sorts = {key.key: key, **(sorts or {})}
+        self.filters = filters or {}
+        self.default_sort = default_sort or key.key
+
+
+class PageRequest:
+    def __init__(self, limit: int, cursor: list | None, sort: str, descending: bool, filters: dict):
+        self.limit = limit
+        self.cursor = cursor
+        self.sort = sort
+        self.descending = descending
+        self.filters = filters
+
+
+def page_limit(args) -> int:
+    """``limit`` from the query string, defaulted and capped by config."""
+    default = current_app.config.get("PAGINATION_DEFAULT_LIMIT", 50)
+    maximum = current_app.config.get("PAGINATION_MAX_LIMIT", 200)
+    try:
+        limit = int(args.get("limit", default))
+    except (TypeError, ValueError):
+        raise ValueError("limit must be an integer") from None
+    return min(max(limit, 1), maximum)
+
+
+def encode_cursor(values: list) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values, default=str).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("cursor is not valid") from None
+    if not isinstance(values, list) or len(values) != 2:
+        raise ValueError("cursor is not valid")
+    return values
+
+
+def _cursor_value(column, value):
+    """Coerce one decoded cursor value to ``column``'s Python type, or raise ``ValueError``."""
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        python_type = None
+    if isinstance(value, bool) or value is None or isinstance(value, (list, dict)):
+        raise ValueError("cursor is not valid")
+    if python_type is int and isinstance(value, int):
+        return value
+    if python_type is float and isinstance(value, (int, float)):
+        return float(value)
+    if python_type is str and isinstance(value, str):
+        return value
+    if python_type in (datetime, date) and isinstance(value, str):
+        try:
+            return python_type.fromisoformat(value)
+        except ValueError:
+            raise ValueError("cursor is not valid") from None
+    if python_type is None:
+        return value
+    raise ValueError("cursor is not valid")
+
+
+def parse_page_request(spec: ListSpec, args) -> PageRequest:
+    """Validate limit, cursor, sort and filters against the spec; raises ``ValueError``."""
+    sort = (args.get("sort") or spec.default_sort).strip()
+    descending = sort.startswith("-")
+    sort = sort.lstrip("-")
+    if sort not in spec.sorts:
+        raise ValueError(f"sort must be one of: {', '.join(sorted(spec.sorts))}")
+
+    filters = {}
+    for name, spec_filter in spec.filters.items():
+        raw = (args.get(name) or "").strip()
+        if not raw:
+            continue
+        try:
+            filters[name] = spec_filter.cast(raw)
+        except (TypeError, ValueError):
+            raise ValueError(f"{name} is not valid") from None
+
+    cursor = None
+    if args.get("cursor"):
+        sort_value, key_value = decode_cursor(args["cursor"])
+        cursor = [_cursor_value(spec.sorts[sort], sort_value), _cursor_value(spec.key, key_value)]
+    return PageRequest(page_limit(args), cursor, sort, descending, filters)
+
+
+def _item_cursor(item, sort: str, key: str) -> str:
+    get = item.get if isinstance(item, dict) else lambda name: getattr(item, name)
+    return encode_cursor([get(sort), get(key)])
+
+
+def paginate(query, spec: ListSpec, page: PageRequest, serialize) -> dict:
+    """Apply filters, keyset position and order to ``query``; return one serialized page.
+
+    The cursor is the (sort value, key) pair of the last item, so each page is
+    a bounded index range scan however deep the client pages.
+    """
+    for name, value in page.filters.items():
+        query = query.filter(spec.filters[name].clause(value))
+
+    sort_column = spec.sorts[page.sort]
+    key_column = spec.key
+    if page.cursor is not None:
+        sort_value, key_value = page.cursor
+        if page.descending:
+            query = query.filter(
+                or_(sort_column < sort_value, and_(sort_column == sort_value, key_column < key_value))
+            )
+        else:
+            query = query.filter(
+                or_(sort_column > sort_value, and_(sort_column == sort_value, key_column > key_value))
+            )
+
+    if page.descending:
+        query = query.order_by(sort_column.desc(), key_column.desc())
+    else:
+        query = query.order_by(sort_column.asc(), key_column.asc())
+    rows = query.limit(page.limit + 1).all()
+
+    has_more = len(rows) > page.limit
+    rows = rows[: page.limit]
+    next_cursor = _item_cursor(rows[-1], sort_column.key, key_column.key) if has_more else None
+    return {"items": [serialize(row) for row in rows], "next_cursor": next_cursor}
+
+
+def paginate_items(items: list[dict], spec: ListSpec, page: PageRequest) -> dict:
+    """``paginate`` for an in-memory list of dicts keyed like the spec's columns."""
+    sort, key = spec.sorts[page.sort].key, spec.key.key
+    for name, value in page.filters.items():
+        field = spec.filters[name].column.key
+        if spec.filters[name].contains:
+            items = [item for item in items if str(value).lower() in str(item[field]).lower()]
+        else:
+            items = [item for item in items if item[field] == value]
+
+    items = sorted(items, key=lambda item: (item[sort], item[key]), reverse=page.descending)
+    if page.cursor is not None:
+        position = tuple(page.cursor)
+        if page.descending:
+            items = [item for item in items if (item[sort], item[key]) < position]
+        else:
+            items = [item for item in items if (item[sort], item[key]) > position]
+
+    has_more = len(items) > page.limit
+    items = items[: page.limit]
+    return {"items": items, "next_cursor": _item_cursor(items[-1], sort, key) if has_more else None}
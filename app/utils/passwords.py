@@ -0,0 +1,84 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app, has_app_context
+from werkzeug.security import check_password_hash as check_pbkdf2_hash
+from werkzeug.security import generate_password_hash as generate_pbkdf2_hash
+
+from app.extensions import bcrypt
+
+BCRYPT = "bcrypt"
+PBKDF2_SHA256 = "pbkdf2_sha256"
+
+# Cost used when PASSWORD_HASH_COST is 0: bcrypt log rounds, PBKDF2 iterations.
+DEFAULT_COSTS = {BCRYPT: 12, PBKDF2_SHA256: 600_000}
+
+_pool: ThreadPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def hashing_policy() -> tuple[str, int]:
+    """The configured (algorithm, cost) pair new hashes are created with."""
+    algorithm, cost = BCRYPT, 0
+    if has_app_context():
+        algorithm = current_app.config.get("PASSWORD_HASH_ALGORITHM", BCRYPT)
+        cost = current_app.config.get("PASSWORD_HASH_COST", 0)
+    if algorithm not in DEFAULT_COSTS:
+        raise ValueError(f"Unsupported password hash algorithm: {algorithm}")
+    return algorithm, cost or DEFAULT_COSTS[algorithm]
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            workers = current_app.config.get("PASSWORD_HASH_WORKERS", 4) if has_app_context() else 4
+            _pool = ThreadPoolExecutor(max_workers=max(int(workers), 1), thread_name_prefix="password-hash")
+        return _pool
+
+
+def _hash(password: str, algorithm: str, cost: int) -> str:
+    if algorithm == BCRYPT:
+        return bcrypt.generate_password_hash(password, rounds=cost).decode("utf-8")
+    return generate_pbkdf2_hash(password, method=f"pbkdf2:sha256:{cost}")
+
+
+def _verify(password: str, password_hash: str) -> bool:
+    if password_hash.startswith("pbkdf2:"):
+        return check_pbkdf2_hash(password_hash, password)
+    return bcrypt.check_password_hash(password_hash, password)
+
+
+def hash_password(password: str) -> str:
+    """Hash under the current policy on the shared pool, which bounds concurrent hashing."""
+    if not password:
+        raise ValueError("Password must be non-empty.")
+    return _get_pool().submit(_hash, password, *hashing_policy()).result()
+
+
+def hash_passwords(passwords: list[str]) -> list[str]:
+    """Hash many passwords in parallel; bcrypt and hashlib release the GIL while hashing."""
+    if not all(passwords):
+        raise ValueError("Password must be non-empty.")
+    algorithm, cost = hashing_policy()
+    pool = _get_pool()
+    return list(pool.map(_hash, passwords, [algorithm] * len(passwords), [cost] * len(passwords)))
+
+
+def verify_password(password: str, password_hash: str) -> bool:
+    if not password or not password_hash:
+        return False
+    return _get_pool().submit(_verify, password, password_hash).result()
+
+
+def needs_rehash(password_hash: str) -> bool:
+    """True when a stored hash was made with another algorithm or cost than the policy."""
+    algorithm, cost = hashing_policy()
+    try:
+        if password_hash.startswith("pbkdf2:sha256:"):
+            return algorithm != PBKDF2_SHA256 or int(password_hash.split("$", 1)[0].split(":")[2]) != cost
+        if password_hash.startswith("$2"):
+            return algorithm != BCRYPT or int(password_hash.split("$")[2]) != cost
+    except (IndexError, ValueError):
+        pass
+    return True
@@ -0,0 +1,55 @@
+from flask import g
+from flask_jwt_extended import get_jwt, get_jwt_identity
+
+from app.extensions import db
+
+
+class Principal:
+    """The caller as described by the JWT; nothing is read from the database until ``load()``."""
+
+    __slots__ = ("user_type", "user_id", "role", "department_id", "university_id", "_entity", "_loaded")
+
+    def __init__(self, user_type: str, user_id: int, role: str, department_id: int | None, university_id: int | None):
+        self.user_type = user_type
+        self.user_id = user_id
+        self.role = role
+        self.department_id = department_id
+        self.university_id = university_id
+        self._entity = None
+        self._loaded = False
+
+    @property
+    def is_student(self) -> bool:
+        return self.user_type == "student"
+
+    @property
+    def is_staff(self) -> bool:
+        return self.user_type == "staff"
+
+    def load(self):
+        """The Staff or Student row for this principal, fetched once per request."""
+        if not self._loaded:
+            from app.models.staff import Staff
+            from app.models.student import Student
+
+            model = Student if self.is_student else Staff
+            self._entity = db.session.get(model, self.user_id)
+            self._loaded = True
+        return self._entity
+
+
+def current_principal() -> Principal:
+    """Request-scoped principal built from the verified JWT identity and claims."""
+    principal = g.get("_principal")
+    if principal is None:
+        user_type, user_id = get_jwt_identity().split(":")
+        claims = get_jwt()
+        principal = Principal(
+            user_type=user_type,
+            user_id=int(user_id),
+            role=claims.get("role"),
+            department_id=claims.get("department_id"),
+            university_id=claims.get("university_id"),
+        )
+        g._principal = principal
+    return principal
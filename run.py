@@ -7,6 +7,7 @@ from app.models import (
     Department,
     Enrollment,
     Faculty,
+    ImportJob,
     Staff,
     Student,
     University,
@@ -28,6 +29,7 @@ def shell_context():
         "Enrollment": Enrollment,
         "Assessment": Assessment,
         "AnalyticsResult": AnalyticsResult,
+        "ImportJob": ImportJob,
     }
 
 
@@ -0,0 +1,61 @@
+import pytest
+
+from app import create_app
+from app.extensions import db
+from app.services.bootstrap_service import run_bootstrap
+from app.services.reference_data_service import invalidate_reference_data
+
+TEST_CONFIG = {
+    "SQLALCHEMY_DATABASE_URI": "sqlite://",
+    "AUTO_BOOTSTRAP": False,
+    "IMPORT_JOB_RECOVERY": False,
+    "METRICS_ENABLED": False,
+    "JWT_SECRET_KEY": "test-jwt-secret-long-enough-for-hs256",
+    # bcrypt's minimum; the demo accounts are hashed on every bootstrap.
+    "PASSWORD_HASH_COST": 4,
+}
+
+
+def make_app(**overrides):
+    """An app on a private in-memory SQLite database with every table created."""
+    app = create_app("testing", config_overrides={**TEST_CONFIG, **overrides})
+    with app.app_context():
+        db.create_all()
+    # The reference cache is per process, not per app; never let one test's tree leak into the next.
+    invalidate_reference_data()
+    return app
+
+
+@pytest.fixture
+def app():
+    app = make_app()
+    with app.app_context():
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def demo_app(app):
+    """``app`` with the bootstrap demo institution (one department, one course, five students)."""
+    run_bootstrap()
+    return app
+
+
+@pytest.fixture
+def client(demo_app):
+    return demo_app.test_client()
+
+
+@pytest.fixture
+def login(client):
+    """Log a demo account in and return its Authorization header."""
+
+    def log_in(identifier: str, password: str) -> dict:
+        response = client.post(
+            "/api/auth/login", json={"identifier": identifier, "password": password, "university_id": 1}
+        )
+        assert response.status_code == 200, response.get_json()
+        return {"Authorization": f"Bearer {response.get_json()['data']['access_token']}"}
+
+    return log_in
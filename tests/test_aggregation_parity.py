@@ -0,0 +1,99 @@
+import pytest
+
+from app.extensions import db
+from app.models.course import Course
+from app.models.department import Department
+from app.models.enrollment import Enrollment
+from app.models.student import Student
+from app.services.aggregation_service import department_analytics_snapshot, grade_distribution
+from app.services.analytics_service import bulk_store_analytics
+
+# (ca_score, exam_score) per demo student; None leaves the enrollment ungraded.
+CSC401_FIRST = [(25, 50), (20, 41.5), (18, 30), (12, 25.25), None]
+CSC401_SECOND = [(28, 60), (10, 22), None, (30, 39), (15, 35)]
+CSC402_FIRST = [(10, 20), (15, 28), (5, 30.5), None, (20, 35)]
+
+
+def _enroll(course: Course, session: str, semester: str, scores: list) -> None:
+    students = Student.query.order_by(Student.student_id).all()
+    graded = {}
+    for student, score in zip(students, scores):
+        enrollment = Enrollment.query.filter_by(
+            student_id=student.student_id, course_id=course.course_id, session=session, semester=semester
+        ).first()
+        if enrollment is None:
+            enrollment = Enrollment(
+                student_id=student.student_id, course_id=course.course_id, session=session, semester=semester
+            )
+            db.session.add(enrollment)
+            db.session.flush()
+        if score is not None:
+            graded[enrollment.enrollment_id] = score
+    bulk_store_analytics(graded)
+
+
+@pytest.fixture
+def departments(demo_app):
+    """The demo department with two terms of mixed grades, and a department with only ungraded enrollments."""
+    computer_science = Department.query.filter_by(name="Computer Science").one()
+    csc401 = Course.query.filter_by(course_code="CSC401").one()
+    csc402 = Course(
+        course_code="CSC402",
+        course_title="Failing Topics",
+        credit_units=2,
+        semester="FIRST",
+        department_id=computer_science.department_id,
+        lecturer_id=csc401.lecturer_id,
+    )
+    history = Department(name="History", faculty_id=computer_science.faculty_id)
+    db.session.add_all([csc402, history])
+    db.session.flush()
+    his101 = Course(
+        course_code="HIS101",
+        course_title="Ungraded",
+        credit_units=3,
+        semester="FIRST",
+        department_id=history.department_id,
+    )
+    db.session.add(his101)
+    db.session.flush()
+
+    _enroll(csc401, "2025/2026", "FIRST", CSC401_FIRST)
+    _enroll(csc401, "2024/2025", "SECOND", CSC401_SECOND)
+    _enroll(csc402, "2025/2026", "FIRST", CSC402_FIRST)
+    _enroll(his101, "2025/2026", "FIRST", [None] * 5)
+    db.session.commit()
+    return {"graded": computer_science.department_id, "empty": history.department_id}
+
+
+@pytest.mark.parametrize("which", ["graded", "empty"])
+def test_snapshot_sql_matches_dataframe(departments, which):
+    department_id = departments[which]
+
+    sql = department_analytics_snapshot(department_id)
+    dataframe = department_analytics_snapshot(department_id, use_dataframe=True)
+
+    assert sql == dataframe
+
+
+def test_snapshot_for_graded_department(departments):
+    snapshot = department_analytics_snapshot(departments["graded"])
+
+    assert sum(snapshot["grade_distribution"].values()) == 12
+    assert snapshot["high_risk_courses"] == ["CSC402"]
+
+
+def test_snapshot_for_department_without_assessments(departments):
+    assert department_analytics_snapshot(departments["empty"]) == {
+        "average_score": 0.0,
+        "pass_rate": 0.0,
+        "grade_distribution": {},
+        "high_risk_courses": [],
+    }
+
+
+@pytest.mark.parametrize("which", ["graded", "empty", None])
+def test_grade_distribution_sql_matches_dataframe(departments, which):
+    department_id = departments[which] if which else None
+
+    assert grade_distribution(department_id) == grade_distribution(department_id, use_dataframe=True)
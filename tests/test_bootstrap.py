@@ -0,0 +1,29 @@
+from sqlalchemy import text
+
+from app.extensions import db
+from app.models.bootstrap_state import BootstrapState
+from app.services.bootstrap_service import ensure_bootstrapped, run_bootstrap, schema_fingerprint
+
+
+def _index_names(table: str) -> set[str]:
+    return {index["name"] for index in db.inspect(db.engine).get_indexes(table)}
+
+
+def test_bootstrap_creates_indexes_missing_from_existing_tables(app):
+    run_bootstrap()
+    index = next(index for index in db.metadata.tables["enrollments"].indexes if index.name)
+    db.session.execute(text(f"DROP INDEX {index.name}"))
+    db.session.execute(db.delete(BootstrapState))
+    db.session.commit()
+    assert index.name not in _index_names("enrollments")
+
+    assert ensure_bootstrapped(app) == "bootstrapped"
+
+    assert index.name in _index_names("enrollments")
+    assert ensure_bootstrapped(app) == "current"
+
+
+def test_run_bootstrap_reports_created_indexes(app):
+    result = run_bootstrap()
+    assert result["created_indexes"] == []
+    assert db.session.get(BootstrapState, "startup").fingerprint == schema_fingerprint()
@@ -0,0 +1,141 @@
+import io
+
+import pytest
+
+from app.extensions import db
+from app.models.assessment import Assessment
+from app.models.course import Course
+from app.models.enrollment import Enrollment
+from app.models.staff import Staff
+from app.models.student import Student
+from app.services.aggregation_service import department_average
+from app.services.csv_import_service import (
+    IMPORT_MODE_BULK,
+    IMPORT_MODE_ROW,
+    IMPORT_MODE_STREAM,
+    process_result_csv,
+)
+from app.utils.constants import LECTURER
+
+SESSION, SEMESTER = "2025/2026", "FIRST"
+
+UPLOAD = """matric_no,course_code,ca_score,exam_score
+CSC/2022/101,CSC401,25,50
+CSC/2022/102,csc401,20,30
+CSC/2022/999,CSC401,10,10
+CSC/2022/103,NOPE100,10,10
+CSC/2022/104,OTH101,10,10
+CSC/2022/105,CSC402,abc,10
+CSC/2022/101,CSC402,15,40
+CSC/2022/101,CSC401,28,60
+"""
+
+EXPECTED_TOTALS = {
+    ("CSC/2022/101", "CSC401"): 88.0,
+    ("CSC/2022/102", "CSC401"): 50.0,
+    ("CSC/2022/101", "CSC402"): 55.0,
+}
+EXPECTED_ERROR_ROWS = [3, 4, 5, 6]
+
+
+@pytest.fixture
+def lecturer_id(demo_app):
+    """The demo lecturer, who also teaches CSC402; OTH101 belongs to someone else."""
+    lecturer = Staff.query.filter_by(email="lecturer@university.edu").one()
+    csc401 = Course.query.filter_by(course_code="CSC401").one()
+    other = Staff(full_name="Other Lecturer", email="other@university.edu", role=LECTURER)
+    other.set_password("other12345")
+    db.session.add(other)
+    db.session.flush()
+    for code, owner in (("CSC402", lecturer.staff_id), ("OTH101", other.staff_id)):
+        db.session.add(
+            Course(
+                course_code=code,
+                course_title=code,
+                credit_units=2,
+                semester=SEMESTER,
+                department_id=csc401.department_id,
+                lecturer_id=owner,
+            )
+        )
+    db.session.commit()
+    return lecturer.staff_id
+
+
+def upload(lecturer_id: int, content: str, mode: str, **options) -> dict:
+    return process_result_csv(io.BytesIO(content.encode("utf-8")), lecturer_id, SESSION, SEMESTER, mode=mode, **options)
+
+
+def assessment_totals() -> dict:
+    rows = (
+        db.session.query(Student.matric_no, Course.course_code, Assessment.total_score)
+        .join(Enrollment, Enrollment.student_id == Student.student_id)
+        .join(Course, Course.course_id == Enrollment.course_id)
+        .join(Assessment, Assessment.enrollment_id == Enrollment.enrollment_id)
+        .all()
+    )
+    return {(matric_no, code): total for matric_no, code, total in rows}
+
+
+@pytest.mark.parametrize("mode", [IMPORT_MODE_ROW, IMPORT_MODE_BULK])
+def test_modes_store_the_same_results(lecturer_id, mode):
+    summary = upload(lecturer_id, UPLOAD, mode)
+
+    assert summary["processed"] == 4
+    assert summary["created_enrollments"] == 1
+    assert [error["row"] for error in summary["errors"]] == EXPECTED_ERROR_ROWS
+    assert assessment_totals() == EXPECTED_TOTALS
+
+
+def test_row_and_bulk_report_the_same_errors(lecturer_id):
+    bulk = upload(lecturer_id, UPLOAD, IMPORT_MODE_BULK)["errors"]
+    row = upload(lecturer_id, UPLOAD, IMPORT_MODE_ROW)["errors"]
+
+    assert bulk == row
+
+
+def test_bulk_reupload_updates_in_place(lecturer_id):
+    upload(lecturer_id, UPLOAD, IMPORT_MODE_BULK)
+    department_id = Course.query.filter_by(course_code="CSC401").one().department_id
+    enrollments = Enrollment.query.count()
+    assessments = Assessment.query.count()
+
+    rescored = "matric_no,course_code,ca_score,exam_score\nCSC/2022/102,CSC401,10,25\n"
+    summary = upload(lecturer_id, rescored, IMPORT_MODE_BULK)
+
+    assert summary == {"processed": 1, "created_enrollments": 0, "errors": []}
+    assert Enrollment.query.count() == enrollments
+    assert Assessment.query.count() == assessments
+    assert assessment_totals()[("CSC/2022/102", "CSC401")] == 35.0
+    # The rollups behind the department KPIs follow the update.
+    assert department_average(department_id) == round((88.0 + 35.0 + 55.0) / 3, 2)
+
+
+def test_stream_commits_chunk_by_chunk(lecturer_id):
+    progress = []
+
+    summary = upload(
+        lecturer_id,
+        UPLOAD,
+        IMPORT_MODE_STREAM,
+        chunk_size=3,
+        on_chunk=lambda running: progress.append(running["processed"]),
+    )
+
+    assert [(chunk["rows"], chunk["errors"]) for chunk in summary["chunks"]] == [(3, 1), (3, 3), (2, 0)]
+    assert progress == [chunk["processed_total"] for chunk in summary["chunks"]] == [2, 2, 4]
+    assert [error["row"] for error in summary["errors"]] == EXPECTED_ERROR_ROWS
+    # The repeated row lands in a later chunk and wins, as in the other modes.
+    assert assessment_totals() == EXPECTED_TOTALS
+
+
+def test_stream_keeps_committed_chunks_when_a_later_chunk_fails(lecturer_id):
+    def worker_dies(running):
+        raise RuntimeError("worker stopped")
+
+    with pytest.raises(RuntimeError):
+        upload(lecturer_id, UPLOAD, IMPORT_MODE_STREAM, chunk_size=4, on_chunk=worker_dies)
+    db.session.rollback()
+
+    # Only the first chunk was committed before the failure.
+    assert assessment_totals() == {("CSC/2022/101", "CSC401"): 75.0, ("CSC/2022/102", "CSC401"): 50.0}
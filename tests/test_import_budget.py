@@ -0,0 +1,37 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from app.config import BaseConfig
+from app.services.import_time_service import DEFERRED_MODULES, check_import_budget
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_LOADED_SNIPPET = (
+    "import json, sys; from app import create_app; create_app(); "
+    f"print(json.dumps(sorted(m for m in {list(DEFERRED_MODULES)!r} if m in sys.modules)))"
+)
+
+
+@pytest.fixture
+def startup_env(monkeypatch):
+    """Child interpreters boot against an in-memory database with nothing to recover."""
+    monkeypatch.setenv("DATABASE_URL", "sqlite://")
+    monkeypatch.setenv("AUTO_BOOTSTRAP", "false")
+    monkeypatch.setenv("IMPORT_JOB_RECOVERY", "false")
+
+
+def test_create_app_leaves_deferred_modules_unloaded(startup_env):
+    completed = subprocess.run(
+        [sys.executable, "-c", _LOADED_SNIPPET], capture_output=True, text=True, cwd=PROJECT_ROOT, check=True
+    )
+
+    assert json.loads(completed.stdout.strip().splitlines()[-1]) == []
+
+
+def test_startup_imports_fit_the_budget(startup_env):
+    result = check_import_budget(BaseConfig.IMPORT_TIME_BUDGET_MS)
+
+    assert result["violations"] == []
@@ -0,0 +1,78 @@
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.extensions import db
+from app.models.import_job import ImportJob
+from app.models.staff import Staff
+from app.services.job_service import _worker_id, recover_interrupted_jobs
+from app.utils.constants import JOB_FAILED, JOB_QUEUED, JOB_RUNNING
+
+
+@pytest.fixture
+def recovery_app(demo_app, tmp_path):
+    demo_app.config["IMPORT_JOB_SPOOL_DIR"] = str(tmp_path)
+    demo_app.config["IMPORT_JOB_STALE_SECONDS"] = 600
+    return demo_app
+
+
+def _job(worker_id: str | None, state: str = JOB_RUNNING, heartbeat_age: float | None = 0) -> str:
+    lecturer = Staff.query.filter_by(email="lecturer@university.edu").one()
+    now = datetime.utcnow()
+    job = ImportJob(
+        job_id=uuid.uuid4().hex,
+        lecturer_id=lecturer.staff_id,
+        session="2025/2026",
+        semester="FIRST",
+        mode="bulk",
+        state=state,
+        worker_id=worker_id,
+        created_at=now - timedelta(hours=2),
+        heartbeat_at=None if heartbeat_age is None else now - timedelta(seconds=heartbeat_age),
+    )
+    db.session.add(job)
+    db.session.commit()
+    return job.job_id
+
+
+def _state(job_id: str) -> str:
+    db.session.expire_all()
+    return db.session.get(ImportJob, job_id).state
+
+
+def test_jobs_of_live_local_worker_are_kept(recovery_app):
+    job_id = _job(_worker_id(), heartbeat_age=86400)
+
+    assert recover_interrupted_jobs(recovery_app)["interrupted"] == []
+    assert _state(job_id) == JOB_RUNNING
+
+
+def test_jobs_of_dead_local_worker_are_failed(recovery_app):
+    # A PID start time no live process can have.
+    job_id = _job(f"{socket.gethostname()}:{os.getpid()}:0", state=JOB_QUEUED)
+
+    assert recover_interrupted_jobs(recovery_app)["interrupted"] == [job_id]
+    assert _state(job_id) == JOB_FAILED
+
+
+def test_foreign_host_jobs_expire_on_stale_heartbeat(recovery_app):
+    fresh = _job("other-host:1:1", heartbeat_age=60)
+    stale = _job("other-host:2:1", heartbeat_age=3600)
+    never_beat = _job("other-host:3:1", state=JOB_QUEUED, heartbeat_age=None)
+
+    assert sorted(recover_interrupted_jobs(recovery_app)["interrupted"]) == sorted([stale, never_beat])
+    assert _state(fresh) == JOB_RUNNING
+    assert _state(stale) == JOB_FAILED
+
+
+def test_spool_files_of_interrupted_jobs_are_removed(recovery_app, tmp_path):
+    kept = _job("other-host:1:1", heartbeat_age=60)
+    dropped = _job("other-host:2:1", heartbeat_age=3600)
+    for job_id in (kept, dropped):
+        (tmp_path / f"{job_id}.csv").write_text("matric_no,course_code,ca_score,exam_score\n")
+
+    assert recover_interrupted_jobs(recovery_app)["swept_files"] == 1
+    assert sorted(path.name for path in tmp_path.iterdir()) == [f"{kept}.csv"]
@@ -0,0 +1,132 @@
+import pytest
+
+from app.extensions import db
+from app.models.staff import Staff
+from app.models.student import Student
+from app.routes.advisor_routes import ADVISEE_LIST
+from app.services.gpa_service import GPA_RANKING_LIST
+from app.utils.pagination import encode_cursor, paginate, paginate_items, parse_page_request
+
+# Ties on every sort column, so paging has to fall back to the key to stay total.
+NAMES = ["Ada", "Bola", "Ada", "Chidi", "Bola", "Ada", "Dayo"]
+
+
+@pytest.fixture
+def advisees(demo_app):
+    """Seven more advisees of the demo advisor, on top of the five bootstrap students."""
+    advisor = Staff.query.filter_by(email="advisor@university.edu").one()
+    template = Student.query.first()
+    for n, name in enumerate(NAMES):
+        student = Student(
+            matric_no=f"CSC/2023/{n:03d}",
+            full_name=name,
+            gender="F",
+            level=100 * (1 + n % 3),
+            department_id=template.department_id,
+            advisor_id=advisor.staff_id,
+        )
+        student.password_hash = template.password_hash
+        db.session.add(student)
+    db.session.commit()
+    return advisor.staff_id
+
+
+def _row(student: Student) -> dict:
+    return {
+        "student_id": student.student_id,
+        "matric_no": student.matric_no,
+        "full_name": student.full_name,
+        "level": student.level,
+    }
+
+
+def _walk(fetch, args: dict) -> list:
+    seen, cursor = [], None
+    for _ in range(50):
+        page = fetch(parse_page_request(ADVISEE_LIST, {**args, **({"cursor": cursor} if cursor else {})}))
+        seen += [item["student_id"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return seen
+    raise AssertionError("pagination did not terminate")
+
+
+@pytest.mark.parametrize("sort", ["full_name", "-full_name", "level", "-level", "matric_no", "student_id"])
+def test_keyset_walk_visits_every_row_once_in_order(advisees, sort):
+    students = [_row(s) for s in Student.query.filter_by(advisor_id=advisees).all()]
+    column = sort.lstrip("-")
+    expected = [
+        s["student_id"]
+        for s in sorted(students, key=lambda s: (s[column], s["student_id"]), reverse=sort.startswith("-"))
+    ]
+
+    query = Student.query.filter_by(advisor_id=advisees)
+    walked = _walk(lambda page: paginate(query, ADVISEE_LIST, page, _row), {"sort": sort, "limit": "2"})
+
+    assert walked == expected
+    # The in-memory variant pages identically.
+    assert _walk(lambda page: paginate_items(students, ADVISEE_LIST, page), {"sort": sort, "limit": "2"}) == expected
+
+
+def test_filters_apply_before_paging(advisees):
+    query = Student.query.filter_by(advisor_id=advisees)
+    walked = _walk(lambda page: paginate(query, ADVISEE_LIST, page, _row), {"q": "ada", "limit": "1"})
+
+    assert len(walked) == NAMES.count("Ada")
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not base64 json!",
+        encode_cursor(["Ada"]),
+        encode_cursor(["Ada", "7"]),
+        encode_cursor(["Ada", True]),
+        encode_cursor([None, 7]),
+        encode_cursor([["Ada"], 7]),
+        encode_cursor([3, 7]),
+    ],
+)
+def test_malformed_cursors_are_rejected(demo_app, cursor):
+    with pytest.raises(ValueError, match="cursor is not valid"):
+        parse_page_request(ADVISEE_LIST, {"sort": "full_name", "cursor": cursor})
+
+
+def test_cursor_values_are_coerced_to_column_types(demo_app):
+    page = parse_page_request(GPA_RANKING_LIST, {"cursor": encode_cursor([3, 7])})
+
+    assert page.descending and page.sort == "gpa"
+    assert page.cursor == [3.0, 7] and isinstance(page.cursor[0], float)
+
+
+@pytest.mark.parametrize("args", [{"sort": "password_hash"}, {"limit": "ten"}, {"level": "high"}])
+def test_invalid_arguments_are_rejected(demo_app, args):
+    with pytest.raises(ValueError):
+        parse_page_request(ADVISEE_LIST, args)
+
+
+def test_limit_is_capped(demo_app):
+    demo_app.config["PAGINATION_MAX_LIMIT"] = 5
+
+    assert parse_page_request(ADVISEE_LIST, {"limit": "500"}).limit == 5
+    assert parse_page_request(ADVISEE_LIST, {"limit": "0"}).limit == 1
+
+
+def test_endpoint_pages_with_cursor_and_rejects_bad_ones(advisees, client, login):
+    headers = login("advisor@university.edu", "advisor123")
+    seen, cursor = [], None
+    while True:
+        url = "/api/advisor/students?sort=full_name&limit=5" + (f"&cursor={cursor}" if cursor else "")
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200
+        data = response.get_json()["data"]
+        seen += [item["student_id"] for item in data["items"]]
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+
+    assert sorted(seen) == sorted(s.student_id for s in Student.query.filter_by(advisor_id=advisees))
+    assert len(seen) == len(set(seen)) == 12
+
+    bad = encode_cursor(["Ada", "not-an-id"])
+    assert client.get(f"/api/advisor/students?sort=full_name&cursor={bad}", headers=headers).status_code == 400
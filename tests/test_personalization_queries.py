@@ -0,0 +1,89 @@
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from app.extensions import db
+from app.models.course import Course
+from app.models.enrollment import Enrollment
+from app.models.student import Student
+from app.services.analytics_service import bulk_store_analytics
+from app.services.personalization_service import (
+    build_personalized_learning_payload,
+    build_personalized_learning_payloads,
+)
+
+# The joined enrollment/course/assessment/analytics query is the only one a payload may issue.
+PAYLOAD_STATEMENTS = 1
+
+
+@contextmanager
+def count_statements():
+    counter = {"statements": 0}
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        counter["statements"] += 1
+
+    event.listen(db.engine, "before_cursor_execute", count)
+    try:
+        yield counter
+    finally:
+        event.remove(db.engine, "before_cursor_execute", count)
+
+
+def _add_graded_courses(student: Student, count: int) -> None:
+    template = Course.query.filter_by(course_code="CSC401").one()
+    scores = {}
+    for n in range(count):
+        course = Course(
+            course_code=f"CSC5{n:02d}",
+            course_title=f"Elective {n}",
+            credit_units=1 + n % 3,
+            semester="FIRST",
+            department_id=template.department_id,
+            lecturer_id=template.lecturer_id,
+        )
+        db.session.add(course)
+        db.session.flush()
+        enrollment = Enrollment(
+            student_id=student.student_id, course_id=course.course_id, session="2025/2026", semester="FIRST"
+        )
+        db.session.add(enrollment)
+        db.session.flush()
+        scores[enrollment.enrollment_id] = (10 + n * 3, 20 + n * 4)
+    bulk_store_analytics(scores)
+    db.session.commit()
+
+
+def _payload_statements(student_id: int) -> tuple[int, dict]:
+    db.session.expire_all()
+    student = db.session.get(Student, student_id)
+    with count_statements() as counter:
+        payload = build_personalized_learning_payload(student)
+    return counter["statements"], payload
+
+
+def test_payload_query_count_does_not_grow_with_enrollments(demo_app):
+    student = Student.query.order_by(Student.student_id).first()
+    student_id = student.student_id
+    enrollment = Enrollment.query.filter_by(student_id=student_id).one()
+    bulk_store_analytics({enrollment.enrollment_id: (20, 45)})
+    db.session.commit()
+
+    one_course, payload = _payload_statements(student_id)
+    assert len(payload["course_performance"]) == 1
+
+    _add_graded_courses(student, 8)
+    many_courses, payload = _payload_statements(student_id)
+    assert len(payload["course_performance"]) == 9
+
+    assert one_course == many_courses == PAYLOAD_STATEMENTS
+
+
+def test_batched_payloads_share_one_query(demo_app):
+    students = Student.query.order_by(Student.student_id).all()
+
+    with count_statements() as counter:
+        payloads = build_personalized_learning_payloads(students)
+
+    assert len(payloads) == len(students) > 1
+    assert counter["statements"] == PAYLOAD_STATEMENTS
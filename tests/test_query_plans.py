@@ -0,0 +1,25 @@
+import pytest
+
+from app.extensions import db
+from app.services.query_plan_service import audit_query_plans, seed_synthetic_dataset
+
+from .conftest import make_app
+
+
+@pytest.fixture(scope="module")
+def audited_app():
+    # Large enough for SQLite's planner to prefer the indexes, small enough to seed in a few seconds.
+    app = make_app()
+    with app.app_context():
+        seed_synthetic_dataset(students=2000)
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def test_audited_queries_use_indexes(audited_app):
+    report = audit_query_plans(audited_app)
+
+    assert report
+    failures = [f"{entry['scenario']}: {entry['sequential_scans']}" for entry in report if entry["sequential_scans"]]
+    assert failures == []